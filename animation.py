@@ -0,0 +1,171 @@
+import pygame
+from typing import Callable, Dict, List, Optional
+from utilities import Color
+
+
+class OverlayAnimation:
+    """Time based animation blending a solid color on top of a surface. The opacity of the
+    color follows a curve over the duration of the animation.
+    """
+
+    def __init__(self, color: Color, duration: int, alpha_curve: Callable[[float], float]) -> None:
+        """Create an overlay animation.
+
+        Args:
+            color (Color): Color of the overlay.
+            duration (int): Duration of the animation in milliseconds.
+            alpha_curve (Callable[[float], float]): Maps the progress of the animation (0 to 1)
+                onto the opacity of the overlay (0 to 1).
+        """
+        self.color = color
+        self.duration = duration
+        self.alpha_curve = alpha_curve
+        self.start_time: Optional[int] = None
+        self.triggered_at: Optional[float] = None
+        self._overlay: Optional[pygame.Surface] = None
+
+    def progress(self, now: int) -> float:
+        """Returns how far the animation has come.
+
+        Args:
+            now (int): Current time in milliseconds.
+
+        Returns:
+            float: Progress of the animation, between 0 and 1.
+        """
+        if self.start_time is None or self.duration <= 0:
+            return 1.0
+        return min(max((now - self.start_time) / self.duration, 0.0), 1.0)
+
+    def is_finished(self, now: int) -> bool:
+        return self.progress(now) >= 1.0
+
+    def draw(self, surface: pygame.Surface, now: int) -> None:
+        """Blends the overlay onto a surface.
+
+        Args:
+            surface (pygame.Surface): The surface to draw onto.
+            now (int): Current time in milliseconds.
+        """
+        if self._overlay is None or self._overlay.get_size() != surface.get_size():
+            self._overlay = pygame.Surface(surface.get_size())
+            self._overlay.fill(self.color)
+        self._overlay.set_alpha(int(255 * self.alpha_curve(self.progress(now))))
+        surface.blit(self._overlay, (0, 0))
+
+
+def blink(color: Color, number_of_blinks: int, blink_duration: int = 266) -> OverlayAnimation:
+    """Creates an animation fading a color in and out a number of times.
+
+    Args:
+        color (Color): Color of the blinks.
+        number_of_blinks (int): self-explanatory.
+        blink_duration (int, optional): Duration of one blink in milliseconds. Defaults to 266.
+
+    Returns:
+        OverlayAnimation: The blinking animation.
+    """
+
+    def _triangle_wave(progress: float) -> float:
+        blink_progress = (progress * number_of_blinks) % 1.0
+        return 1.0 - abs(2.0 * blink_progress - 1.0)
+
+    return OverlayAnimation(color, number_of_blinks * blink_duration, _triangle_wave)
+
+
+def fade_in(color: Color, duration: int) -> OverlayAnimation:
+    """Creates an animation covering a surface with a color, starting fully transparent."""
+    return OverlayAnimation(color, duration, lambda progress: progress)
+
+
+def fade_out(color: Color, duration: int) -> OverlayAnimation:
+    """Creates an animation uncovering a surface, starting fully covered by a color."""
+    return OverlayAnimation(color, duration, lambda progress: 1.0 - progress)
+
+
+class AnimationScheduler:
+    """Keeps track of running animations, ticked once per frame from the main loop"""
+
+    def __init__(self) -> None:
+        self.animations: List[OverlayAnimation] = []
+        # Milliseconds between the input triggering an animation and its first presented frame
+        self.feedback_latencies: List[float] = []
+        self._drawn_triggers: List[float] = []
+
+    def start(
+        self, animation: OverlayAnimation, now: int, triggered_at: Optional[float] = None
+    ) -> OverlayAnimation:
+        """Starts an animation.
+
+        Args:
+            animation (OverlayAnimation): self-explanatory.
+            now (int): Current time in milliseconds.
+            triggered_at (Optional[float], optional): Time of the input that caused the
+                animation in seconds of time.perf_counter, used for measuring the
+                input-to-feedback latency (see 'presented'). Defaults to None.
+
+        Returns:
+            OverlayAnimation: The started animation.
+        """
+        animation.start_time = now
+        animation.triggered_at = triggered_at
+        self.animations.append(animation)
+        return animation
+
+    def tick(self, now: int) -> None:
+        """Removes all finished animations.
+
+        Args:
+            now (int): Current time in milliseconds.
+        """
+        self.animations = [
+            animation for animation in self.animations if not animation.is_finished(now)
+        ]
+
+    @property
+    def is_active(self) -> bool:
+        return len(self.animations) > 0
+
+    def draw(self, surface: pygame.Surface, now: int) -> bool:
+        """Draws all running animations on top of a surface.
+
+        Args:
+            surface (pygame.Surface): main game surface.
+            now (int): Current time in milliseconds.
+
+        Returns:
+            bool: True if anything was drawn, false otherwise.
+        """
+        for animation in self.animations:
+            animation.draw(surface, now)
+            if animation.triggered_at is not None:
+                self._drawn_triggers.append(animation.triggered_at)
+                animation.triggered_at = None
+        return self.is_active
+
+    def presented(self, presented_at: float) -> None:
+        """Records the input-to-feedback latency of the animations drawn for the first time,
+        called once the frame they were drawn into is on the display.
+
+        Args:
+            presented_at (float): self-explanatory, in seconds of time.perf_counter.
+        """
+        for triggered_at in self._drawn_triggers:
+            self.feedback_latencies.append((presented_at - triggered_at) * 1000)
+        self._drawn_triggers.clear()
+
+    def latency_report(self) -> Dict[str, float]:
+        """Returns percentiles of the input-to-feedback latencies in milliseconds."""
+        latencies = sorted(self.feedback_latencies)
+        if not latencies:
+            return {"feedbacks": 0}
+
+        def _percentile(percentile: float) -> float:
+            return latencies[min(len(latencies) - 1, int(percentile / 100 * len(latencies)))]
+
+        return {
+            "feedbacks": len(latencies),
+            "feedback_latency_p50_ms": _percentile(50),
+            "feedback_latency_p99_ms": _percentile(99),
+            "feedback_latency_max_ms": latencies[-1],
+        }
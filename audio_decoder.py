@@ -0,0 +1,364 @@
+import numpy as np
+import os
+import sys
+import time
+import wave
+from morse_timing import AdaptiveMorseTiming
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+
+class AudioMorseDecoder:
+    """Streaming decoder turning PCM audio of morse code tones into text.
+
+    Samples are processed in chunks of any size. Each chunk is split into short blocks and the
+    magnitude of the tone frequency is computed for all blocks at once (a vectorized Goertzel
+    filter). Blocks above an adaptive threshold are marks, the resulting mark and space
+    durations are classified by AdaptiveMorseTiming. Only the state between two chunks is kept,
+    so memory use does not depend on the length of the input.
+    """
+
+    _DETECTION_DURATION: float = 0.5
+    _MIN_FREQUENCY: float = 200.0
+    _MAX_FREQUENCY: float = 3000.0
+    # Peak magnitude over the median of the spectrum needed to detect a tone, noise alone peaks
+    # at about 3 times its median
+    _MIN_TONE_TO_NOISE: float = 8.0
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frequency: Optional[float] = None,
+        block_duration: float = 0.005,
+        initial_wpm: float = 20,
+    ) -> None:
+        """Create a decoder for audio with a given sample rate.
+
+        Args:
+            sample_rate (int): Samples per second.
+            frequency (Optional[float], optional): Pitch of the tone in Hz. Defaults to None, in
+                which case it is detected from the first half second of audio with a tone.
+            block_duration (float, optional): Seconds of audio per detector block, the timing
+                resolution of the decoder. Defaults to 0.005.
+            initial_wpm (float, optional): Initial speed estimate. Defaults to 20.
+        """
+        self.sample_rate = sample_rate
+        self.block_duration = block_duration
+        self.block_size = max(1, int(round(block_duration * sample_rate)))
+        self.timing = AdaptiveMorseTiming(initial_wpm)
+        self.frequency: Optional[float] = None
+        self._basis: Optional[np.ndarray] = None
+        if frequency is not None:
+            self._set_frequency(frequency)
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._signal_level: Optional[float] = None
+        self._noise_level: Optional[float] = None
+        self._is_mark = False
+        self._run_blocks = 0
+
+    def _set_frequency(self, frequency: float) -> None:
+        """Precomputes the complex exponential the blocks are correlated with.
+
+        Args:
+            frequency (float): Pitch of the tone in Hz.
+        """
+        self.frequency = frequency
+        phase = 2 * np.pi * frequency * np.arange(self.block_size) / self.sample_rate
+        self._basis = np.exp(-1j * phase).astype(np.complex64)
+
+    def _detect_frequency(self, samples: np.ndarray) -> Optional[float]:
+        """Finds the strongest frequency within the range of morse code tones.
+
+        Args:
+            samples (np.ndarray): self-explanatory.
+
+        Returns:
+            Optional[float]: The detected frequency in Hz, None if no tone stands clearly above
+            the noise floor.
+        """
+        spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+        frequencies = np.fft.rfftfreq(len(samples), 1 / self.sample_rate)
+        in_range = (frequencies >= self._MIN_FREQUENCY) & (frequencies <= self._MAX_FREQUENCY)
+        spectrum = spectrum[in_range]
+        peak = np.argmax(spectrum)
+        if spectrum[peak] <= self._MIN_TONE_TO_NOISE * np.median(spectrum):
+            return None
+        return float(frequencies[in_range][peak])
+
+    def _update_levels(self, magnitudes: np.ndarray) -> np.ndarray:
+        """Classifies blocks as marks or spaces and adapts the signal and noise levels.
+
+        Args:
+            magnitudes (np.ndarray): Tone magnitude of each block.
+
+        Returns:
+            np.ndarray: True for the blocks that are marks.
+        """
+        if self._signal_level is None:
+            self._signal_level = float(magnitudes.max())
+            self._noise_level = float(np.percentile(magnitudes, 10))
+
+        threshold = (self._signal_level + self._noise_level) / 2
+        is_mark = magnitudes > threshold
+        # Levels follow the averages of both classes, so the threshold tracks fading & volume
+        if is_mark.any():
+            self._signal_level += 0.5 * (float(magnitudes[is_mark].mean()) - self._signal_level)
+        if not is_mark.all():
+            self._noise_level += 0.5 * (float(magnitudes[~is_mark].mean()) - self._noise_level)
+        return is_mark
+
+    def _end_run(self) -> str:
+        """Passes the finished mark or space on to the timing classifier.
+
+        Returns:
+            str: Decoded text, if any.
+        """
+        duration = self._run_blocks * self.block_duration
+        if self._is_mark:
+            self.timing.mark(duration)
+            return ""
+        return self.timing.space(duration)
+
+    def process(self, samples: np.ndarray) -> str:
+        """Decodes a chunk of audio.
+
+        Args:
+            samples (np.ndarray): Mono samples of any numeric type.
+
+        Returns:
+            str: Text decoded so far from this chunk, may be empty.
+        """
+        data = np.concatenate((self._pending, samples.astype(np.float32)))
+        if self._basis is None:
+            detection_size = int(self._DETECTION_DURATION * self.sample_rate)
+            # Audio before the tone holds nothing to decode, only the latest window is kept
+            self._pending = data[-detection_size:]
+            if len(data) < detection_size:
+                return ""
+            frequency = self._detect_frequency(self._pending)
+            if frequency is None:
+                return ""
+            self._set_frequency(frequency)
+
+        n_blocks = len(data) // self.block_size
+        self._pending = data[n_blocks * self.block_size :]
+        if n_blocks == 0:
+            return ""
+        blocks = data[: n_blocks * self.block_size].reshape(n_blocks, self.block_size)
+        is_mark = self._update_levels(np.abs(blocks @ self._basis))
+
+        # Run lengths of consecutive mark/space blocks
+        boundaries = np.flatnonzero(np.diff(is_mark.astype(np.int8))) + 1
+        starts = np.concatenate(([0], boundaries))
+        lengths = np.diff(np.concatenate((starts, [n_blocks])))
+
+        # Runs shorter than a third of a dot are noise and belong to the surrounding run
+        min_run = max(1, int(self.timing.unit_length / self.block_duration / 3))
+        text = []
+        for start, length in zip(starts, lengths):
+            run_is_mark = bool(is_mark[start])
+            if run_is_mark == self._is_mark or length < min_run:
+                self._run_blocks += length
+                continue
+            if self._run_blocks > 0:
+                text.append(self._end_run())
+            self._is_mark = run_is_mark
+            self._run_blocks = length
+        return "".join(text)
+
+    def flush(self) -> str:
+        """Decodes whatever is left at the end of the audio.
+
+        Returns:
+            str: The remaining text.
+        """
+        text = ""
+        if self._is_mark and self._run_blocks > 0:
+            text += self._end_run()
+        self._is_mark = False
+        self._run_blocks = 0
+        return text + (self.timing.finish_letter() or "")
+
+
+def read_wav_chunks(wav_file: BinaryIO, chunk_size: int = 8192) -> Iterator[np.ndarray]:
+    """Reads the first channel of a 16 bit WAV file in chunks.
+
+    Args:
+        wav_file (BinaryIO): An open WAV file.
+        chunk_size (int, optional): Frames per chunk. Defaults to 8192.
+
+    Raises:
+        ValueError: If the samples are not 16 bit.
+
+    Yields:
+        Iterator[np.ndarray]: Mono samples.
+    """
+    with wave.open(wav_file, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"ERROR: Only 16 bit WAV files are supported")
+        n_channels = wav.getnchannels()
+        while True:
+            frames = wav.readframes(chunk_size)
+            if not frames:
+                return
+            yield np.frombuffer(frames, dtype="<i2")[::n_channels]
+
+
+def read_pcm_chunks(pcm_file: BinaryIO, chunk_size: int = 8192) -> Iterator[np.ndarray]:
+    """Reads raw 16 bit little endian mono PCM in chunks.
+
+    Args:
+        pcm_file (BinaryIO): e.g. sys.stdin.buffer.
+        chunk_size (int, optional): Samples per chunk. Defaults to 8192.
+
+    Yields:
+        Iterator[np.ndarray]: Mono samples.
+    """
+    leftover = b""
+    while True:
+        data = pcm_file.read(2 * chunk_size)
+        if not data:
+            return
+        data = leftover + data
+        usable = len(data) - len(data) % 2
+        leftover = data[usable:]
+        yield np.frombuffer(data[:usable], dtype="<i2")
+
+
+def decode_chunks(decoder: AudioMorseDecoder, chunks: Iterator[np.ndarray]) -> Iterator[str]:
+    """Decodes a stream of audio chunks.
+
+    Args:
+        decoder (AudioMorseDecoder): self-explanatory.
+        chunks (Iterator[np.ndarray]): Mono samples.
+
+    Yields:
+        Iterator[str]: Decoded text as soon as it is available.
+    """
+    for chunk in chunks:
+        text = decoder.process(chunk)
+        if text:
+            yield text
+    text = decoder.flush()
+    if text:
+        yield text
+
+
+def self_test(
+    n_texts: int = 20, sample_rate: int = 8000, noise_levels: Tuple[float, ...] = (0.0, 0.3, 1.0)
+) -> List[Dict[str, float]]:
+    """Decodes a synthetic, noisy corpus and reports the accuracy and speed of the decoder.
+    Every text is preceded by a second of noise, longer than the frequency detection window.
+
+    Args:
+        n_texts (int, optional): Texts per speed and noise level. Defaults to 20.
+        sample_rate (int, optional): Samples per second. Defaults to 8000.
+        noise_levels (Tuple[float, ...], optional): Standard deviations of the added white
+            noise, relative to the tone amplitude. Defaults to (0.0, 0.3, 1.0).
+
+    Returns:
+        List[Dict[str, float]]: wpm, noise level, accuracy and real time factor of every
+        combination of speed and noise level.
+    """
+    import difflib
+    import random
+    from morse_audio import MorseSynthesizer
+
+    word_list_path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "data", "bundled_words.txt"
+    )
+    with open(word_list_path, encoding="utf-8") as word_file:
+        words = word_file.read().split()
+    rng = random.Random(0)
+    noise_rng = np.random.default_rng(0)
+
+    results = []
+    print(f"{'wpm':>5} {'noise':>6} {'accuracy':>9} {'x real time':>12}")
+    for wpm in (12, 20, 30):
+        synthesizer = MorseSynthesizer(wpm=wpm, frequency=700, sample_rate=sample_rate)
+        amplitude = synthesizer.volume * np.iinfo(np.int16).max
+        for noise_level in noise_levels:
+            matched = total = 0
+            audio_duration = decode_duration = 0.0
+            for _ in range(n_texts):
+                text = " ".join(rng.choices(words, k=5)).upper()
+                lead_in, tail = np.zeros(sample_rate), np.zeros(sample_rate // 4)
+                audio = np.concatenate((lead_in, synthesizer.synthesize(text), tail))
+                audio = audio + noise_rng.normal(0, noise_level * amplitude, len(audio))
+
+                start_time = time.perf_counter()
+                decoder = AudioMorseDecoder(sample_rate, initial_wpm=20)
+                chunks = (audio[i : i + 4096] for i in range(0, len(audio), 4096))
+                decoded = "".join(decode_chunks(decoder, chunks)).strip()
+                decode_duration += time.perf_counter() - start_time
+                audio_duration += len(audio) / sample_rate
+
+                matcher = difflib.SequenceMatcher(None, text, decoded)
+                matched += sum(block.size for block in matcher.get_matching_blocks())
+                total += len(text)
+            result = {
+                "wpm": wpm,
+                "noise": noise_level,
+                "accuracy": matched / total,
+                "real_time_factor": audio_duration / decode_duration,
+            }
+            results.append(result)
+            print(
+                f"{wpm:>5} {noise_level:>6.2f} {result['accuracy']:>9.1%} "
+                f"{result['real_time_factor']:>12.0f}"
+            )
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import contextlib
+
+    parser = argparse.ArgumentParser(description="Decode morse code from audio")
+    parser.add_argument(
+        "input", nargs="?", default="-", help="WAV file, or '-' for raw 16 bit PCM on stdin"
+    )
+    parser.add_argument("--rate", type=int, default=8000, help="sample rate of raw PCM input")
+    parser.add_argument("--frequency", type=float, default=None, help="tone pitch in Hz")
+    parser.add_argument("--wpm", type=float, default=20, help="initial speed estimate")
+    parser.add_argument(
+        "--self-test", action="store_true", help="decode a synthetic noisy corpus and report"
+    )
+    parser.add_argument(
+        "--min-accuracy", type=float, default=0.85, help="self test fails below this accuracy"
+    )
+    parser.add_argument(
+        "--min-real-time-factor",
+        type=float,
+        default=100,
+        help="self test fails if decoding is not this many times faster than real time",
+    )
+    args = parser.parse_args()
+
+    if args.self_test:
+        failures = [
+            result
+            for result in self_test()
+            if result["accuracy"] < args.min_accuracy
+            or result["real_time_factor"] < args.min_real_time_factor
+        ]
+        for result in failures:
+            print(
+                f"ERROR: {result['wpm']} wpm with noise {result['noise']:.2f} is below "
+                f"{args.min_accuracy:.0%} accuracy or {args.min_real_time_factor:.0f}x real time"
+            )
+        sys.exit(1 if failures else 0)
+
+    with contextlib.ExitStack() as input_stack:
+        if args.input == "-":
+            decoder = AudioMorseDecoder(args.rate, args.frequency, initial_wpm=args.wpm)
+            chunks = read_pcm_chunks(sys.stdin.buffer)
+        else:
+            with wave.open(args.input, "rb") as wav:
+                sample_rate = wav.getframerate()
+            decoder = AudioMorseDecoder(sample_rate, args.frequency, initial_wpm=args.wpm)
+            chunks = read_wav_chunks(input_stack.enter_context(open(args.input, "rb")))
+
+        for text in decode_chunks(decoder, chunks):
+            print(text, end="", flush=True)
+    print()
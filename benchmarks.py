@@ -0,0 +1,299 @@
+"""Benchmarks of the rendering, layout and word handling hot paths.
+
+Runs without a display. Results can be stored as a baseline and later runs compared against it,
+benchmarks slower than the baseline by more than a threshold are flagged as regressions.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import atexit
+import contextlib
+import io
+import itertools
+import json
+import platform
+import random
+import string
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict, List, Optional
+
+import pygame
+from pygame.locals import MOUSEBUTTONUP
+from animation import blink
+from button import Button
+from font_cache import FONT_CACHE
+from game_engine import GameEngine
+from glyph_atlas import calculate_sequence_positions
+from morse_code import (
+    create_text,
+    draw_guessed_letters,
+    draw_life_bar,
+    draw_morse_code,
+    initialize_pygame,
+)
+from utilities import Point
+from word_cache import WordListCache
+from widgets import WidgetManager
+from word_handler import WordHandler
+from word_store import WordStore
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json"
+)
+
+# Each benchmark is a setup function returning the operation to time
+BENCHMARKS: Dict[str, Callable[[pygame.Surface], Callable[[], object]]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """Registers a benchmark setup function under a name."""
+
+    def _register(setup: Callable[[pygame.Surface], Callable[[], object]]) -> Callable:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return _register
+
+
+@benchmark("create_text")
+def _create_text(display_surface: pygame.Surface) -> Callable[[], object]:
+    return lambda: create_text("Score: 12", 20, (864, 60))
+
+
+@benchmark("create_text_uncached")
+def _create_text_uncached(display_surface: pygame.Surface) -> Callable[[], object]:
+    counter = iter(range(10**9))
+    return lambda: create_text(f"Score: {next(counter)}", 20, (864, 60))
+
+
+@benchmark("draw_morse_code")
+def _draw_morse_code(display_surface: pygame.Surface) -> Callable[[], object]:
+    letters = itertools.cycle(string.ascii_uppercase)
+    return lambda: draw_morse_code(display_surface, next(letters))
+
+
+@benchmark("calculate_sequence_positions")
+def _calculate_sequence_positions(display_surface: pygame.Surface) -> Callable[[], object]:
+    return lambda: calculate_sequence_positions("-.-.", Point(288, 672))
+
+
+@benchmark("draw_guessed_letters")
+def _draw_guessed_letters(display_surface: pygame.Surface) -> Callable[[], object]:
+    return lambda: draw_guessed_letters(display_surface, ["Q", "W", "E", "R"])
+
+
+@benchmark("draw_life_bar")
+def _draw_life_bar(display_surface: pygame.Surface) -> Callable[[], object]:
+    return lambda: draw_life_bar(display_surface, 3)
+
+
+@benchmark("blink_animation_frame")
+def _blink_animation_frame(display_surface: pygame.Surface) -> Callable[[], object]:
+    # Replaces the blocking draw_blinking_surface, this is the cost of one animated frame
+    animation = blink((0, 255, 0), 3)
+    animation.start_time = 0
+    return lambda: animation.draw(display_surface, 400)
+
+
+@benchmark("button_create")
+def _button_create(display_surface: pygame.Surface) -> Callable[[], object]:
+    return lambda: Button("Cheat", (800, 500), 30)
+
+
+@benchmark("button_is_clicked")
+def _button_is_clicked(display_surface: pygame.Surface) -> Callable[[], object]:
+    button = Button("Cheat", (800, 500), 30)
+    event = pygame.event.Event(MOUSEBUTTONUP, pos=(820, 510), button=1)
+    return lambda: button.isClicked(event)
+
+
+@benchmark("button_draw")
+def _button_draw(display_surface: pygame.Surface) -> Callable[[], object]:
+    button = Button("Cheat", (800, 500), 30)
+    return lambda: button.draw_button(display_surface)
+
+
+@benchmark("widget_manager_dispatch")
+def _widget_manager_dispatch(display_surface: pygame.Surface) -> Callable[[], object]:
+    widget_manager = WidgetManager()
+    for row in range(4):
+        for column in range(4):
+            widget_manager.add(Button("Hint", (40 + column * 200, 40 + row * 120), 30))
+    event = pygame.event.Event(MOUSEBUTTONUP, pos=(660, 410), button=1)
+    return lambda: widget_manager.dispatch(event)
+
+
+@benchmark("game_engine_apply_guess")
+def _game_engine_apply_guess(display_surface: pygame.Surface) -> Callable[[], object]:
+    words = itertools.cycle(["MORSE", "CODE", "QUIZ", "DASH"])
+    engine = GameEngine(words.__next__, max_lives=10**9)
+    state = engine.state
+    return lambda: engine.apply_guess(state.word[state.letter_index])
+
+
+_WORK_DIRECTORY: Optional[tempfile.TemporaryDirectory] = None
+
+
+def _work_directory() -> str:
+    """Directory for files of the benchmarks, shared by the whole suite and removed at exit."""
+    global _WORK_DIRECTORY
+    if _WORK_DIRECTORY is None:
+        _WORK_DIRECTORY = tempfile.TemporaryDirectory(prefix="morse_code_benchmark_")
+        atexit.register(_WORK_DIRECTORY.cleanup)
+    return _WORK_DIRECTORY.name
+
+
+def _local_word_list_cache(directory: str, n_words: int = 10000) -> WordListCache:
+    """Creates a cached word list standing in for the downloaded one."""
+    rng = random.Random(0)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 12))) for _ in range(n_words)
+    ]
+    cache = WordListCache(os.path.join(directory, "wordlist.bin"))
+    cache.save(words)
+    return cache
+
+
+@benchmark("word_handler_construction")
+def _word_handler_construction(display_surface: pygame.Surface) -> Callable[[], object]:
+    cache = _local_word_list_cache(_work_directory())
+    return lambda: WordHandler(max_size=5, cache=cache)
+
+
+@benchmark("word_handler_fetch_new_word")
+def _word_handler_fetch_new_word(display_surface: pygame.Surface) -> Callable[[], object]:
+    cache = _local_word_list_cache(_work_directory())
+    word_handler = WordHandler(max_size=5, cache=cache)
+    return word_handler.fetch_new_word
+
+
+@benchmark("word_handler_record_guess")
+def _word_handler_record_guess(display_surface: pygame.Surface) -> Callable[[], object]:
+    cache = _local_word_list_cache(_work_directory())
+    word_handler = WordHandler(max_size=5, cache=cache)
+    guesses = itertools.cycle([("q", False), ("q", True), ("e", False), ("e", True)])
+    return lambda: word_handler.record_guess(*next(guesses))
+
+
+@benchmark("word_store_constrained_sample")
+def _word_store_constrained_sample(display_surface: pygame.Surface) -> Callable[[], object]:
+    cache = _local_word_list_cache(_work_directory())
+    word_store = WordStore(cache.load())
+    return lambda: word_store.sample(min_length=4, max_length=5, letters="qz")
+
+
+def run_benchmarks(
+    names: Optional[List[str]] = None, repeat: int = 5, min_time: float = 0.2
+) -> Dict[str, float]:
+    """Runs benchmarks and measures the time per operation.
+
+    Args:
+        names (Optional[List[str]], optional): Benchmarks to run. Defaults to None (all).
+        repeat (int, optional): Number of measurements per benchmark, the fastest one is
+            reported to reduce noise. Defaults to 5.
+        min_time (float, optional): Minimum duration of each measurement in seconds. Defaults to 0.2.
+
+    Returns:
+        Dict[str, float]: Microseconds per operation for each benchmark.
+    """
+    display_surface, _ = initialize_pygame(960, 600, "Morse Code (benchmarks)")
+    results = {}
+    for name in names or list(BENCHMARKS):
+        random.seed(0)
+        FONT_CACHE.clear()
+        # Keep INFO messages of the word handler out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            operation = BENCHMARKS[name](display_surface)
+            timer = timeit.Timer(operation)
+            number, _ = timer.autorange()
+            number = max(1, int(number * min_time / 0.2))
+            timings = timer.repeat(repeat=repeat, number=number)
+        results[name] = min(timings) / number * 1e6
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Prints a comparison of results against a baseline.
+
+    Args:
+        results (Dict[str, float]): Microseconds per operation.
+        baseline (Dict[str, float]): Microseconds per operation of the baseline.
+        threshold (float): Relative slowdown flagged as a regression, e.g. 0.1 for 10%.
+
+    Returns:
+        List[str]: Names of the benchmarks that regressed.
+    """
+    regressions = []
+    print(f"{'benchmark':<30} {'baseline us':>12} {'current us':>12} {'change':>8}")
+    for name, current in results.items():
+        if name not in baseline:
+            print(f"{name:<30} {'-':>12} {current:>12.2f} {'new':>8}")
+            continue
+        change = current / baseline[name] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<30} {baseline[name]:>12.2f} {current:>12.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline results file")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="store the results as baseline"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.15, help="relative slowdown flagged as regression"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per benchmark")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results = run_benchmarks(args.names, args.repeat)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "pygame": pygame.version.ver,
+                    "machine": platform.machine(),
+                    "results_us": results,
+                },
+                baseline_file,
+                indent=2,
+            )
+        print(f"INFO: Stored baseline in '{args.baseline}'")
+
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results_us"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            return 1
+    else:
+        for name, microseconds in results.items():
+            print(f"{name:<30} {microseconds:>12.2f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
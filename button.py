@@ -1,6 +1,7 @@
 import pygame
 from pygame.locals import MOUSEBUTTONUP
 from typing import Tuple
+from font_cache import FONT_CACHE
 from utilities import Point
 
 
@@ -38,68 +39,78 @@ class Button:
         self.button_position = Point(self.x - self.offset, self.y - self.offset)
         self.create_button()
 
+    def _appearance(self) -> tuple:
+        """Everything the look of the button depends on."""
+        return (
+            self.button_text,
+            self.font_size,
+            self.offset,
+            self.shadow_offset,
+            self.button_color,
+            self.button_shadow_color,
+        )
+
     def create_button(self) -> None:
-        """Creates a button consisting of three pygame surfaces & rectangles: one for the text,
-        one for the background and one for the background shadow effect.
+        """Composites the button into a single surface: the background shadow effect, the
+        background and the text on top. The surface is cached and only recreated when the text,
+        the colors or the size of the button change.
         """
 
-        # Text surface & rectangle
-        font = pygame.font.Font("freesansbold.ttf", self.font_size)
-        self.text_surface = font.render(self.button_text, True, "black")
-        self.text_rectangle = self.text_surface.get_rect()
-        self.text_rectangle.topleft = (self.x, self.y)
+        # Text surface
+        self.text_surface = FONT_CACHE.render(self.button_text, self.font_size, "black")
         text_dimensions = Point(self.text_surface.get_width(), self.text_surface.get_height())
-
-        # Button surface & rectangle
         button_dimensions = Point(
             text_dimensions.x + 2 * self.offset, text_dimensions.y + 2 * self.offset
         )
-        self.background_surface = pygame.Surface(
-            (button_dimensions.x, button_dimensions.y), pygame.SRCALPHA
-        )
-        self.background_rectangle = pygame.draw.rect(
-            self.background_surface,
-            self.button_color,
-            (
-                0,
-                0,
-                button_dimensions.x,
-                button_dimensions.y,
-            ),
-            0,
-            5,
-        )
 
-        # Shadow effect surface & rectangle
-        self.background_shadow_surface = pygame.Surface(
+        self.surface = pygame.Surface(
             (
                 button_dimensions.x + self.shadow_offset,
                 button_dimensions.y + self.shadow_offset,
             ),
             pygame.SRCALPHA,  # Enable alpha (makes the surface transparent)
         )
-        self.background_shadow_rectangle = pygame.draw.rect(
-            self.background_shadow_surface,
-            self.button_shadow_color,
-            (
-                0,
-                0,
-                button_dimensions.x + self.shadow_offset,
-                button_dimensions.y + self.shadow_offset,
-            ),
-            0,
-            5,
+        # Shadow effect
+        pygame.draw.rect(self.surface, self.button_shadow_color, self.surface.get_rect(), 0, 5)
+        # Button background
+        pygame.draw.rect(
+            self.surface, self.button_color, (0, 0, button_dimensions.x, button_dimensions.y), 0, 5
         )
+        self.surface.blit(self.text_surface, (self.offset, self.offset))
+
+        # Clickable area, including the shadow
+        self.rect = self.surface.get_rect(topleft=self.button_position)
+        self._composited_appearance = self._appearance()
+
+    def place(self, position: Tuple[int, int], font_size: int) -> None:
+        """Moves and resizes the button, e.g. after the window has been resized. The button is
+        only composited again if its size changed. Widget managers holding the button have to
+        rebuild their hit index.
+
+        Args:
+            position (Tuple[int, int]): New position of the button.
+            font_size (int): New font size of the button text.
+        """
+        self.x, self.y = position
+        self.font_size = font_size
+        self.button_position = Point(self.x - self.offset, self.y - self.offset)
+        if self._composited_appearance != self._appearance():
+            self.create_button()
+        else:
+            self.rect.topleft = self.button_position
 
-    def draw_button(self, display_surface: pygame.Surface) -> None:
-        """Draws a button by blitting three different surfaces onto a given display surface.
+    def draw_button(self, display_surface: pygame.Surface) -> pygame.Rect:
+        """Draws the button onto a given display surface.
 
         Args:
             display_surface (pygame.Surface): The surface the button is supposed to be drawn onto.
+
+        Returns:
+            pygame.Rect: Bounding rectangle of the drawn button, including the shadow.
         """
-        display_surface.blit(self.background_shadow_surface, self.button_position)
-        display_surface.blit(self.background_surface, self.button_position)
-        display_surface.blit(self.text_surface, self.text_rectangle)
+        if self._composited_appearance != self._appearance():
+            self.create_button()
+        return display_surface.blit(self.surface, self.rect)
 
     def isClicked(self, event: pygame.event.Event) -> bool:
         """Checks if the button has been clicked
@@ -110,14 +121,4 @@ class Button:
         Returns:
             bool: True if the button has been clicked, false otherwise.
         """
-        if event.type == MOUSEBUTTONUP:
-            button_rectangle = pygame.rect.Rect(
-                self.button_position.x,
-                self.button_position.y,
-                self.background_shadow_rectangle.w,
-                self.background_shadow_rectangle.h,
-            )
-
-            if button_rectangle.collidepoint(event.pos):
-                return True
-        return False
+        return event.type == MOUSEBUTTONUP and self.rect.collidepoint(event.pos)
@@ -27,7 +27,46 @@ MORSE_CODE = {
     "Z": "--..",
 }
 
-FPS = 30
+MORSE_DIGITS = {
+    "0": "-----",
+    "1": ".----",
+    "2": "..---",
+    "3": "...--",
+    "4": "....-",
+    "5": ".....",
+    "6": "-....",
+    "7": "--...",
+    "8": "---..",
+    "9": "----.",
+}
+
+MORSE_PUNCTUATION = {
+    ".": ".-.-.-",
+    ",": "--..--",
+    "?": "..--..",
+    "'": ".----.",
+    "!": "-.-.--",
+    "/": "-..-.",
+    "(": "-.--.",
+    ")": "-.--.-",
+    "&": ".-...",
+    ":": "---...",
+    ";": "-.-.-.",
+    "=": "-...-",
+    "+": ".-.-.",
+    "-": "-....-",
+    "_": "..--.-",
+    '"': ".-..-.",
+    "$": "...-..-",
+    "@": ".--.-.",
+}
+
+MORSE_CODE_EXTENDED = {**MORSE_CODE, **MORSE_DIGITS, **MORSE_PUNCTUATION}
+
+FPS = 30  # Frames rendered per second
+LOGIC_RATE = 60  # Logic steps (input polls) per second
+BACKGROUND_RENDER_RATE = 5  # Frames per second while the window does not have the focus
+IDLE_WAKEUP_INTERVAL = 250  # Milliseconds static screens wait for events at a time
 DOT_RADIUS = 10
 DASH_DIMENSIONS = (40, 20)
 MAXIMUM_WORD_LENGTH = 5
@@ -0,0 +1,232 @@
+"""Compact binary logs of the input of game sessions, see replay.py for playing them back.
+
+A log starts with a header holding the seed of the word selection, the size and checksum of the
+word corpus and the initial window size. It is followed by one record per frame of the game
+screen: the milliseconds since the previous frame, the number of events and the events handled
+in that frame. A change of the window size, by resizing or toggling fullscreen, is recorded as
+a VIDEORESIZE event holding the new size at the start of the first frame after it. Numbers are
+stored as variable-length integers, so an idle frame takes two bytes. Records are only ever
+appended, a log cut short by a crash is read up to its last complete frame.
+"""
+
+import struct
+from typing import BinaryIO, Callable, List, NamedTuple, Optional, Tuple
+
+import pygame
+from pygame.locals import KEYDOWN, KEYUP, MOUSEBUTTONDOWN, MOUSEBUTTONUP, QUIT, VIDEORESIZE
+from word_store import WordStore
+
+_LOG_MAGIC = b"MCRL"
+_LOG_VERSION = 2
+_READABLE_VERSIONS = (1, 2)  # Version 1 logs do not contain size changes
+_LOG_HEADER = struct.Struct("<4sHxxqIIHH")  # magic, version, seed, words, checksum, window size
+
+# Events the game screen reacts to, stored as their index in this tuple
+_RECORDED_EVENT_TYPES = (QUIT, KEYDOWN, KEYUP, MOUSEBUTTONDOWN, MOUSEBUTTONUP, VIDEORESIZE)
+_KEY_EVENT_TYPES = (KEYDOWN, KEYUP)
+_MOUSE_EVENT_TYPES = (MOUSEBUTTONDOWN, MOUSEBUTTONUP)
+
+
+class EventLogHeader(NamedTuple):
+    seed: int
+    n_words: int
+    word_checksum: int
+    window_size: Tuple[int, int]
+
+
+def _write_varint(output: bytearray, value: int) -> None:
+    """Appends a non-negative integer, 7 bits per byte with the high bit marking continuation."""
+    while value >= 0x80:
+        output.append(value & 0x7F | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """Reads an integer written by _write_varint.
+
+    Raises:
+        IndexError: If the data ends within the integer.
+
+    Returns:
+        Tuple[int, int]: The integer and the position after it.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _write_event(output: bytearray, event: pygame.event.Event) -> None:
+    output.append(_RECORDED_EVENT_TYPES.index(event.type))
+    if event.type in _KEY_EVENT_TYPES:
+        text = event.unicode.encode("utf-8")
+        _write_varint(output, event.key)
+        _write_varint(output, event.mod)
+        _write_varint(output, len(text))
+        output += text
+    elif event.type in _MOUSE_EVENT_TYPES:
+        _write_varint(output, max(event.pos[0], 0))
+        _write_varint(output, max(event.pos[1], 0))
+        _write_varint(output, event.button)
+    elif event.type == VIDEORESIZE:
+        _write_varint(output, event.size[0])
+        _write_varint(output, event.size[1])
+
+
+def _read_event(data: bytes, position: int) -> Tuple[pygame.event.Event, int]:
+    event_type = _RECORDED_EVENT_TYPES[data[position]]
+    position += 1
+    if event_type in _KEY_EVENT_TYPES:
+        key, position = _read_varint(data, position)
+        mod, position = _read_varint(data, position)
+        length, position = _read_varint(data, position)
+        if position + length > len(data):
+            raise IndexError("truncated event")
+        text = data[position : position + length].decode("utf-8")
+        return pygame.event.Event(event_type, key=key, mod=mod, unicode=text), position + length
+    if event_type in _MOUSE_EVENT_TYPES:
+        x, position = _read_varint(data, position)
+        y, position = _read_varint(data, position)
+        button, position = _read_varint(data, position)
+        return pygame.event.Event(event_type, pos=(x, y), button=button), position
+    if event_type == VIDEORESIZE:
+        width, position = _read_varint(data, position)
+        height, position = _read_varint(data, position)
+        return _resize_event((width, height)), position
+    return pygame.event.Event(event_type), position
+
+
+def _resize_event(size: Tuple[int, int]) -> pygame.event.Event:
+    return pygame.event.Event(VIDEORESIZE, size=size, w=size[0], h=size[1])
+
+
+class GameRecorder:
+    """Time and event source of the game screen writing everything it hands out to a log"""
+
+    def __init__(
+        self,
+        path: str,
+        seed: int,
+        word_store: WordStore,
+        window_size: Tuple[int, int],
+        flush_interval: int = 30,
+        event_source: Callable[[], List[pygame.event.Event]] = pygame.event.get,
+    ) -> None:
+        """Create a recorder and write the header of a new log.
+
+        Args:
+            path (str): Location of the log, an existing file is replaced.
+            seed (int): Seed of the word handler of the recorded session.
+            word_store (WordStore): Words of the word handler, replays have to use the same words.
+            window_size (Tuple[int, int]): Initial size of the display surface.
+            flush_interval (int, optional): Frames between writes to disk. Defaults to 30.
+            event_source (Callable[[], List[pygame.event.Event]], optional): Where the recorded
+                events come from. Defaults to pygame.event.get.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.frames = 0
+        self.event_source = event_source
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._file.write(
+            _LOG_HEADER.pack(
+                _LOG_MAGIC,
+                _LOG_VERSION,
+                seed,
+                len(word_store),
+                word_store.checksum(),
+                *window_size,
+            )
+        )
+        self._ticks = 0
+        self._last_ticks = 0
+        self._window_size = tuple(window_size)
+
+    def ticks(self) -> int:
+        """Returns the current time in milliseconds, the time of the frame being recorded."""
+        self._ticks = pygame.time.get_ticks()
+        return self._ticks
+
+    def events(self) -> List[pygame.event.Event]:
+        """Returns the events of the event source and records them as one frame."""
+        events = self.event_source()
+        if self._file is None:
+            return events
+        # Size changes are recorded as the size of the display surface, also if the window was
+        # resized while another screen was shown
+        recorded = [
+            event
+            for event in events
+            if event.type in _RECORDED_EVENT_TYPES and event.type != VIDEORESIZE
+        ]
+        display_surface = pygame.display.get_surface()
+        if display_surface is not None and display_surface.get_size() != self._window_size:
+            self._window_size = display_surface.get_size()
+            recorded.insert(0, _resize_event(self._window_size))
+        record = bytearray()
+        _write_varint(record, max(self._ticks - self._last_ticks, 0))
+        _write_varint(record, len(recorded))
+        for event in recorded:
+            _write_event(record, event)
+        self._file.write(record)
+        self._last_ticks = self._ticks
+
+        self.frames += 1
+        if self.frames % self.flush_interval == 0:
+            self._file.flush()
+        return events
+
+    def close(self) -> None:
+        """Writes the remaining frames, later frames are not recorded."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            print(f"INFO: Recorded {self.frames} frames into '{self.path}'")
+
+
+def read_event_log(
+    path: str,
+) -> Tuple[EventLogHeader, List[Tuple[int, List[pygame.event.Event]]]]:
+    """Reads a log written by GameRecorder.
+
+    Args:
+        path (str): self-explanatory.
+
+    Raises:
+        ValueError: If the file is not an event log.
+
+    Returns:
+        Tuple[EventLogHeader, List[Tuple[int, List[pygame.event.Event]]]]: The header and the
+        time in milliseconds and events of every complete frame.
+    """
+    with open(path, "rb") as log_file:
+        data = log_file.read()
+    if len(data) < _LOG_HEADER.size:
+        raise ValueError(f"ERROR: '{path}' is not an event log")
+    magic, version, seed, n_words, checksum, width, height = _LOG_HEADER.unpack_from(data)
+    if magic != _LOG_MAGIC or version not in _READABLE_VERSIONS:
+        raise ValueError(f"ERROR: '{path}' is not an event log of a known version")
+    header = EventLogHeader(seed, n_words, checksum, (width, height))
+
+    frames: List[Tuple[int, List[pygame.event.Event]]] = []
+    position = _LOG_HEADER.size
+    ticks = 0
+    try:
+        while position < len(data):
+            delta, position = _read_varint(data, position)
+            n_events, position = _read_varint(data, position)
+            events = []
+            for _ in range(n_events):
+                event, position = _read_event(data, position)
+                events.append(event)
+            ticks += delta
+            frames.append((ticks, events))
+    except (IndexError, UnicodeDecodeError):
+        print(f"INFO: '{path}' ends with an incomplete frame, it is skipped")
+    return header, frames
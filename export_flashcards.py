@@ -0,0 +1,205 @@
+"""Exports morse flashcards for a word list: a PNG of every word's morse code and, optionally,
+a WAV file of its tones.
+
+The words are split into chunks which are rendered by a pool of worker processes. Every file
+is written atomically and existing files are skipped, so an interrupted export resumes where it
+stopped when it is run again.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+
+import pygame
+from constants import MAXIMUM_WORD_LENGTH
+from glyph_atlas import MorseGlyphAtlas
+from morse_audio import MorseSynthesizer
+from word_handler import WordHandler
+from word_store import WordStore
+
+_CARD_MARGIN = 20
+_CARD_BACKGROUND = (255, 255, 255)
+
+# State of a worker process, created once by _initialize_worker
+_atlas: Optional[MorseGlyphAtlas] = None
+_synthesizer: Optional[MorseSynthesizer] = None
+
+
+def _initialize_worker(audio: bool, wpm: float, frequency: float) -> None:
+    """Renders the glyphs (and synthesizes the tones) once per worker process."""
+    global _atlas, _synthesizer
+    _atlas = MorseGlyphAtlas((960, 600))
+    _synthesizer = MorseSynthesizer(wpm, frequency) if audio else None
+
+
+def _replace_atomically(path: str, write_function) -> None:
+    """Writes a file under a temporary name and renames it, files are either complete or absent."""
+    root, extension = os.path.splitext(path)
+    temporary_path = f"{root}.{os.getpid()}.tmp{extension}"
+    write_function(temporary_path)
+    os.replace(temporary_path, path)
+
+
+def _write_wav(path: str, synthesizer: MorseSynthesizer, word: str) -> None:
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(synthesizer.sample_rate)
+        wav.writeframes(synthesizer.synthesize(word.upper()).tobytes())
+
+
+def export_chunk(words: List[str], output_directory: str) -> int:
+    """Renders the flashcards of a chunk of words, runs in a worker process.
+
+    Args:
+        words (List[str]): Words consisting of the letters a-z.
+        output_directory (str): self-explanatory.
+
+    Returns:
+        int: Number of exported words.
+    """
+    for word in words:
+        width, height = _atlas.measure_word(word)
+        card = pygame.Surface((width + 2 * _CARD_MARGIN, height + 2 * _CARD_MARGIN))
+        card.fill(_CARD_BACKGROUND)
+        _atlas.draw_word(card, word, card.get_rect().center)
+        _replace_atomically(
+            os.path.join(output_directory, f"{word}.png"),
+            lambda path: pygame.image.save(card, path),
+        )
+        if _synthesizer is not None:
+            _replace_atomically(
+                os.path.join(output_directory, f"{word}.wav"),
+                lambda path: _write_wav(path, _synthesizer, word),
+            )
+    return len(words)
+
+
+def pending_words(words: Iterable[str], output_directory: str, audio: bool) -> List[str]:
+    """Returns the words whose flashcards have not been exported yet, without duplicates.
+
+    Args:
+        words (Iterable[str]): self-explanatory.
+        output_directory (str): self-explanatory.
+        audio (bool): Whether the audio files are part of the export.
+
+    Returns:
+        List[str]: self-explanatory.
+    """
+    existing = set(os.listdir(output_directory))
+    pending = []
+    for word in dict.fromkeys(words):
+        if f"{word}.png" not in existing or (audio and f"{word}.wav" not in existing):
+            pending.append(word)
+    return pending
+
+
+def export_flashcards(
+    words: Iterable[str],
+    output_directory: str,
+    audio: bool = False,
+    wpm: float = 20,
+    frequency: float = 600.0,
+    workers: Optional[int] = None,
+    chunk_size: int = 200,
+) -> Dict[str, float]:
+    """Exports the flashcards of all words not exported yet.
+
+    Args:
+        words (Iterable[str]): Words consisting of the letters a-z.
+        output_directory (str): Created if it does not exist.
+        audio (bool, optional): Whether to export WAV files as well. Defaults to False.
+        wpm (float, optional): Speed of the tones. Defaults to 20.
+        frequency (float, optional): Pitch of the tones in Hz. Defaults to 600.0.
+        workers (Optional[int], optional): Number of worker processes. Defaults to None (one per
+            CPU core).
+        chunk_size (int, optional): Words per task handed to a worker. Defaults to 200.
+
+    Returns:
+        Dict[str, float]: Number of exported & skipped words, duration and throughput.
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    words = list(words)
+    pending = pending_words(words, output_directory, audio)
+    skipped = len(set(words)) - len(pending)
+    if skipped:
+        print(f"INFO: Skipping {skipped} words which have already been exported")
+
+    start_time = time.perf_counter()
+    exported = 0
+    chunks = [pending[i : i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_initialize_worker, initargs=(audio, wpm, frequency)
+    ) as executor:
+        futures = [executor.submit(export_chunk, chunk, output_directory) for chunk in chunks]
+        for future in as_completed(futures):
+            exported += future.result()
+            elapsed_time = time.perf_counter() - start_time
+            print(
+                f"INFO: {exported}/{len(pending)} words exported "
+                f"({exported / elapsed_time:.0f} words/s)",
+                flush=True,
+            )
+    elapsed_time = time.perf_counter() - start_time
+
+    return {
+        "exported": exported,
+        "skipped": skipped,
+        "seconds": elapsed_time,
+        "words_per_second": exported / elapsed_time if elapsed_time > 0 else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("output_directory")
+    parser.add_argument("--word-file", help="word file (one word per line, may be .gz)")
+    parser.add_argument(
+        "--max-length",
+        type=int,
+        help=f"skip longer words (default: no limit for --word-file, else {MAXIMUM_WORD_LENGTH})",
+    )
+    parser.add_argument("--limit", type=int, help="only export the first words")
+    parser.add_argument("--audio", action="store_true", help="export WAV files as well")
+    parser.add_argument("--wpm", type=float, default=20, help="speed of the tones")
+    parser.add_argument("--pitch", type=float, default=600.0, help="pitch of the tones (Hz)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU cores)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="words per task")
+    args = parser.parse_args(argv)
+
+    if args.word_file is not None:
+        words = list(WordStore.from_mapped_file(args.word_file))
+        if args.max_length is not None:
+            n_words = len(words)
+            words = [word for word in words if len(word) <= args.max_length]
+            if len(words) < n_words:
+                print(
+                    f"INFO: Skipping {n_words - len(words)} words longer than {args.max_length} "
+                    "letters"
+                )
+    else:
+        max_length = MAXIMUM_WORD_LENGTH if args.max_length is None else args.max_length
+        words = list(WordHandler(max_size=max_length).words)
+    words = words[: args.limit]
+
+    report = export_flashcards(
+        words,
+        args.output_directory,
+        args.audio,
+        args.wpm,
+        args.pitch,
+        args.workers,
+        args.chunk_size,
+    )
+    for name, value in report.items():
+        print(f"{name:>16}: {value:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple, Union
+
+DEFAULT_FONT_FACE = "freesansbold.ttf"
+
+TextColor = Union[str, Tuple[int, int, int]]
+
+
+class FontCache:
+    """Registry of loaded fonts plus a bounded LRU cache of rendered text surfaces."""
+
+    def __init__(self, max_surfaces: int = 256) -> None:
+        """Create an empty font registry and text surface cache.
+
+        Args:
+            max_surfaces (int, optional): Maximum number of rendered text surfaces kept in the
+                cache, the least recently used surface is evicted first. Defaults to 256.
+
+        Raises:
+            ValueError: If the provided maximum number of surfaces is lower than one.
+        """
+        if max_surfaces < 1:
+            raise ValueError(
+                f"ERROR: The provided max surfaces '{max_surfaces}' is not greater than or equal to 1"
+            )
+        self.max_surfaces = max_surfaces
+        self._fonts: Dict[Tuple[str, int], pygame.font.Font] = {}
+        self._surfaces: "OrderedDict[Hashable, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size: int, face: str = DEFAULT_FONT_FACE) -> pygame.font.Font:
+        """Retrieve a font, the font file is only loaded the first time a (face, size) is requested.
+
+        Args:
+            size (int): Font size.
+            face (str, optional): Font file. Defaults to DEFAULT_FONT_FACE.
+
+        Returns:
+            pygame.font.Font: The loaded font.
+        """
+        key = (face, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(face, size)
+            self._fonts[key] = font
+        return font
+
+    def render(
+        self,
+        text: str,
+        size: int,
+        color: TextColor,
+        antialias: bool = True,
+        face: str = DEFAULT_FONT_FACE,
+    ) -> pygame.Surface:
+        """Retrieve a rendered text surface, rendering it only if it is not already cached.
+
+        The returned surface is shared between callers and must not be drawn onto.
+
+        Args:
+            text (str): The desired text.
+            size (int): Font size.
+            color (TextColor): Color of the text.
+            antialias (bool, optional): Whether to render with antialiasing. Defaults to True.
+            face (str, optional): Font file. Defaults to DEFAULT_FONT_FACE.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        key = (text, size, color, antialias, face)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size, face).render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_surfaces:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        """Drop all loaded fonts and rendered surfaces and reset the hit/miss counters."""
+        self._fonts.clear()
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+
+# Shared by the whole application so that every screen and button reuses the same fonts
+FONT_CACHE = FontCache()
@@ -0,0 +1,140 @@
+"""Rules of the game as a small state machine, independent of pygame.
+
+The engine knows the word being played, the letter to guess, the score, the lives and the wrong
+guesses of the current letter. Screens only render its state and feed guesses into it.
+"""
+
+from typing import Callable, List, Optional
+
+MAX_LIVES = 5
+
+
+class GameState:
+    """Everything the game screen shows"""
+
+    __slots__ = ("word", "letter_index", "score", "lives", "guessed_letters", "game_over")
+
+    def __init__(self, word: str, lives: int = MAX_LIVES) -> None:
+        """Create the state at the start of a game.
+
+        Args:
+            word (str): The first word, in upper case.
+            lives (int, optional): Number of wrong guesses before the game is over.
+                Defaults to MAX_LIVES.
+        """
+        self.word = word
+        self.letter_index = 0
+        self.score = 0
+        self.lives = lives
+        self.guessed_letters: List[str] = []  # Wrong guesses of the current letter
+        self.game_over = False
+
+    @property
+    def letter(self) -> str:
+        """The letter to guess."""
+        return self.word[self.letter_index]
+
+
+class GameEngine:
+    """Applies the rules of the game to a game state"""
+
+    __slots__ = ("state", "word_source", "max_lives", "on_guess", "letter_count")
+
+    def __init__(
+        self,
+        word_source: Callable[[], str],
+        max_lives: int = MAX_LIVES,
+        on_guess: Optional[Callable[[str, bool], None]] = None,
+    ) -> None:
+        """Create an engine and start a game.
+
+        Args:
+            word_source (Callable[[], str]): Returns the next word to play,
+                e.g. WordHandler.fetch_new_word.
+            max_lives (int, optional): Lives at the start of a game. Defaults to MAX_LIVES.
+            on_guess (Optional[Callable[[str, bool], None]], optional): Called with the letter to
+                guess and whether the guess was correct, e.g. WordHandler.record_guess.
+                Defaults to None.
+        """
+        self.word_source = word_source
+        self.max_lives = max_lives
+        self.on_guess = on_guess
+        self.state = GameState(word_source().upper(), max_lives)
+        # Increases with every letter to guess, also when the same letter has to be guessed again
+        self.letter_count = 1
+
+    def apply_guess(self, guess: str) -> bool:
+        """Checks a guess for the current letter. A correct guess scores a point and moves on to
+        the next letter, a wrong guess costs a life. The game is over once all lives are lost.
+
+        Args:
+            guess (str): The guessed letter, in upper case.
+
+        Returns:
+            bool: Whether the guess was correct.
+        """
+        state = self.state
+        letter = state.word[state.letter_index]
+        correct = guess == letter
+        if self.on_guess is not None:
+            self.on_guess(letter, correct)
+
+        if correct:
+            state.score += 1
+            state.guessed_letters = []
+            self.next_letter()
+        else:
+            state.guessed_letters.append(guess)
+            state.lives -= 1
+            if state.lives <= 0:
+                state.game_over = True
+        return correct
+
+    def next_letter(self) -> None:
+        """Moves on to the next letter, a new word is started after the last letter."""
+        state = self.state
+        state.letter_index += 1
+        self.letter_count += 1
+        if state.letter_index >= len(state.word):
+            state.word = self.word_source().upper()
+            state.letter_index = 0
+
+    def reset(self) -> None:
+        """Starts a new game with a new word."""
+        self.state = GameState(self.word_source().upper(), self.max_lives)
+        self.letter_count += 1
+
+
+def benchmark(n_transitions: int = 1_000_000) -> float:
+    """Measures how many guesses the engine processes per second, every fourth guess is wrong.
+
+    Args:
+        n_transitions (int, optional): Number of guesses. Defaults to 1_000_000.
+
+    Returns:
+        float: Guesses per second.
+    """
+    import itertools
+    import time
+
+    words = itertools.cycle(["MORSE", "CODE", "QUIZ", "DASH", "DOT", "SIGNAL", "RADIO"])
+    engine = GameEngine(words.__next__, max_lives=n_transitions)
+    apply_guess = engine.apply_guess
+    state = engine.state
+
+    start_time = time.perf_counter()
+    for i in range(n_transitions):
+        if i & 3:
+            apply_guess(state.word[state.letter_index])
+        else:
+            apply_guess("?")
+    return n_transitions / (time.perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Game engine benchmark")
+    parser.add_argument("--transitions", type=int, default=1_000_000, help="number of guesses")
+    args = parser.parse_args()
+    print(f"{benchmark(args.transitions) / 1e6:.2f} million guesses per second")
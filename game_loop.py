@@ -0,0 +1,143 @@
+"""Central loop of the game running the logic at a fixed timestep and rendering independently.
+
+Logic steps, including polling the input, happen at a fixed rate regardless of how often frames
+are rendered. Frames are rendered at a configurable rate: capped, uncapped (or paced by vsync)
+or at a low rate while the window does not have the focus, so a window in the background hardly
+uses any CPU time. Without vsync, a frame is only rendered if a logic step ran or an animation
+is running since the previous frame, an idle screen waits for the next step instead. In
+lockstep mode every logic step is followed by exactly one frame, which is what headless runs
+and replays of recorded sessions need.
+"""
+
+import time
+from typing import Callable, Optional
+
+import pygame
+from constants import BACKGROUND_RENDER_RATE, FPS, LOGIC_RATE
+
+# Logic steps run at most back to back before a frame is rendered, e.g. after the game was
+# blocked by a static screen. Time beyond that is dropped instead of being caught up.
+MAX_CATCH_UP_STEPS = 5
+
+
+def sleep_until(deadline: float) -> None:
+    """Default way of waiting for the next logic step or frame.
+
+    Args:
+        deadline (float): self-explanatory, in seconds of time.perf_counter.
+    """
+    remaining = deadline - time.perf_counter()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def window_has_focus() -> bool:
+    """Whether the window receives keyboard input."""
+    return pygame.key.get_focused()
+
+
+class GameLoop:
+    """Calls the logic of a screen at a fixed rate and renders it at its own rate"""
+
+    def __init__(
+        self,
+        logic_rate: int = LOGIC_RATE,
+        render_rate: int = FPS,
+        background_render_rate: Optional[int] = BACKGROUND_RENDER_RATE,
+        fps_clock: Optional[pygame.time.Clock] = None,
+        wait_until: Callable[[float], None] = sleep_until,
+        has_focus: Callable[[], bool] = window_has_focus,
+        vsync: bool = False,
+    ) -> None:
+        """Create a loop.
+
+        Args:
+            logic_rate (int, optional): Logic steps per second, 0 for lockstep mode where each
+                step is followed by one frame and the frames are paced by 'fps_clock'.
+                Defaults to LOGIC_RATE.
+            render_rate (int, optional): Frames per second, 0 for uncapped (with vsync, the
+                display paces the frames). Defaults to FPS.
+            background_render_rate (Optional[int], optional): Frames per second while the window
+                does not have the focus, None to keep rendering at 'render_rate'.
+                Defaults to BACKGROUND_RENDER_RATE.
+            fps_clock (Optional[pygame.time.Clock], optional): Clock ticked once per frame. It
+                paces the frames in lockstep mode. Defaults to None (a new pygame clock).
+            wait_until (Callable[[float], None], optional): Waits until a time of
+                time.perf_counter, e.g. while handling input. Defaults to sleep_until.
+            has_focus (Callable[[], bool], optional): Whether the window has the focus.
+                Defaults to window_has_focus.
+            vsync (bool, optional): Whether presenting a frame waits for the monitor. Every
+                frame is then rendered, also if nothing changed, and the display paces the loop.
+                Defaults to False.
+        """
+        self.logic_rate = logic_rate
+        self.render_rate = render_rate
+        self.background_render_rate = background_render_rate
+        self.fps_clock = fps_clock if fps_clock is not None else pygame.time.Clock()
+        self.wait_until = wait_until
+        self.has_focus = has_focus
+        self.vsync = vsync
+        self.steps = 0
+        self.frames = 0
+
+    def _frame_interval(self) -> float:
+        """Seconds between two frames at the current render rate."""
+        render_rate = self.render_rate
+        if self.background_render_rate is not None and not self.has_focus():
+            render_rate = self.background_render_rate
+        return 1 / render_rate if render_rate > 0 else 0.0
+
+    def run(
+        self,
+        update: Callable[[], None],
+        render: Callable[[float], bool],
+        max_steps: Optional[int] = None,
+    ) -> None:
+        """Runs the loop until the maximum number of steps or until the program terminates.
+
+        Args:
+            update (Callable[[], None]): Advances the logic by one step.
+            render (Callable[[float], bool]): Draws a frame, called with the seconds elapsed
+                since the last logic step (always 0 in lockstep mode) to extrapolate animations.
+                Returns whether the frame is animated, i.e. the next frame differs even if no
+                logic step runs in between.
+            max_steps (Optional[int], optional): Return after this many logic steps.
+                Defaults to None (no limit).
+        """
+        if self.logic_rate <= 0:
+            while max_steps is None or self.steps < max_steps:
+                update()
+                self.steps += 1
+                render(0.0)
+                self.frames += 1
+                self.fps_clock.tick(self.render_rate)
+            return
+
+        step_length = 1 / self.logic_rate
+        previous_time = time.perf_counter()
+        next_frame_time = previous_time
+        lag = 0.0
+        rendered_steps = -1
+        animated = False
+        while max_steps is None or self.steps < max_steps:
+            now = time.perf_counter()
+            lag = min(lag + now - previous_time, MAX_CATCH_UP_STEPS * step_length)
+            previous_time = now
+            while lag >= step_length and (max_steps is None or self.steps < max_steps):
+                update()
+                self.steps += 1
+                lag -= step_length
+
+            needs_frame = self.vsync or animated or rendered_steps != self.steps
+            if needs_frame and now >= next_frame_time:
+                animated = render(lag)
+                rendered_steps = self.steps
+                self.frames += 1
+                self.fps_clock.tick()
+                next_frame_time = max(next_frame_time + self._frame_interval(), now)
+                needs_frame = self.vsync or animated
+            next_step_time = now + step_length - lag
+            if needs_frame:
+                self.wait_until(min(next_step_time, next_frame_time))
+            else:
+                self.wait_until(next_step_time)
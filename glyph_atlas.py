@@ -0,0 +1,235 @@
+import pygame
+from constants import MORSE_CODE, DOT_RADIUS, DASH_DIMENSIONS
+from typing import Dict, List, Optional, Tuple
+from utilities import Point
+
+
+def calculate_sequence_positions(sequence: str, interval: Point[int, int]) -> List[int]:
+    """Derive an evenly distributed list of positions for elements in a sequence
+
+    Args:
+        sequence (str): String consisting of dots & dashses.
+        interval (Point[int, int]): end points of an interval.
+
+    Returns:
+        List[int]: An evenly distributed list of positions for the elements in the sequence.
+    """
+    interval_length = interval.y - interval.x
+    n_sections = len(sequence)
+    section_length = interval_length // n_sections
+
+    sections = []
+    for i in range(n_sections):
+        section = (
+            interval.x + i * section_length,
+            interval.x + (i + 1) * section_length,
+        )
+        sections.append(section)
+
+    sequence_positions = []
+    for section in sections:
+        section_mid_point = (section[1] - section[0]) // 2
+        sequence_position = section[0] + section_mid_point
+        sequence_positions.append(sequence_position)
+
+    return sequence_positions
+
+
+class MorseGlyphAtlas:
+    """Pre-rendered morse code sequences for every letter.
+
+    Each letter is rendered twice: once spread out over the middle of the display (as shown on
+    the game screen) and once compact, for showing whole words.
+    """
+
+    def __init__(
+        self,
+        display_size: Tuple[int, int],
+        color: str = "black",
+        symbol_gap: int = 10,
+        letter_gap: int = 30,
+        scale: float = 1.0,
+    ) -> None:
+        """Render the glyphs of all letters for a display of a given size.
+
+        Args:
+            display_size (Tuple[int, int]): Size of the surface the glyphs will be drawn onto.
+            color (str, optional): Color of the dots & dashes. Defaults to "black".
+            symbol_gap (int, optional): Pixels between the symbols of a compact letter. Defaults to 10.
+            letter_gap (int, optional): Pixels between the letters of a word. Defaults to 30.
+            scale (float, optional): Factor applied to the size of the symbols and the gaps,
+                see layout.ScreenLayout.scale. Defaults to 1.0.
+        """
+        self.display_size = display_size
+        self.color = color
+        self.scale = scale
+        self.symbol_gap = max(1, round(symbol_gap * scale))
+        self.letter_gap = max(1, round(letter_gap * scale))
+        self.dot_radius = max(1, round(DOT_RADIUS * scale))
+        dash_dimensions = tuple(max(1, round(size * scale)) for size in DASH_DIMENSIONS)
+
+        radius = self.dot_radius
+        self.dot_surface = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+        pygame.draw.circle(self.dot_surface, color, (radius, radius), radius)
+        self.dash_surface = pygame.Surface(dash_dimensions, pygame.SRCALPHA)
+        self.dash_surface.fill(color)
+
+        self.letters: Dict[str, Tuple[pygame.Surface, Point]] = {}
+        self.compact_letters: Dict[str, pygame.Surface] = {}
+        for letter, sequence in MORSE_CODE.items():
+            self.letters[letter] = self._render_letter(sequence)
+            self.compact_letters[letter] = self._render_compact_letter(sequence)
+
+    def _render_letter(self, sequence: str) -> Tuple[pygame.Surface, Point]:
+        """Renders a sequence the way it is laid out on the game screen.
+
+        Args:
+            sequence (str): String consisting of dots & dashses.
+
+        Returns:
+            Tuple[pygame.Surface, Point]: The rendered sequence and where to blit it on the display.
+        """
+        width, height = self.display_size
+        # Offset for one side
+        x_offset = int(width * 0.3)
+        x_positions = calculate_sequence_positions(sequence, Point(x_offset, width - x_offset))
+        y_pos = height // 3
+
+        # Dots are centered on their position while dashes start at it
+        symbols = []
+        for x_pos, encoding in zip(x_positions, sequence):
+            if encoding == ".":
+                symbols.append(
+                    (self.dot_surface, Point(x_pos - self.dot_radius, y_pos - self.dot_radius))
+                )
+            elif encoding == "-":
+                symbols.append((self.dash_surface, Point(x_pos, y_pos)))
+
+        return self._compose(symbols)
+
+    def _render_compact_letter(self, sequence: str) -> pygame.Surface:
+        """Renders a sequence with a fixed gap between the symbols.
+
+        Args:
+            sequence (str): String consisting of dots & dashses.
+
+        Returns:
+            pygame.Surface: The rendered sequence.
+        """
+        symbols = []
+        x_pos = 0
+        for encoding in sequence:
+            if encoding == ".":
+                symbols.append((self.dot_surface, Point(x_pos, 0)))
+                x_pos += self.dot_surface.get_width() + self.symbol_gap
+            elif encoding == "-":
+                symbols.append((self.dash_surface, Point(x_pos, self.dot_radius)))
+                x_pos += self.dash_surface.get_width() + self.symbol_gap
+
+        return self._compose(symbols)[0]
+
+    @staticmethod
+    def _compose(symbols: List[Tuple[pygame.Surface, Point]]) -> Tuple[pygame.Surface, Point]:
+        """Blits symbols onto a surface just large enough to hold all of them.
+
+        Args:
+            symbols (List[Tuple[pygame.Surface, Point]]): Symbol surfaces and their positions.
+
+        Returns:
+            Tuple[pygame.Surface, Point]: The composed surface and its top left position.
+        """
+        rects = [surface.get_rect(topleft=position) for surface, position in symbols]
+        bounds = rects[0].unionall(rects[1:])
+        composed_surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        composed_surface.blits(
+            [
+                (surface, (position.x - bounds.x, position.y - bounds.y))
+                for surface, position in symbols
+            ],
+            doreturn=False,
+        )
+        return composed_surface, Point(bounds.x, bounds.y)
+
+    def draw_letter(self, display_surface: pygame.Surface, letter: str) -> pygame.Rect:
+        """Draws the morse code of a letter the way it is laid out on the game screen.
+
+        Args:
+            display_surface (pygame.Surface): main game surface.
+            letter (str): self-explanatory.
+
+        Returns:
+            pygame.Rect: Bounding rectangle of the drawn sequence.
+        """
+        letter_surface, position = self.letters[letter.upper()]
+        return display_surface.blit(letter_surface, position)
+
+    def measure_word(self, word: str) -> Tuple[int, int]:
+        """Returns the size of a word drawn by 'draw_word'.
+
+        Args:
+            word (str): self-explanatory.
+
+        Returns:
+            Tuple[int, int]: Width & height in pixels.
+        """
+        if not word:
+            return 0, 0
+        letter_surfaces = [self.compact_letters[letter] for letter in word.upper()]
+        word_width = sum(surface.get_width() for surface in letter_surfaces) + self.letter_gap * (
+            len(letter_surfaces) - 1
+        )
+        word_height = max(surface.get_height() for surface in letter_surfaces)
+        return word_width, word_height
+
+    def draw_word(
+        self, display_surface: pygame.Surface, word: str, center: Tuple[int, int]
+    ) -> pygame.Rect:
+        """Draws the morse code of a whole word with a single blits call.
+
+        Args:
+            display_surface (pygame.Surface): any pygame surface.
+            word (str): self-explanatory.
+            center (Tuple[int, int]): Where to center the word on the surface.
+
+        Returns:
+            pygame.Rect: Bounding rectangle of the drawn word.
+        """
+        if not word:
+            return pygame.Rect(center, (0, 0))
+
+        letter_surfaces = [self.compact_letters[letter] for letter in word.upper()]
+        word_width, word_height = self.measure_word(word)
+
+        x_pos = center[0] - word_width // 2
+        y_pos = center[1] - word_height // 2
+        blit_sequence = []
+        for letter_surface in letter_surfaces:
+            blit_sequence.append((letter_surface, (x_pos, y_pos)))
+            x_pos += letter_surface.get_width() + self.letter_gap
+
+        drawn_rects = display_surface.blits(blit_sequence)
+        return drawn_rects[0].unionall(drawn_rects[1:])
+
+
+_GLYPH_ATLASES: Dict[str, MorseGlyphAtlas] = {}
+
+
+def get_glyph_atlas(
+    display_size: Tuple[int, int], color: str = "black", scale: float = 1.0
+) -> MorseGlyphAtlas:
+    """Retrieve the glyph atlas for a display size, the atlas is rebuilt when the size or the
+    scale changes.
+
+    Args:
+        display_size (Tuple[int, int]): Size of the surface the glyphs will be drawn onto.
+        color (str, optional): Color of the dots & dashes. Defaults to "black".
+        scale (float, optional): Factor applied to the size of the symbols. Defaults to 1.0.
+
+    Returns:
+        MorseGlyphAtlas: self-explanatory.
+    """
+    atlas: Optional[MorseGlyphAtlas] = _GLYPH_ATLASES.get(color)
+    if atlas is None or atlas.display_size != tuple(display_size) or atlas.scale != scale:
+        atlas = MorseGlyphAtlas(tuple(display_size), color, scale=scale)
+        _GLYPH_ATLASES[color] = atlas
+    return atlas
@@ -0,0 +1,212 @@
+"""Runs the game screen without a display, driven by scripted input, and reports how fast
+frames are rendered. Useful for catching rendering regressions on machines without a display.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import statistics
+import string
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import pygame
+from pygame.locals import KEYUP, MOUSEBUTTONUP
+from animation import AnimationScheduler
+from constants import MAXIMUM_WORD_LENGTH
+from game_loop import GameLoop
+from morse_code import GameInput, initialize_pygame, use_game_screen
+from profiler import FrameProfiler
+from word_handler import WordHandler
+
+_EVENT_TYPES = {"KEYUP": KEYUP, "MOUSEBUTTONUP": MOUSEBUTTONUP}
+
+
+class ScriptedEvents:
+    """Event source returning a fixed list of events for each frame"""
+
+    def __init__(self, events_per_frame: Dict[int, List[pygame.event.Event]]) -> None:
+        """Create an event source from the events of each frame.
+
+        Args:
+            events_per_frame (Dict[int, List[pygame.event.Event]]): Events keyed by frame number,
+                starting at 0.
+        """
+        self.events_per_frame = events_per_frame
+        self.frame = 0
+
+    def __call__(self) -> List[pygame.event.Event]:
+        events = self.events_per_frame.get(self.frame, [])
+        self.frame += 1
+        return events
+
+    @classmethod
+    def from_file(cls, path: str) -> "ScriptedEvents":
+        """Reads a script with one JSON event per line, e.g.
+        {"frame": 10, "type": "KEYUP", "key": 97, "unicode": "a"} or
+        {"frame": 20, "type": "MOUSEBUTTONUP", "pos": [820, 510], "button": 1}.
+
+        Args:
+            path (str): Location of the script.
+
+        Returns:
+            ScriptedEvents: self-explanatory.
+        """
+        events_per_frame: Dict[int, List[pygame.event.Event]] = {}
+        with open(path, encoding="utf-8") as script_file:
+            for line in script_file:
+                if not line.strip():
+                    continue
+                attributes = json.loads(line)
+                frame = attributes.pop("frame")
+                event_type = _EVENT_TYPES[attributes.pop("type")]
+                if "pos" in attributes:
+                    attributes["pos"] = tuple(attributes["pos"])
+                events_per_frame.setdefault(frame, []).append(
+                    pygame.event.Event(event_type, attributes)
+                )
+        return cls(events_per_frame)
+
+    @classmethod
+    def typing(cls, n_frames: int, interval: int = 5) -> "ScriptedEvents":
+        """Creates a script typing the letters of the alphabet, one every few frames.
+
+        Args:
+            n_frames (int): Length of the script in frames.
+            interval (int, optional): Frames between two key presses. Defaults to 5.
+
+        Returns:
+            ScriptedEvents: self-explanatory.
+        """
+        events_per_frame = {}
+        for i, frame in enumerate(range(0, n_frames, interval)):
+            letter = string.ascii_lowercase[i % len(string.ascii_lowercase)]
+            events_per_frame[frame] = [
+                pygame.event.Event(KEYUP, key=ord(letter), unicode=letter, mod=0)
+            ]
+        return cls(events_per_frame)
+
+
+class FrameTimer:
+    """Stand-in for pygame.time.Clock recording the duration of each frame without waiting"""
+
+    def __init__(self) -> None:
+        self.frame_times: List[float] = []
+        self._last_tick = time.perf_counter()
+
+    def tick(self, framerate: int = 0) -> int:
+        now = time.perf_counter()
+        self.frame_times.append(now - self._last_tick)
+        self._last_tick = now
+        return int(self.frame_times[-1] * 1000)
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_headless(
+    events: ScriptedEvents,
+    n_frames: int,
+    trace_allocations: bool = False,
+    window_size: tuple = (960, 600),
+    profile_output: Optional[str] = None,
+) -> Dict[str, float]:
+    """Runs the game screen for a number of frames as fast as possible.
+
+    Args:
+        events (ScriptedEvents): Input fed into the game screen.
+        n_frames (int): Number of frames to render.
+        trace_allocations (bool, optional): Whether to trace memory allocations, slows down the
+            game considerably. Defaults to False.
+        window_size (tuple, optional): Size of the (invisible) window. Defaults to (960, 600).
+        profile_output (Optional[str], optional): Write a frame profile to this .json or .csv
+            file. Defaults to None (no profiling).
+
+    Returns:
+        Dict[str, float]: Frames per second, frame time and feedback latency percentiles in
+        milliseconds and, if traced, allocated memory in KiB.
+    """
+    display_surface, _ = initialize_pygame(*window_size, "Morse Code (headless)")
+    word_handler = WordHandler(max_size=MAXIMUM_WORD_LENGTH, offline=True)
+    frame_timer = FrameTimer()
+    animation_scheduler = AnimationScheduler()
+    profiler = FrameProfiler(enabled=profile_output is not None, capacity=max(n_frames, 1))
+
+    if trace_allocations:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    use_game_screen(
+        display_surface,
+        frame_timer,
+        word_handler=word_handler,
+        game_input=GameInput(events),
+        game_loop=GameLoop(logic_rate=0, render_rate=0, fps_clock=frame_timer),
+        max_frames=n_frames,
+        show_gameover_screen=False,
+        profiler=profiler,
+        animation_scheduler=animation_scheduler,
+    )
+    total_time = time.perf_counter() - start_time
+    word_handler.close()
+    if profile_output is not None:
+        profiler.dump(profile_output)
+
+    frame_times = sorted(frame_time * 1000 for frame_time in frame_timer.frame_times)
+    report = {
+        "frames": len(frame_times),
+        "frames_per_second": len(frame_times) / total_time,
+        "frame_time_mean_ms": statistics.fmean(frame_times),
+        "frame_time_p50_ms": _percentile(frame_times, 50),
+        "frame_time_p95_ms": _percentile(frame_times, 95),
+        "frame_time_p99_ms": _percentile(frame_times, 99),
+        "frame_time_max_ms": frame_times[-1],
+    }
+    report.update(animation_scheduler.latency_report())
+    if trace_allocations:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report["allocated_kib"] = current / 1024
+        report["allocated_peak_kib"] = peak / 1024
+        report["allocated_per_frame_bytes"] = current / len(frame_times)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=3000, help="number of frames to render")
+    parser.add_argument("--script", help="JSON lines file with the events of each frame")
+    parser.add_argument(
+        "--interval", type=int, default=5, help="frames between key presses without a script"
+    )
+    parser.add_argument(
+        "--trace-allocations", action="store_true", help="report memory allocations"
+    )
+    parser.add_argument("--profile-output", help="write a frame profile to a .json/.csv file")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.script:
+        events = ScriptedEvents.from_file(args.script)
+    else:
+        events = ScriptedEvents.typing(args.frames, args.interval)
+    report = run_headless(
+        events, args.frames, args.trace_allocations, profile_output=args.profile_output
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, value in report.items():
+            print(f"{name:>26}: {value:.2f}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
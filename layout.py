@@ -0,0 +1,94 @@
+"""Positions and sizes of everything shown on the screens, computed once per window size.
+
+The screens were designed for a window of DESIGN_SIZE. Anchors are fractions of the window size,
+font sizes, morse symbols and other pixel sizes are multiplied by the scale of the window: the
+factor by which its tighter dimension is larger or smaller than the design size. A layout is
+only computed again when the size of the window changes, e.g. after VIDEORESIZE or toggling
+fullscreen.
+"""
+
+import pygame
+from typing import Dict, List, Optional, Tuple
+from utilities import Point
+
+DESIGN_SIZE = (960, 600)
+
+
+class ScreenLayout:
+    """Anchors of all screens for one window size"""
+
+    def __init__(self, size: Tuple[int, int]) -> None:
+        """Compute the layout of a window.
+
+        Args:
+            size (Tuple[int, int]): Width & height of the window.
+        """
+        width, height = size
+        self.size = (width, height)
+        self.scale = min(width / DESIGN_SIZE[0], height / DESIGN_SIZE[1])
+        self.midpoint = Point(width // 2, height // 2)
+
+        # Game screen
+        self.score_position = Point(width // 10 * 9, height // 10 * 1)
+        self.guessed_letter_position = Point(width // 2, height // 4 * 3)
+        self.guessed_letters_start = Point(width // 10 * 1, height // 10 * 8)
+        self.guessed_letters_max_x = width // 10 * 9
+        self.cheat_button_position = Point(width // 12 * 10, height // 12 * 10)
+        self.life_bar_origin = Point(width // 30 * 1, height // 30 * 1)
+        self.life_bar_size = Point(self.scaled(40), self.scaled(10))
+        self.life_bar_gap = self.scaled(2)
+        self._life_bar_rects: Dict[int, List[pygame.Rect]] = {}
+
+        # Static screens
+        self.line_gap = self.scaled(20)
+        self.gameover_position = Point(width // 2, height // 4)
+        self.cheat_position = Point(width // 2, height // 3)
+
+    def scaled(self, size: int) -> int:
+        """Scales a size in pixels of the design size to the window, e.g. a font size.
+
+        Args:
+            size (int): self-explanatory.
+
+        Returns:
+            int: The scaled size, at least 1.
+        """
+        return max(1, round(size * self.scale))
+
+    def life_bar_rects(self, max_lives: int) -> List[pygame.Rect]:
+        """Returns the rectangles of the life bars, the first life at the bottom.
+
+        Args:
+            max_lives (int): Number of life bars.
+
+        Returns:
+            List[pygame.Rect]: self-explanatory, do not modify them.
+        """
+        rects = self._life_bar_rects.get(max_lives)
+        if rects is None:
+            step = self.life_bar_size.y + self.life_bar_gap
+            bottom = self.life_bar_origin.y + max_lives * step
+            rects = [
+                pygame.Rect(self.life_bar_origin.x, bottom - i * step, *self.life_bar_size)
+                for i in range(max_lives)
+            ]
+            self._life_bar_rects[max_lives] = rects
+        return rects
+
+
+_LAYOUT: Optional[ScreenLayout] = None
+
+
+def get_layout(size: Tuple[int, int]) -> ScreenLayout:
+    """Retrieve the layout for a window size, the layout is recomputed when the size changes.
+
+    Args:
+        size (Tuple[int, int]): Width & height of the window.
+
+    Returns:
+        ScreenLayout: self-explanatory.
+    """
+    global _LAYOUT
+    if _LAYOUT is None or _LAYOUT.size != tuple(size):
+        _LAYOUT = ScreenLayout(tuple(size))
+    return _LAYOUT
@@ -0,0 +1,203 @@
+import numpy as np
+import pygame
+from collections import deque
+from constants import MORSE_CODE_EXTENDED
+from typing import Deque, Dict, List, Optional
+
+
+class MorseSynthesizer:
+    """Synthesizes morse code as continuous wave (CW) tones.
+
+    Dot, dash and gap buffers are synthesized once, every letter is assembled from them the
+    first time it is requested and cached afterwards.
+    """
+
+    def __init__(
+        self,
+        wpm: float = 20,
+        frequency: float = 600.0,
+        sample_rate: int = 44100,
+        volume: float = 0.5,
+        ramp_duration: float = 0.005,
+    ) -> None:
+        """Create a synthesizer for a given speed and pitch.
+
+        Args:
+            wpm (float, optional): Speed in words per minute (PARIS standard). Defaults to 20.
+            frequency (float, optional): Pitch of the tone in Hz. Defaults to 600.0.
+            sample_rate (int, optional): Samples per second. Defaults to 44100.
+            volume (float, optional): Amplitude of the tone, between 0 and 1. Defaults to 0.5.
+            ramp_duration (float, optional): Seconds of the raised cosine envelope at the start
+                and end of each tone, avoids audible clicks. Defaults to 0.005.
+        """
+        self.wpm = wpm
+        self.frequency = frequency
+        self.sample_rate = sample_rate
+        self.volume = volume
+        self.ramp_duration = ramp_duration
+        self.unit_length = 1.2 / wpm  # Duration of a dot in seconds
+
+        self.dot = self._tone(1)
+        self.dash = self._tone(3)
+        self.symbol_gap = self._silence(1)
+        self.letter_gap = self._silence(3)
+        self.word_gap = self._silence(7)
+        self._letters: Dict[str, np.ndarray] = {}
+
+    def _samples(self, units: int) -> int:
+        return int(round(units * self.unit_length * self.sample_rate))
+
+    def _tone(self, units: int) -> np.ndarray:
+        """Synthesizes a tone with a raised cosine envelope.
+
+        Args:
+            units (int): Length of the tone in dot units.
+
+        Returns:
+            np.ndarray: 16 bit mono samples.
+        """
+        n_samples = self._samples(units)
+        time = np.arange(n_samples) / self.sample_rate
+        tone = np.sin(2 * np.pi * self.frequency * time)
+
+        n_ramp = min(int(self.ramp_duration * self.sample_rate), n_samples // 2)
+        if n_ramp > 0:
+            ramp = 0.5 * (1 - np.cos(np.pi * np.arange(n_ramp) / n_ramp))
+            tone[:n_ramp] *= ramp
+            tone[n_samples - n_ramp :] *= ramp[::-1]
+
+        return (tone * self.volume * np.iinfo(np.int16).max).astype(np.int16)
+
+    def _silence(self, units: int) -> np.ndarray:
+        return np.zeros(self._samples(units), dtype=np.int16)
+
+    def letter(self, character: str) -> np.ndarray:
+        """Retrieve the samples of a single character, without trailing gap.
+
+        Args:
+            character (str): Any character of MORSE_CODE_EXTENDED.
+
+        Returns:
+            np.ndarray: 16 bit mono samples, shared between callers and must not be modified.
+        """
+        character = character.upper()
+        samples = self._letters.get(character)
+        if samples is None:
+            parts = []
+            for symbol in MORSE_CODE_EXTENDED[character]:
+                if parts:
+                    parts.append(self.symbol_gap)
+                parts.append(self.dot if symbol == "." else self.dash)
+            samples = np.concatenate(parts)
+            samples.flags.writeable = False
+            self._letters[character] = samples
+        return samples
+
+    def buffers(self, text: str) -> List[np.ndarray]:
+        """Splits a text into the cached buffers needed to play it, nothing is copied.
+
+        Args:
+            text (str): Letters, digits, punctuation and spaces.
+
+        Returns:
+            List[np.ndarray]: Buffers to be played one after another.
+        """
+        buffers: List[np.ndarray] = []
+        for word in text.split():
+            if buffers:
+                buffers.append(self.word_gap)
+            for i, character in enumerate(word):
+                if i > 0:
+                    buffers.append(self.letter_gap)
+                buffers.append(self.letter(character))
+        return buffers
+
+    def synthesize(self, text: str) -> np.ndarray:
+        """Synthesizes a text into a single buffer, e.g. for writing it to a file.
+
+        Args:
+            text (str): Letters, digits, punctuation and spaces.
+
+        Returns:
+            np.ndarray: 16 bit mono samples.
+        """
+        buffers = self.buffers(text)
+        if not buffers:
+            return np.zeros(0, dtype=np.int16)
+        return np.concatenate(buffers)
+
+
+class MorsePlayer:
+    """Plays morse code through the pygame mixer without blocking the game loop.
+
+    The sound of every buffer is created once, playing a word queues the cached sounds of its
+    letters and gaps one after another on a mixer channel.
+    """
+
+    def __init__(self, wpm: float = 20, frequency: float = 600.0) -> None:
+        """Initialize the mixer (if needed) and create a synthesizer matching its format.
+
+        Args:
+            wpm (float, optional): Speed in words per minute. Defaults to 20.
+            frequency (float, optional): Pitch of the tone in Hz. Defaults to 600.0.
+
+        Raises:
+            pygame.error: If no audio device is available.
+        """
+        if pygame.mixer.get_init() is None:
+            pygame.mixer.init(frequency=44100, size=-16, channels=1)
+        sample_rate, _, self._n_channels = pygame.mixer.get_init()
+
+        self.synthesizer = MorseSynthesizer(wpm, frequency, sample_rate)
+        self._sounds: Dict[int, pygame.mixer.Sound] = {}
+        self._queue: Deque[pygame.mixer.Sound] = deque()
+        self._channel: Optional[pygame.mixer.Channel] = None
+
+    def _sound(self, samples: np.ndarray) -> pygame.mixer.Sound:
+        """Retrieve the sound of a cached buffer, creating it the first time.
+
+        Args:
+            samples (np.ndarray): A buffer owned by the synthesizer.
+
+        Returns:
+            pygame.mixer.Sound: self-explanatory.
+        """
+        key = id(samples)
+        sound = self._sounds.get(key)
+        if sound is None:
+            if self._n_channels > 1:
+                samples = np.repeat(samples[:, np.newaxis], self._n_channels, axis=1)
+            sound = pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+            self._sounds[key] = sound
+        return sound
+
+    def play(self, text: str) -> None:
+        """Starts playing a text, any text currently playing is stopped.
+
+        Args:
+            text (str): Letters, digits, punctuation and spaces.
+        """
+        self.stop()
+        self._queue.extend(self._sound(samples) for samples in self.synthesizer.buffers(text))
+        if self._queue:
+            self._channel = self._queue.popleft().play()
+        self.update()
+
+    def update(self) -> None:
+        """Queues the next sound on the channel, to be called once per frame."""
+        if self._channel is None:
+            self._queue.clear()
+            return
+        if self._queue and self._channel.get_queue() is None:
+            self._channel.queue(self._queue.popleft())
+
+    def stop(self) -> None:
+        """Stops playing and forgets about all queued sounds."""
+        self._queue.clear()
+        if self._channel is not None:
+            self._channel.stop()
+            self._channel = None
+
+    @property
+    def is_playing(self) -> bool:
+        return self._channel is not None and (bool(self._queue) or self._channel.get_busy())
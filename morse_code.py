@@ -1,16 +1,48 @@
+import argparse
+import atexit
+import random
 import sys
+import time
 import pygame
 from pygame.locals import *
-from constants import MAXIMUM_WORD_LENGTH, MORSE_CODE, FPS, DOT_RADIUS, DASH_DIMENSIONS
-from typing import Tuple, List
+from constants import (
+    FPS,
+    IDLE_WAKEUP_INTERVAL,
+    MAXIMUM_WORD_LENGTH,
+)
+from typing import Callable, NamedTuple, Tuple, List, Optional
 from word_handler import WordHandler
 from button import Button
+from event_log import GameRecorder
+from animation import AnimationScheduler, blink
+from font_cache import FONT_CACHE
+from game_engine import GameEngine
+from game_loop import GameLoop, sleep_until
+from glyph_atlas import get_glyph_atlas
+from layout import DESIGN_SIZE, ScreenLayout, get_layout
+from morse_audio import MorsePlayer
+from profiler import FrameProfiler
+from render_layer import RenderElement, RenderLayer
+from straight_key import KeyingEventSource, StraightKey
 from utilities import Color, Point
-import time
+from widgets import WidgetManager
+
+# Fired by one-shot timers of the static screens
+SCREEN_TIMER_EVENT = pygame.event.custom_type()
+
+# Display mode set by initialize_pygame, restored when leaving fullscreen
+_display_flags = 0
+_display_vsync = 0
+_windowed_size = DESIGN_SIZE
 
 
 def initialize_pygame(
-    width: int, height: int, caption: str
+    width: int,
+    height: int,
+    caption: str,
+    vsync: bool = False,
+    resizable: bool = False,
+    fullscreen: bool = False,
 ) -> Tuple[pygame.Surface, pygame.time.Clock]:
     """Initialize pygame and create a pygame display surface and a clock for controlling the FPS
 
@@ -18,13 +50,36 @@ def initialize_pygame(
         width (int): width of display surface
         height (int): height of display surface
         caption (str): caption of display surface
+        vsync (bool, optional): synchronize display updates with the refresh rate of the
+            monitor, if the platform supports it. Defaults to False.
+        resizable (bool, optional): whether the window can be resized. Defaults to False.
+        fullscreen (bool, optional): start in fullscreen, F11 toggles it. Defaults to False.
 
     Returns:
         Tuple[pygame.Surface, pygame.time.Clock]: display surface and main clock controlling the FPS
     """
+    global _display_flags, _display_vsync, _windowed_size
     pygame.init()
     fps_clock = pygame.time.Clock()
-    displaySurface = pygame.display.set_mode((width, height))
+    _display_flags = RESIZABLE if resizable else 0
+    _display_vsync = 0
+    _windowed_size = (width, height)
+    size = (0, 0) if fullscreen else (width, height)
+    fullscreen_flag = FULLSCREEN if fullscreen else 0
+    displaySurface = None
+    if vsync:
+        try:
+            displaySurface = pygame.display.set_mode(
+                _fullscreen_size(SCALED) if fullscreen else size,
+                _display_flags | fullscreen_flag | SCALED,
+                vsync=1,
+            )
+            _display_flags |= SCALED
+            _display_vsync = 1
+        except pygame.error as pygame_err:
+            print(f"ERROR: Vsync is not available: {pygame_err}")
+    if displaySurface is None:
+        displaySurface = pygame.display.set_mode(size, _display_flags | fullscreen_flag)
     pygame.display.set_caption(caption)
 
     return displaySurface, fps_clock
@@ -44,8 +99,7 @@ def create_text(
     Returns:
         Tuple[pygame.Surface, pygame.Rect]: Text surface and rectangle
     """
-    font = pygame.font.Font("freesansbold.ttf", font_size)
-    text_surface = font.render(text, True, color)
+    text_surface = FONT_CACHE.render(text, font_size, color)
 
     text_rectangle = text_surface.get_rect()
     text_rectangle.center = coordinates
@@ -65,18 +119,50 @@ def get_midpoint(display: pygame.Surface) -> Point[int, int]:
     return Point(display.get_width() // 2, display.get_height() // 2)
 
 
-def check_keyup_event() -> bool:
-    """Returns true or false depending on whether a keyup event is found or not.
+def vsync_enabled() -> bool:
+    """Whether the display created by initialize_pygame waits for the monitor."""
+    return bool(_display_vsync)
+
+
+def _fullscreen_size(flags: int) -> Tuple[int, int]:
+    """Size of a fullscreen display, SCALED displays need the size of the desktop instead of
+    (0, 0).
+    """
+    return pygame.display.get_desktop_sizes()[0] if flags & SCALED else (0, 0)
+
+
+def toggle_fullscreen() -> pygame.Surface:
+    """Switches between fullscreen and the window size before entering fullscreen.
 
     Returns:
-        bool: Returns true if a keyup event is found, false otherwise.
+        pygame.Surface: The display surface, resized. Unchanged if the display mode could not
+        be set.
     """
-    for event in pygame.event.get():
-        if (event.type == QUIT) or (event.type == KEYUP and event.key == K_ESCAPE):
-            terminate()
-        elif event.type == KEYUP:
-            return True
-    return False
+    global _windowed_size
+    display_surface = pygame.display.get_surface()
+    try:
+        if display_surface.get_flags() & FULLSCREEN:
+            return pygame.display.set_mode(_windowed_size, _display_flags, vsync=_display_vsync)
+        windowed_size = display_surface.get_size()
+        display_surface = pygame.display.set_mode(
+            _fullscreen_size(_display_flags), _display_flags | FULLSCREEN, vsync=_display_vsync
+        )
+        _windowed_size = windowed_size
+    except pygame.error as pygame_err:
+        print(f"ERROR: Could not toggle fullscreen: {pygame_err}")
+    return display_surface
+
+
+def set_window_size(size: Tuple[int, int]) -> pygame.Surface:
+    """Resizes the window, e.g. to the sizes of a recorded session.
+
+    Args:
+        size (Tuple[int, int]): Width & height of the display surface.
+
+    Returns:
+        pygame.Surface: The display surface, resized.
+    """
+    return pygame.display.set_mode(size, _display_flags, vsync=_display_vsync)
 
 
 def terminate() -> None:
@@ -85,6 +171,62 @@ def terminate() -> None:
     sys.exit()
 
 
+def _wait_for_event() -> pygame.event.Event:
+    """Blocks until an event arrives, the program is terminated on QUIT or escape and F11
+    toggles fullscreen.
+
+    Returns:
+        pygame.event.Event: The event, NOEVENT if none arrived within IDLE_WAKEUP_INTERVAL and
+        VIDEORESIZE after toggling fullscreen.
+    """
+    # The timeout hands control back to Python regularly so signals such as Ctrl+C are handled
+    event = pygame.event.wait(IDLE_WAKEUP_INTERVAL)
+    if (event.type == QUIT) or (event.type == KEYUP and event.key == K_ESCAPE):
+        terminate()
+    if event.type == KEYUP and event.key == K_F11:
+        width, height = toggle_fullscreen().get_size()
+        return pygame.event.Event(VIDEORESIZE, size=(width, height), w=width, h=height)
+    return event
+
+
+def wait_for_keyup(redraw: Callable[[], None], ignore_duration: int = 0) -> None:
+    """Shows a static screen until a key is released. The screen is drawn once and only redrawn
+    when the window has been exposed or resized, no CPU time is used while waiting.
+
+    Args:
+        redraw (Callable[[], None]): Draws the content of the screen.
+        ignore_duration (int, optional): Milliseconds during which released keys are ignored, e.g.
+            keys that were meant for the previous screen. Defaults to 0.
+    """
+    redraw()
+    pygame.display.update()
+
+    accept_keys = ignore_duration <= 0
+    if not accept_keys:
+        pygame.time.set_timer(SCREEN_TIMER_EVENT, ignore_duration, loops=1)
+    while True:
+        event = _wait_for_event()
+        if event.type == SCREEN_TIMER_EVENT:
+            accept_keys = True
+        elif event.type == KEYUP and accept_keys:
+            return
+        elif event.type in (VIDEOEXPOSE, WINDOWEXPOSED, VIDEORESIZE, WINDOWSIZECHANGED):
+            redraw()
+            pygame.display.update()
+
+
+def wait_for_duration(duration: int) -> None:
+    """Keeps the current screen for a while without blocking the event handling. Events other
+    than QUIT and escape are discarded.
+
+    Args:
+        duration (int): self-explanatory, in milliseconds.
+    """
+    pygame.time.set_timer(SCREEN_TIMER_EVENT, duration, loops=1)
+    while _wait_for_event().type != SCREEN_TIMER_EVENT:
+        pass
+
+
 def use_start_screen(
     display_surface: pygame.Surface,
     fps_clock: pygame.time.Clock,
@@ -99,32 +241,23 @@ def use_start_screen(
         fps_clock (pygame.time.Clock): Main game clock.
         background_color (Color, optional): Start screen color. Defaults to Color(255, 0, 0).
     """
-    midpoint_display_surface = get_midpoint(display_surface)
-    header_coorindates = (
-        midpoint_display_surface.x,
-        midpoint_display_surface.y - 20,
-    )
-    paragraph_coordinates = (
-        midpoint_display_surface.x,
-        midpoint_display_surface.y + 20,
-    )
 
-    header_surface, header_rect = create_text("Morse Code", 32, header_coorindates)
-    paragraph_surface, paragraph_rect = create_text(
-        "Press any key to start", 24, paragraph_coordinates
-    )
+    def redraw() -> None:
+        layout = get_layout(display_surface.get_size())
+        header_coorindates = (layout.midpoint.x, layout.midpoint.y - layout.line_gap)
+        paragraph_coordinates = (layout.midpoint.x, layout.midpoint.y + layout.line_gap)
+        header_surface, header_rect = create_text(
+            "Morse Code", layout.scaled(32), header_coorindates
+        )
+        paragraph_surface, paragraph_rect = create_text(
+            "Press any key to start", layout.scaled(24), paragraph_coordinates
+        )
 
-    while True:
         display_surface.fill(background_color)
-
         display_surface.blit(header_surface, header_rect)
         display_surface.blit(paragraph_surface, paragraph_rect)
 
-        if check_keyup_event():
-            return
-
-        pygame.display.update()
-        fps_clock.tick(FPS)
+    wait_for_keyup(redraw)
 
 
 def use_instructions_screen(
@@ -145,83 +278,68 @@ def use_instructions_screen(
         "2. Your mission is to enter the correct letter for each sequence of dots & dashses.",
         "3. You have five life points, each time you enter the incorrect letter a life point is lost.",
     ]
-    midpoint_display_surface = get_midpoint(display_surface)
-
-    gap_size = 20
-    text_objects = []
-    for i, instruction in enumerate(instructions):
-        coordinates = (
-            midpoint_display_surface.x,
-            midpoint_display_surface.y + i * gap_size,
-        )
-        text_objects.append(create_text(instruction, 20, coordinates))
 
-    while True:
+    def redraw() -> None:
+        layout = get_layout(display_surface.get_size())
+        text_objects = []
+        for i, instruction in enumerate(instructions):
+            coordinates = (layout.midpoint.x, layout.midpoint.y + i * layout.line_gap)
+            text_objects.append(create_text(instruction, layout.scaled(20), coordinates))
+
         display_surface.fill(background_color)
         for text, text_rect in text_objects:
             display_surface.blit(text, text_rect)
-        if check_keyup_event():
-            return
-        pygame.display.update()
-        fps_clock.tick(FPS)
 
+    wait_for_keyup(redraw)
 
-def calculate_sequence_positions(sequence: str, interval: Point[int, int]) -> List[int]:
-    """Derive an evenly distributed list of positions for elements in a sequence
+
+def draw_morse_code(
+    display_surface: pygame.Surface, letter: str, layout: Optional[ScreenLayout] = None
+) -> pygame.Rect:
+    """Draws the morse code representation of a letter onto a surface
 
     Args:
-        sequence (str): String consisting of dots & dashses.
-        interval (Point[int, int]): end points of an interval.
+        display_surface (pygame.Surface): main game surface.
+        letter (str): self-explanatory.
+        layout (Optional[ScreenLayout], optional): layout of the surface. Defaults to None
+            (looked up for the size of the surface).
 
     Returns:
-        List[int]: An evenly distributed list of positions for the elements in the sequence.
+        pygame.Rect: Bounding rectangle of the drawn sequence.
     """
-    interval_length = interval.y - interval.x
-    n_sections = len(sequence)
-    section_length = interval_length // n_sections
-
-    sections = []
-    for i in range(n_sections):
-        section = (
-            interval.x + i * section_length,
-            interval.x + (i + 1) * section_length,
-        )
-        sections.append(section)
+    if layout is None:
+        layout = get_layout(display_surface.get_size())
+    atlas = get_glyph_atlas(layout.size, scale=layout.scale)
+    return atlas.draw_letter(display_surface, letter)
 
-    sequence_positions = []
-    for section in sections:
-        section_mid_point = (section[1] - section[0]) // 2
-        sequence_position = section[0] + section_mid_point
-        sequence_positions.append(sequence_position)
 
-    return sequence_positions
-
-
-def draw_morse_code(display_surface: pygame.Surface, letter: str) -> None:
-    """Draws the morse code representation of a letter onto a surface
+def draw_morse_word(
+    display_surface: pygame.Surface,
+    word: str,
+    center: Tuple[int, int],
+    layout: Optional[ScreenLayout] = None,
+) -> pygame.Rect:
+    """Draws the morse code representation of a whole word onto a surface
 
     Args:
-        display_surface (pygame.Surface): main game surface.
-        letter (str): self-explanatory.
+        display_surface (pygame.Surface): any pygame surface.
+        word (str): self-explanatory.
+        center (Tuple[int, int]): where to center the word on the surface.
+        layout (Optional[ScreenLayout], optional): layout of the surface. Defaults to None
+            (looked up for the size of the surface).
+
+    Returns:
+        pygame.Rect: Bounding rectangle of the drawn word.
     """
-    sequence = MORSE_CODE[letter.upper()]
-    # Offset for one side
-    x_offset = int(display_surface.get_width() * 0.3)
-    x_interval = Point(x_offset, display_surface.get_width() - x_offset)
-
-    x_positions = calculate_sequence_positions(sequence, x_interval)
-    y_pos = display_surface.get_height() // 3
-    for i, encoding in enumerate(sequence):
-        x_pos = x_positions[i]
-        if encoding == ".":
-            pygame.draw.circle(display_surface, "black", (x_pos, y_pos), DOT_RADIUS)
-        elif encoding == "-":
-            pygame.draw.rect(
-                display_surface, "black", (x_pos, y_pos, DASH_DIMENSIONS[0], DASH_DIMENSIONS[1])
-            )
+    if layout is None:
+        layout = get_layout(display_surface.get_size())
+    atlas = get_glyph_atlas(layout.size, scale=layout.scale)
+    return atlas.draw_word(display_surface, word, center)
 
 
-def draw_text(text: str, surface: pygame.Surface, position: Point, font_size: int = 128) -> None:
+def draw_text(
+    text: str, surface: pygame.Surface, position: Point, font_size: int = 128
+) -> pygame.Rect:
     """Creates a surface and rectangle for the provided text and blits them onto a surface.
 
     Args:
@@ -229,40 +347,17 @@ def draw_text(text: str, surface: pygame.Surface, position: Point, font_size: in
         surface (pygame.Surface): any pygame surface.
         position (Point): where to display the text on the surface.
         font_size (int, optional): text size. Defaults to 128.
+
+    Returns:
+        pygame.Rect: Bounding rectangle of the drawn text.
     """
     text_surf, text_rect = create_text(text, font_size, position)
-    surface.blit(text_surf, text_rect)
-
-
-# TODO make this function a bit better, move _draw_continuous_hue outside the fcn?
-def draw_blinking_surface(
-    display_surface: pygame.Surface,
-    fps_clock: pygame.time.Clock,
-    blinking_color: Color,
-    number_of_blinks: int,
-    animation_speed: int = 75,
-) -> None:
-    original_surface = display_surface.copy()
-
-    def _draw_continuous_hue(start: int, end: int, step: int, animation_speed: int, color) -> None:
-        for alpha in range(start, end, step * animation_speed):
-            display_surface.blit(original_surface, (0, 0))
-            flash_surface.fill((color.r, color.g, color.b, alpha)),
-            display_surface.blit(flash_surface, (0, 0))
-            pygame.display.update()
-            fps_clock.tick(FPS)
-
-    flash_surface = display_surface.convert_alpha()
-    display_surface.blit(original_surface, (0, 0))
-    for i in range(number_of_blinks):
-        for (start, end, step) in ((0, 255, 1), (255, 0, -1)):
-            _draw_continuous_hue(start, end, step, animation_speed, blinking_color)
-    display_surface.blit(original_surface, (0, 0))
+    return surface.blit(text_surf, text_rect)
 
 
 def draw_score(
     display_surface: pygame.Surface, score: int, position: Point, font_size: int = 20
-) -> None:
+) -> pygame.Rect:
     """Draws the current score of the player.
 
     Args:
@@ -270,42 +365,62 @@ def draw_score(
         score (int): current score of the player.
         position (Point): where to draw the score.
         font_size (int, optional): size of the text. Defaults to 20.
+
+    Returns:
+        pygame.Rect: Bounding rectangle of the drawn score.
     """
     score_msg = f"Score: {score}"
     score_surf, score_rect = create_text(score_msg, font_size=font_size, coordinates=position)
-    display_surface.blit(score_surf, score_rect)
+    return display_surface.blit(score_surf, score_rect)
 
 
 def draw_guessed_letters(
-    display_surface: pygame.Surface, letters: List[str], font_size: int = 16
-) -> None:
+    display_surface: pygame.Surface,
+    letters: List[str],
+    font_size: int = 16,
+    layout: Optional[ScreenLayout] = None,
+) -> pygame.Rect:
     """Draws all the guessed letters onto a surface.
 
     Args:
         display_surface (pygame.Surface): main game surface.
         letters (List[str]): sequence of letters to draw on the surface.
-        font_size (int, optional): text size. Defaults to 16.
+        font_size (int, optional): text size at the design size of the layout. Defaults to 16.
+        layout (Optional[ScreenLayout], optional): layout of the surface. Defaults to None
+            (looked up for the size of the surface).
+
+    Returns:
+        pygame.Rect: Bounding rectangle of the drawn letters.
     """
-    display_coords = Point(display_surface.get_width(), display_surface.get_height())
-    start_pos = Point(display_coords.x // 10 * 1, display_coords.y // 10 * 8)
-    max_x_pos = display_coords.x // 10 * 9
+    if layout is None:
+        layout = get_layout(display_surface.get_size())
+    start_pos = layout.guessed_letters_start
+    max_x_pos = layout.guessed_letters_max_x
+    font_size = layout.scaled(font_size)
+    spacing = layout.scaled(5)
     gap_size = Point(0, 0)
 
     texts_to_print = ["Guesses:"] + letters
+    drawn_rects = []
     for text in texts_to_print:
-        text_position = Point(start_pos.x + gap_size.x, start_pos.y)
-        if text_position.x > max_x_pos:
-            text_position.y = start_pos.y + gap_size.y
+        text_surf, text_rect = create_text(text, font_size, (0, 0))
+        if start_pos.x + gap_size.x > max_x_pos:
+            # Continue on the next line
+            gap_size = Point(0, gap_size.y + text_surf.get_height() + spacing)
+        text_rect.center = (start_pos.x + gap_size.x, start_pos.y + gap_size.y)
+        drawn_rects.append(display_surface.blit(text_surf, text_rect))
 
-        text_surf, text_rect = create_text(text, font_size, text_position)
-        display_surface.blit(text_surf, text_rect)
+        gap_size = Point(gap_size.x + text_surf.get_width() + spacing, gap_size.y)
 
-        gap_size = Point(
-            gap_size.x + text_surf.get_width() + 5, gap_size.y + text_surf.get_height() + 5
-        )
+    return drawn_rects[0].unionall(drawn_rects[1:])
 
 
-def draw_life_bar(display_surface: pygame.Surface, lives: int, max_lives: int = 5) -> None:
+def draw_life_bar(
+    display_surface: pygame.Surface,
+    lives: int,
+    max_lives: int = 5,
+    layout: Optional[ScreenLayout] = None,
+) -> pygame.Rect:
     """Draws life bars onto a screen. Red life bars are used for the remaining lives while
     transparent life bars are used for lives lost.
 
@@ -313,41 +428,36 @@ def draw_life_bar(display_surface: pygame.Surface, lives: int, max_lives: int =
         display_surface (pygame.Surface): main game surface
         lives (int): current number of life points
         max_lives (int, optional): maximum life points. Defaults to 5.
+        layout (Optional[ScreenLayout], optional): layout of the surface. Defaults to None
+            (looked up for the size of the surface).
+
+    Returns:
+        pygame.Rect: Bounding rectangle of all life bars.
     """
-    bar_size = Point(40, 10)
-    gap_size = 2
-    start_position = Point(
-        display_surface.get_width() // 30 * 1,
-        display_surface.get_height() // 30 * 1 + max_lives * (bar_size.y + gap_size),
-    )
+    if layout is None:
+        layout = get_layout(display_surface.get_size())
+    bar_rects = layout.life_bar_rects(max_lives)
+    border_radius = layout.scaled(2)
     red = Color(255, 0, 0)  # TODO: move this to constants.py
     black = Color(0, 0, 0)
-    for i in range(max_lives):
-        pygame.draw.rect(
-            display_surface,
-            black,
-            (
-                start_position.x,
-                start_position.y - i * (bar_size.y + gap_size),
-                bar_size.x,
-                bar_size.y,
-            ),
-            1,
-            2,
-        )
-    for i in range(lives):
-        pygame.draw.rect(
-            display_surface,
-            red,
-            (
-                start_position.x,
-                start_position.y - i * (bar_size.y + gap_size),
-                bar_size.x,
-                bar_size.y,
-            ),
-            0,
-            2,
-        )
+    drawn_rects = []
+    for bar_rect in bar_rects:
+        drawn_rects.append(pygame.draw.rect(display_surface, black, bar_rect, 1, border_radius))
+    for bar_rect in bar_rects[:lives]:
+        pygame.draw.rect(display_surface, red, bar_rect, 0, border_radius)
+
+    return drawn_rects[0].unionall(drawn_rects[1:])
+
+
+class GameInput(NamedTuple):
+    """Input hooks of the game screen, replaced for recordings, replays and scripted runs"""
+
+    # Called once per logic step for the events to handle
+    event_source: Callable[[], List[pygame.event.Event]] = pygame.event.get
+    # Called once per logic step, before event_source, for the milliseconds that drive animations
+    time_source: Callable[[], int] = pygame.time.get_ticks
+    # Plays the current letter again if there is audio
+    replay_key: int = K_SPACE
 
 
 # TODO: split this function into several parts
@@ -355,87 +465,249 @@ def use_game_screen(
     display_surface: pygame.Surface,
     fps_clock: pygame.time.Clock,
     background_color: Color = Color(255, 255, 255),
+    audio_player: Optional[MorsePlayer] = None,
+    word_handler: Optional[WordHandler] = None,
+    game_input: GameInput = GameInput(),
+    game_loop: Optional[GameLoop] = None,
+    max_frames: Optional[int] = None,
+    show_gameover_screen: bool = True,
+    profiler: Optional[FrameProfiler] = None,
+    show_cheat_screen: bool = True,
+    animation_scheduler: Optional[AnimationScheduler] = None,
 ) -> None:
-    """Main game screen, initializes all needed variables and runs the main game loop.
+    """Main game screen, initializes all needed variables and runs the main game loop. The
+    input is handled at a fixed logic rate, frames are rendered at their own rate (see game_loop).
 
     Args:
         display_surface (pygame.Surface): main game surface.
-        fps_clock (pygame.time.Clock): main game clock.
+        fps_clock (pygame.time.Clock): main game clock, paces the frames in lockstep mode.
         background_color (Color, optional): background color of screen. Defaults to Color(255, 255, 255) (white).
+        audio_player (Optional[MorsePlayer], optional): plays each new letter as morse tones,
+            pressing the replay key plays the current letter again. Defaults to None (no audio).
+        word_handler (Optional[WordHandler], optional): source of the words to guess. Defaults
+            to None, in which case a word handler for MAXIMUM_WORD_LENGTH is created.
+        game_input (GameInput, optional): event & time sources and the replay key, e.g. a
+            scripted input stream. Defaults to GameInput() (pygame events and ticks, space).
+        game_loop (Optional[GameLoop], optional): runs the logic steps and renders the frames,
+            a loop with a logic rate of 0 renders every step right away, e.g. for headless runs
+            and replays. Defaults to None (a loop with the default rates ticking 'fps_clock').
+        max_frames (Optional[int], optional): return after this many logic steps. Defaults to
+            None (run until the player quits).
+        show_gameover_screen (bool, optional): whether to show the game over screen or to
+            restart right away. Defaults to True.
+        profiler (Optional[FrameProfiler], optional): times the sections of every frame, F3
+            toggles its overlay. Defaults to None (disabled).
+        show_cheat_screen (bool, optional): whether the cheat button shows the cheat screen.
+            Defaults to True.
+        animation_scheduler (Optional[AnimationScheduler], optional): runs the feedback
+            animations and measures the latency from a guess to its feedback on the display.
+            Input events may carry the time.perf_counter they happened at as 'timestamp',
+            otherwise the time they were taken from the event source is used. Defaults to None
+            (a new scheduler).
     """
-    word_handler = WordHandler(max_size=MAXIMUM_WORD_LENGTH)
-    word = word_handler.fetch_new_word().upper()
-    # TODO find a better way to fetch new characters
-    letter_index = 0  # word[0]
-
-    score = 0
-    score_y = display_surface.get_height() // 10 * 1
-    score_x = display_surface.get_width() // 10 * 9
-    score_position = Point(score_x, score_y)
-
-    guessed_letters = list()
+    event_source, time_source, replay_key = game_input
+    if game_loop is None:
+        game_loop = GameLoop(fps_clock=fps_clock)
+    if profiler is None:
+        profiler = FrameProfiler(enabled=False)
+    if word_handler is None:
+        word_handler = WordHandler(max_size=MAXIMUM_WORD_LENGTH)
+    # The rules of the game live in the engine, this screen renders its state and feeds it guesses
+    engine = GameEngine(word_handler.fetch_new_word, on_guess=word_handler.record_guess)
+
+    # Positions & sizes are computed once per window size, see apply_layout
+    layout = get_layout(display_surface.get_size())
     guessed_letter = ""
-    guessed_letter_position = Point(
-        display_surface.get_width() // 2, display_surface.get_height() // 4 * 3
-    )
+    guessed_at = 0.0
 
-    cheat_button_position_y = display_surface.get_height() // 12 * 10
-    cheat_button_position_x = display_surface.get_width() // 12 * 10
-    cheat_button = Button("Cheat", (cheat_button_position_x, cheat_button_position_y), 30)
+    widget_manager = WidgetManager()
+    cheat_button = widget_manager.add(
+        Button("Cheat", layout.cheat_button_position, layout.scaled(30))
+    )
     use_cheat_screen = False
 
-    lives = 5
-
     red_color = Color(255, 0, 0)  # TODO move these to constants.py
     green_color = Color(0, 255, 0)
 
-    while True:
-        letter = word[letter_index]
+    # Each element is only redrawn (and pushed to the display) when its state changes
+    render_layer = RenderLayer(background_color)
+    morse_code_element = render_layer.add(
+        RenderElement(
+            profiler.wrap(
+                "draw_morse_code",
+                lambda surface, letter: draw_morse_code(surface, letter, layout),
+            )
+        )
+    )
+    score_element = render_layer.add(
+        RenderElement(
+            profiler.wrap(
+                "draw_score",
+                lambda surface, score: draw_score(
+                    surface, score, layout.score_position, layout.scaled(20)
+                ),
+            )
+        )
+    )
+    guessed_letters_element = render_layer.add(
+        RenderElement(
+            profiler.wrap(
+                "draw_guessed_letters",
+                lambda surface, letters: draw_guessed_letters(
+                    surface, list(letters), layout=layout
+                ),
+            )
+        )
+    )
+    life_bar_element = render_layer.add(
+        RenderElement(
+            profiler.wrap(
+                "draw_life_bar",
+                lambda surface, lives: draw_life_bar(surface, lives, engine.max_lives, layout),
+            )
+        )
+    )
+    render_layer.add(
+        RenderElement(
+            profiler.wrap("draw_button", lambda surface, _: cheat_button.draw_button(surface))
+        )
+    )
+    guessed_letter_element = render_layer.add(
+        RenderElement(
+            profiler.wrap(
+                "draw_text",
+                lambda surface, guessed_letter: draw_text(
+                    guessed_letter, surface, layout.guessed_letter_position, layout.scaled(128)
+                ),
+            )
+        )
+    )
+
+    def apply_layout() -> None:
+        """Lays the screen out again after the size of the window changed."""
+        nonlocal layout
+        layout = get_layout(display_surface.get_size())
+        cheat_button.place(layout.cheat_button_position, layout.scaled(30))
+        widget_manager.rebuild_index()
+        render_layer.invalidate()
+
+    hud_rect = None
+
+    # Feedback effects are animated while the game keeps processing input
+    if animation_scheduler is None:
+        animation_scheduler = AnimationScheduler()
+    overlay_drawn = False
+    feedback_letter = ""
+    played_letter_count = 0
+    now = time_source()
+
+    def update() -> None:
+        """One logic step: handles the input and applies it to the engine."""
+        nonlocal now, guessed_letter, guessed_at, use_cheat_screen, feedback_letter
+        nonlocal played_letter_count
+        if engine.state.game_over:
+            # The final state has been rendered, now the game over screen takes over
+            if show_gameover_screen:
+                use_gameover_screen(
+                    display_surface, fps_clock, engine.state.word, engine.state.score
+                )
+                apply_layout()
+            engine.reset()
+            render_layer.invalidate()
+        letter = engine.state.letter
+        now = time_source()
+
+        with profiler.section("events"):
+            polled_at = time.perf_counter()
+            for event in event_source():
+                if (event.type == QUIT) or (event.type == KEYUP and event.key == K_ESCAPE):
+                    terminate()
+                elif event.type == KEYUP and event.key == K_F3:
+                    profiler.toggle_hud()
+                elif event.type == KEYUP and event.key == K_F11:
+                    # The layout follows with the next step like for any other size change, so
+                    # recorded sessions replay it in the same frame
+                    width, height = toggle_fullscreen().get_size()
+                    pygame.event.post(
+                        pygame.event.Event(VIDEORESIZE, size=(width, height), w=width, h=height)
+                    )
+                elif event.type in (VIDEORESIZE, WINDOWSIZECHANGED):
+                    apply_layout()
+                elif event.type == KEYUP and event.unicode.isalpha():
+                    guessed_letter = event.unicode.upper()
+                    guessed_at = getattr(event, "timestamp", polled_at)
+                elif audio_player is not None and event.type == KEYUP and event.key == replay_key:
+                    audio_player.play(letter)
+                elif widget_manager.dispatch(event) is cheat_button:
+                    use_cheat_screen = show_cheat_screen
 
-        display_surface.fill(background_color)
-        draw_morse_code(display_surface, letter)
-        draw_score(display_surface, score, score_position)
-        draw_guessed_letters(display_surface, guessed_letters)
-        draw_life_bar(display_surface, lives)
-        cheat_button.draw_button(display_surface)
-
-        for event in pygame.event.get():
-            if (event.type == QUIT) or (event.type == KEYUP and event.key == K_ESCAPE):
-                terminate()
-            elif event.type == KEYUP and event.unicode.isalpha():
-                guessed_letter = event.unicode.upper()
-            elif cheat_button.isClicked(event):
-                use_cheat_screen = True
-
-        draw_text(guessed_letter, display_surface, guessed_letter_position)
         if use_cheat_screen:
             draw_cheat_screen(display_surface, fps_clock, letter)
+            # The window may have been resized while the cheat screen was shown
+            apply_layout()
             use_cheat_screen = False
-        if guessed_letter == letter:
-            draw_blinking_surface(display_surface, fps_clock, green_color, 3)
-            guessed_letters = list()
+        if guessed_letter:
+            if engine.apply_guess(guessed_letter):
+                animation_scheduler.start(blink(green_color, 3), now, triggered_at=guessed_at)
+            else:
+                animation_scheduler.start(
+                    blink(red_color, 1, blink_duration=733), now, triggered_at=guessed_at
+                )
+            feedback_letter = guessed_letter
             guessed_letter = ""
-            score += 1
-            letter_index += 1
-            if letter_index >= len(word):
-                word = word_handler.fetch_new_word().upper()
-                letter_index = 0
-        elif guessed_letter.isalpha():
-            draw_blinking_surface(display_surface, fps_clock, red_color, 1, animation_speed=25)
-            guessed_letters.append(guessed_letter)
-            guessed_letter = ""
-            lives -= 1
-
-        if lives <= 0:
-            use_gameover_screen(display_surface, fps_clock, word_handler.get_current_word(), score)
-            score = 0
-            lives = 5
-            guessed_letters = list()
-            word = word_handler.fetch_new_word()
-            letter_index = 0
-
-        pygame.display.update()
-        fps_clock.tick(FPS)
+        state = engine.state
+
+        animation_scheduler.tick(now)
+        if not animation_scheduler.is_active:
+            feedback_letter = ""
+
+        if audio_player is not None:
+            # Every new letter is played, also a doubled letter or the same letter in a new word
+            if played_letter_count != engine.letter_count:
+                audio_player.play(state.letter)
+                played_letter_count = engine.letter_count
+            audio_player.update()
+
+    def render(lag: float) -> bool:
+        """Draws a frame, animations are advanced by the time passed since the last step.
+        Returns whether an animation is running.
+        """
+        nonlocal overlay_drawn, hud_rect
+        state = engine.state
+        frame_time = now + int(lag * 1000)
+        morse_code_element.set_state(state.letter)
+        score_element.set_state(state.score)
+        guessed_letters_element.set_state(tuple(state.guessed_letters))
+        life_bar_element.set_state(state.lives)
+        guessed_letter_element.set_state(feedback_letter)
+        if overlay_drawn:
+            # The overlay of the previous frame covers the whole screen
+            render_layer.invalidate()
+        if hud_rect is not None:
+            render_layer.invalidate_rect(hud_rect)
+        with profiler.section("render"):
+            dirty_rects = render_layer.render(display_surface)
+        with profiler.section("animation"):
+            overlay_drawn = animation_scheduler.draw(display_surface, frame_time)
+        hud_rect = profiler.draw_hud(display_surface)
+        if hud_rect is not None:
+            dirty_rects.append(hud_rect)
+        with profiler.section("display_update"):
+            if game_loop.vsync:
+                # Blocks until the monitor refreshes
+                pygame.display.flip()
+            elif overlay_drawn:
+                pygame.display.update()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+        animation_scheduler.presented(time.perf_counter())
+
+        profiler.end_frame()
+        profiler.begin_frame()
+        return overlay_drawn
+
+    profiler.begin_frame()
+    game_loop.run(update, render, max_frames)
 
 
 def draw_cheat_screen(
@@ -452,10 +724,15 @@ def draw_cheat_screen(
         current_letter (str): current letter, will be shown to the player
         background_color (Color, optional): background color of the screen. Defaults to Color(255, 0, 0) (red).
     """
-    display_coordinates = Point(display_surface.get_width() // 2, display_surface.get_height() // 3)
-    cheat_text_surf, cheat_text_rect = create_text("Cheating Mode", 60, display_coordinates)
+    layout = get_layout(display_surface.get_size())
+    display_coordinates = layout.cheat_position
+    cheat_text_surf, cheat_text_rect = create_text(
+        "Cheating Mode", layout.scaled(60), display_coordinates
+    )
     letter_surf, letter_rect = create_text(
-        f"Current letter: {current_letter}", 30, (display_coordinates.x, display_coordinates.y * 2)
+        f"Current letter: {current_letter}",
+        layout.scaled(30),
+        (display_coordinates.x, display_coordinates.y * 2),
     )
 
     display_surface.fill(background_color)
@@ -463,8 +740,7 @@ def draw_cheat_screen(
     display_surface.blit(letter_surf, letter_rect)
 
     pygame.display.update()
-    fps_clock.tick(FPS)
-    time.sleep(1)
+    wait_for_duration(1000)
 
 
 def use_gameover_screen(
@@ -486,45 +762,136 @@ def use_gameover_screen(
         text_color (Color, optional): text color. Defaults to (255, 255, 255) (white).
     """
 
-    display_position = Point(display_surface.get_width() // 2, display_surface.get_height() // 4)
-    gameover_surf, gameover_rect = create_text(
-        "Game Over", 60, (display_position.x, display_position.y), text_color
-    )
-    current_word_surf, current_word_rect = create_text(
-        f"The correct word was: {current_word}",
-        30,
-        (display_position.x, display_position.y * 2),
-        text_color,
-    )
-    score_surf, score_rect = create_text(
-        f"Score: {score}", 30, (display_position.x, display_position.y * 3), text_color
-    )
+    def redraw() -> None:
+        layout = get_layout(display_surface.get_size())
+        display_position = layout.gameover_position
+        gameover_surf, gameover_rect = create_text(
+            "Game Over", layout.scaled(60), (display_position.x, display_position.y), text_color
+        )
+        current_word_surf, current_word_rect = create_text(
+            f"The correct word was: {current_word}",
+            layout.scaled(30),
+            (display_position.x, display_position.y * 2),
+            text_color,
+        )
+        score_surf, score_rect = create_text(
+            f"Score: {score}",
+            layout.scaled(30),
+            (display_position.x, display_position.y * 3),
+            text_color,
+        )
 
-    time.sleep(
-        0.5
-    )  # Wait for a short period since the user might have pressed a key just after the last guess
-    # Empty event queue before showing game over screen
-    pygame.event.get()
-    while True:
-        if check_keyup_event():
-            return
         display_surface.fill(background_color)
         display_surface.blit(gameover_surf, gameover_rect)
         display_surface.blit(current_word_surf, current_word_rect)
         display_surface.blit(score_surf, score_rect)
-        pygame.display.update()
-        fps_clock.tick(FPS)
+
+    # Empty event queue before showing game over screen
+    pygame.event.get()
+    # Keys are ignored for a short period since the user might have pressed a key just after
+    # the last guess
+    wait_for_keyup(redraw, ignore_duration=500)
 
 
 def main() -> None:
-    window_height = 600
-    window_width = 960
+    parser = argparse.ArgumentParser(description="A pygame application teaching morse code")
+    parser.add_argument(
+        "--audio",
+        action="store_true",
+        help="play each letter as morse tones, space (enter while keying) plays it again",
+    )
+    parser.add_argument("--wpm", type=float, default=20, help="speed of the morse tones")
+    parser.add_argument("--pitch", type=float, default=600.0, help="pitch of the morse tones (Hz)")
+    parser.add_argument(
+        "--profile", action="store_true", help="time every frame, F3 toggles the overlay"
+    )
+    parser.add_argument(
+        "--profile-output", help="write the frame profile to this .json or .csv file on exit"
+    )
+    parser.add_argument("--word-file", help="local word file (one word per line, may be .gz)")
+    parser.add_argument("--record", help="record the session into this event log, see replay.py")
+    parser.add_argument("--seed", type=int, help="seed of the word selection")
+    parser.add_argument(
+        "--keying",
+        action="store_true",
+        help="send the letters in morse code with the space bar or the right mouse button",
+    )
+    parser.add_argument(
+        "--keying-wpm", type=float, default=15, help="initial speed expected while keying"
+    )
+    parser.add_argument(
+        "--render-rate", type=int, default=FPS, help="frames per second, 0 for uncapped"
+    )
+    parser.add_argument(
+        "--vsync", action="store_true", help="render at the refresh rate of the monitor"
+    )
+    parser.add_argument("--width", type=int, default=DESIGN_SIZE[0], help="window width")
+    parser.add_argument("--height", type=int, default=DESIGN_SIZE[1], help="window height")
+    parser.add_argument("--fullscreen", action="store_true", help="start in fullscreen (F11)")
+    args = parser.parse_args()
+
     caption = "Morse Code"
-    display_surface, fps_clock = initialize_pygame(window_width, window_height, caption)
+    display_surface, fps_clock = initialize_pygame(
+        args.width,
+        args.height,
+        caption,
+        args.vsync,
+        resizable=True,
+        fullscreen=args.fullscreen,
+    )
+
+    audio_player = None
+    if args.audio:
+        try:
+            audio_player = MorsePlayer(args.wpm, args.pitch)
+        except pygame.error as pygame_err:
+            print(f"ERROR: Audio is not available: {pygame_err}")
+
+    profiler = FrameProfiler(enabled=args.profile or args.profile_output is not None)
+    if args.profile_output is not None:
+        atexit.register(profiler.dump, args.profile_output)
+
+    seed = args.seed
+    if seed is None and args.record is not None:
+        # Replays need the seed, so a recorded session always has one
+        seed = random.randrange(2**63)
+    word_handler = WordHandler(max_size=MAXIMUM_WORD_LENGTH, word_file=args.word_file, seed=seed)
+    atexit.register(word_handler.close)
+    event_source, time_source, wait_until = pygame.event.get, pygame.time.get_ticks, sleep_until
+    # With vsync, updating the display waits for the monitor
+    vsync = args.vsync and vsync_enabled()
+    if args.keying:
+        keying_event_source = KeyingEventSource(StraightKey(args.keying_wpm))
+        # Key presses are timestamped while the game loop waits
+        event_source, wait_until = keying_event_source, keying_event_source.wait_until
+    if args.record is not None:
+        recorder = GameRecorder(
+            args.record,
+            seed,
+            word_handler.words,
+            display_surface.get_size(),
+            event_source=event_source,
+        )
+        atexit.register(recorder.close)
+        event_source, time_source = recorder.events, recorder.ticks
 
     use_start_screen(display_surface, fps_clock)
     use_instructions_screen(display_surface, fps_clock)
-    use_game_screen(display_surface, fps_clock)
+    use_game_screen(
+        display_surface,
+        fps_clock,
+        audio_player=audio_player,
+        word_handler=word_handler,
+        # The space bar is the straight key while keying
+        game_input=GameInput(event_source, time_source, K_RETURN if args.keying else K_SPACE),
+        game_loop=GameLoop(
+            render_rate=0 if vsync else args.render_rate,
+            fps_clock=fps_clock,
+            wait_until=wait_until,
+            vsync=vsync,
+        ),
+        profiler=profiler,
+    )
 
     return 0
 
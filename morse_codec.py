@@ -0,0 +1,235 @@
+"""Encoding & decoding of text to and from morse code.
+
+Morse code text consists of dots & dashes, letters are separated by a space and words by a slash,
+e.g. "SOS HI" is encoded as "... --- ... / .... ..".
+"""
+
+from constants import MORSE_CODE_EXTENDED
+from typing import Dict, Iterable, Iterator, List, Optional
+
+LETTER_SEPARATOR = " "
+WORD_SEPARATOR = "/"
+_WHITESPACE = " \t\n\r"
+
+# Encoding translation table, every character is mapped onto its code followed by a letter separator
+_ENCODE_TABLE: Dict[int, str] = {}
+for _character, _code in MORSE_CODE_EXTENDED.items():
+    _ENCODE_TABLE[ord(_character)] = _code + LETTER_SEPARATOR
+    _ENCODE_TABLE[ord(_character.lower())] = _code + LETTER_SEPARATOR
+for _character in _WHITESPACE:
+    _ENCODE_TABLE[ord(_character)] = WORD_SEPARATOR + LETTER_SEPARATOR
+_ENCODABLE_CHARACTERS = frozenset(chr(character) for character in _ENCODE_TABLE)
+
+
+def trie_index(code: str) -> int:
+    """Returns the position of a code in a binary dot/dash trie stored as an array. The root is
+    at index 1, a dot moves from index i to 2i and a dash to 2i + 1, which makes the index a
+    perfect hash of the code.
+
+    Args:
+        code (str): String consisting of dots & dashses.
+
+    Returns:
+        int: Index of the code in the trie.
+    """
+    index = 1
+    for symbol in code:
+        index = 2 * index + (symbol == "-")
+    return index
+
+
+_MAX_CODE_LENGTH = max(len(code) for code in MORSE_CODE_EXTENDED.values())
+DECODE_TRIE: List[Optional[str]] = [None] * (2 ** (_MAX_CODE_LENGTH + 1))
+for _character, _code in MORSE_CODE_EXTENDED.items():
+    DECODE_TRIE[trie_index(_code)] = _character
+
+# Flat index of the trie used for bulk decoding, looking up a whole code string at once is much
+# faster in Python than walking the trie one symbol at a time
+_DECODE_INDEX: Dict[str, str] = {
+    code: DECODE_TRIE[trie_index(code)] for code in MORSE_CODE_EXTENDED.values()
+}
+_DECODE_INDEX[WORD_SEPARATOR] = " "
+
+
+class TrieDecoder:
+    """Incremental decoder walking the dot/dash trie one symbol at a time"""
+
+    def __init__(self) -> None:
+        self.index = 1
+
+    def push(self, symbol: str) -> None:
+        """Moves one step down the trie.
+
+        Args:
+            symbol (str): Either a dot or a dash.
+
+        Raises:
+            ValueError: If the symbol is neither a dot nor a dash.
+        """
+        if symbol == ".":
+            self.index = 2 * self.index
+        elif symbol == "-":
+            self.index = 2 * self.index + 1
+        else:
+            raise ValueError(f"ERROR: Unknown morse code symbol '{symbol}'")
+
+    @property
+    def current(self) -> Optional[str]:
+        """The character matching the symbols pushed so far, None if there is no such character."""
+        if self.index >= len(DECODE_TRIE):
+            return None
+        return DECODE_TRIE[self.index]
+
+    def finish_letter(self) -> Optional[str]:
+        """Ends the current letter and resets the decoder.
+
+        Returns:
+            Optional[str]: The decoded character, None if the symbols did not form a character.
+        """
+        character = self.current if self.index != 1 else None
+        self.index = 1
+        return character
+
+
+def _check_encodable(text: str, strict: bool) -> str:
+    """Verifies that all characters of a text can be encoded.
+
+    Args:
+        text (str): self-explanatory.
+        strict (bool): Whether to raise an error for unknown characters or drop them.
+
+    Raises:
+        ValueError: If strict and the text contains characters without a morse code.
+
+    Returns:
+        str: The text, without unknown characters if not strict.
+    """
+    if _ENCODABLE_CHARACTERS.issuperset(text):
+        return text
+    if strict:
+        unknown = sorted(set(text) - _ENCODABLE_CHARACTERS)
+        raise ValueError(f"ERROR: Characters without a morse code: {unknown}")
+    return "".join(character for character in text if character in _ENCODABLE_CHARACTERS)
+
+
+def encode(text: str, strict: bool = True) -> str:
+    """Encodes a text into morse code.
+
+    Args:
+        text (str): self-explanatory.
+        strict (bool, optional): Raise an error for characters without a morse code, they are
+            dropped otherwise. Defaults to True.
+
+    Returns:
+        str: The morse code of the text.
+    """
+    return _check_encodable(text, strict).translate(_ENCODE_TABLE).rstrip(LETTER_SEPARATOR)
+
+
+def decode(code: str) -> str:
+    """Decodes morse code into text.
+
+    Args:
+        code (str): Morse code, letters separated by whitespace and words by a slash.
+
+    Raises:
+        ValueError: If the code contains unknown sequences.
+
+    Returns:
+        str: The decoded text, in upper case.
+    """
+    try:
+        return "".join(map(_DECODE_INDEX.__getitem__, code.split()))
+    except KeyError as key_err:
+        raise ValueError(f"ERROR: Unknown morse code sequence {key_err}") from None
+
+
+def encode_stream(chunks: Iterable[str], strict: bool = True) -> Iterator[str]:
+    """Encodes a stream of text chunks without holding the whole text in memory. Every encoded
+    letter is followed by a letter separator so the chunks can be concatenated as they are.
+
+    Args:
+        chunks (Iterable[str]): Text chunks, e.g. an open file.
+        strict (bool, optional): Raise an error for characters without a morse code, they are
+            dropped otherwise. Defaults to True.
+
+    Yields:
+        Iterator[str]: Morse code chunks.
+    """
+    for chunk in chunks:
+        yield _check_encodable(chunk, strict).translate(_ENCODE_TABLE)
+
+
+def decode_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """Decodes a stream of morse code chunks without holding the whole code in memory.
+    Codes split across two chunks are carried over to the next chunk.
+
+    Args:
+        chunks (Iterable[str]): Morse code chunks, e.g. an open file.
+
+    Raises:
+        ValueError: If the code contains unknown sequences.
+
+    Yields:
+        Iterator[str]: Decoded text chunks.
+    """
+    pending = ""
+    for chunk in chunks:
+        data = pending + chunk
+        cut = max(data.rfind(separator) for separator in _WHITESPACE)
+        if cut < 0:
+            pending = data
+            continue
+        pending = data[cut + 1 :]
+        yield decode(data[:cut])
+    if pending:
+        yield decode(pending)
+
+
+def benchmark(size: int = 4_000_000, chunk_size: int = 65536) -> Dict[str, float]:
+    """Measures the encoding & decoding throughput of the streaming APIs.
+
+    Args:
+        size (int, optional): Approximate number of characters of text to encode. Defaults to 4_000_000.
+        chunk_size (int, optional): Number of characters per chunk. Defaults to 65536.
+
+    Returns:
+        Dict[str, float]: Encode and decode throughput in MB/s of input.
+    """
+    import random
+    import time
+
+    characters = list(MORSE_CODE_EXTENDED) + [" "] * 8
+    rng = random.Random(0)
+    text = "".join(rng.choices(characters, k=size))
+    text_chunks = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+    start_time = time.perf_counter()
+    code_chunks = list(encode_stream(text_chunks))
+    encode_time = time.perf_counter() - start_time
+
+    code_size = sum(len(chunk) for chunk in code_chunks)
+    code = "".join(code_chunks)
+    code_chunks = [code[i : i + chunk_size] for i in range(0, len(code), chunk_size)]
+    start_time = time.perf_counter()
+    for _ in decode_stream(code_chunks):
+        pass
+    decode_time = time.perf_counter() - start_time
+
+    return {
+        "encode_mb_per_s": len(text) / encode_time / 1e6,
+        "decode_mb_per_s": code_size / decode_time / 1e6,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Morse code encoding & decoding benchmark")
+    parser.add_argument("--size", type=int, default=4_000_000, help="characters of text")
+    parser.add_argument("--chunk-size", type=int, default=65536, help="characters per chunk")
+    args = parser.parse_args()
+
+    results = benchmark(args.size, args.chunk_size)
+    print(f"Encode: {results['encode_mb_per_s']:.1f} MB/s of text")
+    print(f"Decode: {results['decode_mb_per_s']:.1f} MB/s of morse code")
@@ -0,0 +1,86 @@
+from morse_codec import TrieDecoder
+from typing import Optional
+
+UNKNOWN_CHARACTER = "*"
+
+
+class AdaptiveMorseTiming:
+    """Online classification of mark (tone/key down) and space durations into morse code.
+
+    The lengths of dots and dashes are estimated separately from the marks seen so far, so the
+    sending speed may change at any time. Marks longer than the geometric mean of both estimates
+    are dashes, spaces longer than two units end a letter and spaces longer than five units end
+    a word.
+    """
+
+    def __init__(self, initial_wpm: float = 20, adaptation: float = 0.3) -> None:
+        """Create a classifier expecting a given initial speed.
+
+        Args:
+            initial_wpm (float, optional): Initial speed estimate in words per minute. Defaults to 20.
+            adaptation (float, optional): Weight of each new mark in the dot & dash length
+                estimates, between 0 and 1. Defaults to 0.3.
+        """
+        self.dot_length = 1.2 / initial_wpm
+        self.dash_length = 3 * self.dot_length
+        self.adaptation = adaptation
+        self.symbols = ""
+        self._decoder = TrieDecoder()
+
+    @property
+    def unit_length(self) -> float:
+        """Estimated length of one morse code unit (a dot) in seconds."""
+        return (self.dot_length + self.dash_length / 3) / 2
+
+    @property
+    def wpm(self) -> float:
+        return 1.2 / self.unit_length
+
+    def mark(self, duration: float) -> str:
+        """Classifies a mark and adds it to the current letter.
+
+        Args:
+            duration (float): Length of the mark in seconds.
+
+        Returns:
+            str: The classified symbol, either a dot or a dash.
+        """
+        if duration * duration < self.dot_length * self.dash_length:
+            symbol = "."
+            self.dot_length += self.adaptation * (duration - self.dot_length)
+        else:
+            symbol = "-"
+            self.dash_length += self.adaptation * (duration - self.dash_length)
+
+        self.symbols += symbol
+        self._decoder.push(symbol)
+        return symbol
+
+    def space(self, duration: float) -> str:
+        """Classifies a space following a mark.
+
+        Args:
+            duration (float): Length of the space in seconds.
+
+        Returns:
+            str: The decoded letter if the space ended one, followed by a space if it also ended
+            a word. Empty if the space separated two symbols of the same letter.
+        """
+        if duration < 2 * self.unit_length:
+            return ""
+        letter = self.finish_letter() or ""
+        if duration >= 5 * self.unit_length and letter:
+            return letter + " "
+        return letter
+
+    def finish_letter(self) -> Optional[str]:
+        """Decodes the symbols received since the last letter.
+
+        Returns:
+            Optional[str]: The decoded letter, UNKNOWN_CHARACTER if the symbols are not valid
+            morse code and None if no symbols were received.
+        """
+        if not self.symbols:
+            return None
+        self.symbols = ""
+        return self._decoder.finish_letter() or UNKNOWN_CHARACTER
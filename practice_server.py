@@ -0,0 +1,287 @@
+"""Practice server hosting many game sessions over a line based TCP protocol.
+
+Every connection is a session running the rules of the game screen (see game_engine), all
+sessions draw their words from one shared word corpus. Messages are single lines of ASCII text:
+
+    server: START <lives> <morse code>               after connecting
+    client: <letter>                                 a guess, case insensitive
+    server: CORRECT <score> <lives> <morse code>     code of the next letter
+    server: WRONG <score> <lives> <morse code>       code of the same letter
+    server: GAMEOVER <score> <word> <morse code>     final score, a new game has started
+    server: ERROR <message>                          the line was not a guess
+                                                     (a line too long ends the session)
+    client: QUIT
+    server: BYE
+
+The module also contains a load generator playing many sessions at once and reporting the
+number of sessions per second and the round-trip latency of guesses.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from constants import MAXIMUM_WORD_LENGTH, MORSE_CODE
+from game_engine import MAX_LIVES, GameEngine
+from typing import Dict, List, Optional
+from word_handler import WordHandler
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7373
+_DECODE = {code: letter for letter, code in MORSE_CODE.items()}
+
+
+class PracticeServer:
+    """Asyncio server running one game engine per connection"""
+
+    def __init__(self, word_handler: WordHandler, max_lives: int = MAX_LIVES) -> None:
+        """Create a server.
+
+        Args:
+            word_handler (WordHandler): Word corpus shared by all sessions.
+            max_lives (int, optional): Lives at the start of every game. Defaults to MAX_LIVES.
+        """
+        self.word_handler = word_handler
+        self.max_lives = max_lives
+        self.active_sessions = 0
+        self.total_sessions = 0
+        self.total_guesses = 0
+
+    async def handle_session(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Plays one session until the client quits or disconnects."""
+        self.active_sessions += 1
+        self.total_sessions += 1
+        engine = GameEngine(self.word_handler.fetch_new_word, self.max_lives)
+        state = engine.state
+        try:
+            writer.write(f"START {state.lives} {MORSE_CODE[state.letter]}\n".encode("ascii"))
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The rest of an overlong line would be read as guesses, end the session
+                    writer.write(b"ERROR line too long\n")
+                    break
+                if not line:
+                    break
+                guess = line.strip().upper().decode("ascii", "replace")
+                if guess == "QUIT":
+                    writer.write(b"BYE\n")
+                    break
+                if len(guess) != 1 or guess not in MORSE_CODE:
+                    writer.write(b"ERROR expected a single letter\n")
+                    continue
+
+                self.total_guesses += 1
+                correct = engine.apply_guess(guess)
+                state = engine.state
+                if state.game_over:
+                    score, word = state.score, state.word
+                    engine.reset()
+                    state = engine.state
+                    reply = f"GAMEOVER {score} {word} {MORSE_CODE[state.letter]}\n"
+                else:
+                    result = "CORRECT" if correct else "WRONG"
+                    reply = f"{result} {state.score} {state.lives} {MORSE_CODE[state.letter]}\n"
+                writer.write(reply.encode("ascii"))
+                # Only wait for the socket if the client does not keep up with reading
+                if writer.transport.get_write_buffer_size() > 65536:
+                    await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """Accepts sessions until cancelled.
+
+        Args:
+            host (str, optional): Interface to listen on. Defaults to DEFAULT_HOST.
+            port (int, optional): self-explanatory. Defaults to DEFAULT_PORT.
+        """
+        server = await asyncio.start_server(self.handle_session, host, port, backlog=4096)
+        print(f"INFO: Serving practice sessions on {host}:{port}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+async def _play_session(
+    host: str,
+    port: int,
+    n_guesses: int,
+    accuracy: float,
+    rng: random.Random,
+    round_trip_times: List[float],
+) -> None:
+    """Plays one session as a simulated student and records the round-trip time of every guess."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        code = (await reader.readline()).split()[-1].decode("ascii")
+        for _ in range(n_guesses):
+            letter = _DECODE[code]
+            if rng.random() >= accuracy:
+                letter = rng.choice([other for other in MORSE_CODE if other != letter])
+            start_time = time.perf_counter()
+            writer.write(f"{letter}\n".encode("ascii"))
+            reply = await reader.readline()
+            round_trip_times.append(time.perf_counter() - start_time)
+            code = reply.split()[-1].decode("ascii")
+        writer.write(b"QUIT\n")
+        await reader.readline()
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def run_load(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    n_sessions: int = 2000,
+    concurrency: int = 500,
+    n_guesses: int = 20,
+    accuracy: float = 0.8,
+    seed: int = 0,
+) -> Dict[str, float]:
+    """Plays many sessions against a running server.
+
+    Args:
+        host (str, optional): Address of the server. Defaults to DEFAULT_HOST.
+        port (int, optional): Port of the server. Defaults to DEFAULT_PORT.
+        n_sessions (int, optional): Number of sessions to play. Defaults to 2000.
+        concurrency (int, optional): Number of sessions open at the same time. Defaults to 500.
+        n_guesses (int, optional): Guesses per session. Defaults to 20.
+        accuracy (float, optional): Probability of a correct guess. Defaults to 0.8.
+        seed (int, optional): Seed of the simulated students. Defaults to 0.
+
+    Returns:
+        Dict[str, float]: Sessions & guesses per second and round-trip percentiles in ms.
+    """
+    rng = random.Random(seed)
+    round_trip_times: List[float] = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _limited_session() -> None:
+        nonlocal failures
+        async with semaphore:
+            try:
+                await _play_session(host, port, n_guesses, accuracy, rng, round_trip_times)
+            except (ConnectionError, IndexError, KeyError) as session_err:
+                failures += 1
+                if failures == 1:
+                    print(f"ERROR: Session failed: {session_err!r}")
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(_limited_session() for _ in range(n_sessions)))
+    elapsed_time = time.perf_counter() - start_time
+
+    round_trip_times.sort()
+
+    def _percentile(percentile: float) -> float:
+        if not round_trip_times:
+            return 0.0
+        index = min(len(round_trip_times) - 1, int(percentile / 100 * len(round_trip_times)))
+        return round_trip_times[index] * 1000
+
+    return {
+        "sessions": n_sessions - failures,
+        "failed_sessions": failures,
+        "sessions_per_second": (n_sessions - failures) / elapsed_time,
+        "guesses_per_second": len(round_trip_times) / elapsed_time,
+        "round_trip_p50_ms": _percentile(50),
+        "round_trip_p99_ms": _percentile(99),
+        "round_trip_max_ms": round_trip_times[-1] * 1000 if round_trip_times else 0.0,
+    }
+
+
+async def _spawn_server(
+    host: str, port: int, word_file: Optional[str]
+) -> asyncio.subprocess.Process:
+    """Starts a server in a separate process so it does not share the event loop with the load."""
+    arguments = [sys.argv[0], "serve", "--host", host, "--port", str(port), "--offline"]
+    if word_file is not None:
+        arguments += ["--word-file", word_file]
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, *arguments, stdout=asyncio.subprocess.PIPE
+    )
+    while True:
+        line = await process.stdout.readline()
+        if not line:
+            raise RuntimeError("ERROR: The practice server did not start")
+        if line.startswith(b"INFO: Serving"):
+            return process
+
+
+async def _load_main(args: argparse.Namespace) -> None:
+    process = (
+        await _spawn_server(args.host, args.port, args.word_file) if args.spawn_server else None
+    )
+    try:
+        report = await run_load(
+            args.host,
+            args.port,
+            args.sessions,
+            args.concurrency,
+            args.guesses,
+            args.accuracy,
+            args.seed,
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            await process.wait()
+    for name, value in report.items():
+        print(f"{name:>20}: {value:.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="host practice sessions")
+    load_parser = subparsers.add_parser("load", help="play many sessions against a server")
+    for subparser in (serve_parser, load_parser):
+        subparser.add_argument("--host", default=DEFAULT_HOST)
+        subparser.add_argument("--port", type=int, default=DEFAULT_PORT)
+        subparser.add_argument("--word-file", help="local word file shared by all sessions")
+    serve_parser.add_argument(
+        "--offline", action="store_true", help="use the bundled word list without a word file"
+    )
+    load_parser.add_argument("--sessions", type=int, default=2000)
+    load_parser.add_argument("--concurrency", type=int, default=500)
+    load_parser.add_argument("--guesses", type=int, default=20, help="guesses per session")
+    load_parser.add_argument("--accuracy", type=float, default=0.8)
+    load_parser.add_argument("--seed", type=int, default=0)
+    load_parser.add_argument(
+        "--spawn-server", action="store_true", help="start a server in a separate process"
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        word_handler = WordHandler(
+            max_size=MAXIMUM_WORD_LENGTH, offline=args.offline, word_file=args.word_file
+        )
+        try:
+            asyncio.run(PracticeServer(word_handler).serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            word_handler.close()
+    else:
+        asyncio.run(_load_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import csv
+import json
+import time
+import pygame
+from array import array
+from functools import wraps
+from font_cache import FONT_CACHE
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T", bound=Callable)
+
+
+class _NullSection:
+    """Section used while profiling is disabled, entering and leaving it does nothing"""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    """Times a named part of a frame, the time is added to the frame's total for that name"""
+
+    def __init__(self, totals: Dict[str, float], name: str) -> None:
+        self._totals = totals
+        self._name = name
+        self._start_time = 0.0
+
+    def __enter__(self) -> None:
+        self._start_time = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self._totals[self._name] += time.perf_counter() - self._start_time
+
+
+class FrameProfiler:
+    """Opt-in instrumentation timing named sections of every frame.
+
+    Frame and section times of the last 'capacity' frames are kept in fixed size ring buffers,
+    all buffers share the same write position so each position describes one frame. While
+    disabled, sections and wrapped functions cost next to nothing.
+    """
+
+    def __init__(self, enabled: bool = False, capacity: int = 600) -> None:
+        """Create a profiler.
+
+        Args:
+            enabled (bool, optional): Whether to record anything at all. Defaults to False.
+            capacity (int, optional): Number of frames to keep. Defaults to 600.
+        """
+        self.enabled = enabled
+        self.capacity = capacity
+        self.hud_visible = False
+        self.frame_times = array("d", bytes(8 * capacity))
+        self.section_times: Dict[str, array] = {}
+        self.n_frames = 0  # Total number of recorded frames
+        self._position = 0
+        self._frame_start = 0.0
+        self._frame_totals: Dict[str, float] = {}
+        self._sections: Dict[str, _Section] = {}
+        self._hud_stats: Optional[Dict[str, object]] = None
+
+    def section(self, name: str):
+        """Context manager timing a part of the current frame.
+
+        Args:
+            name (str): Name of the section, sections with the same name are summed up per frame.
+
+        Returns:
+            A context manager.
+        """
+        if not self.enabled:
+            return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            section = _Section(self._frame_totals, name)
+            self._sections[name] = section
+            self._frame_totals[name] = 0.0
+            self.section_times[name] = array("d", bytes(8 * self.capacity))
+        return section
+
+    def wrap(self, name: str, function: T) -> T:
+        """Times every call of a function as a section, the function is returned as it is
+        while profiling is disabled.
+
+        Args:
+            name (str): Name of the section.
+            function (T): self-explanatory.
+
+        Returns:
+            T: The (wrapped) function.
+        """
+        if not self.enabled:
+            return function
+
+        @wraps(function)
+        def _profiled(*args, **kwargs):
+            with self.section(name):
+                return function(*args, **kwargs)
+
+        return _profiled
+
+    def begin_frame(self) -> None:
+        if self.enabled:
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        """Stores the time of the frame and of all its sections in the ring buffers."""
+        if not self.enabled:
+            return
+        position = self._position
+        self.frame_times[position] = time.perf_counter() - self._frame_start
+        for name, total in self._frame_totals.items():
+            self.section_times[name][position] = total
+            self._frame_totals[name] = 0.0
+        self._position = (position + 1) % self.capacity
+        self.n_frames += 1
+
+    def _recorded_positions(self) -> List[int]:
+        """Positions of the recorded frames in the ring buffers, oldest first."""
+        if self.n_frames < self.capacity:
+            return list(range(self.n_frames))
+        return [(self._position + i) % self.capacity for i in range(self.capacity)]
+
+    def stats(self, n_top_sections: int = 5) -> Dict[str, object]:
+        """Summarizes the recorded frames.
+
+        Args:
+            n_top_sections (int, optional): Number of most expensive sections to list. Defaults to 5.
+
+        Returns:
+            Dict[str, object]: Frames per second, p50 & p99 frame times in milliseconds and the
+            sections with the highest mean time in milliseconds.
+        """
+        positions = self._recorded_positions()
+        if not positions:
+            return {"fps": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "top_sections": []}
+
+        frame_times = sorted(self.frame_times[position] for position in positions)
+        section_means: List[Tuple[str, float]] = [
+            (name, sum(times[position] for position in positions) / len(positions) * 1000)
+            for name, times in self.section_times.items()
+        ]
+        section_means.sort(key=lambda section: section[1], reverse=True)
+        return {
+            "fps": len(frame_times) / sum(frame_times) if sum(frame_times) > 0 else 0.0,
+            "p50_ms": frame_times[len(frame_times) // 2] * 1000,
+            "p99_ms": frame_times[min(len(frame_times) - 1, int(len(frame_times) * 0.99))] * 1000,
+            "top_sections": section_means[:n_top_sections],
+        }
+
+    def dump(self, path: str) -> None:
+        """Writes the recorded frames to a CSV file (if the path ends with .csv) or a JSON file.
+        Times are in milliseconds.
+
+        Args:
+            path (str): Location of the trace file.
+        """
+        names = list(self.section_times)
+        rows = [
+            [self.frame_times[position] * 1000]
+            + [self.section_times[name][position] * 1000 for name in names]
+            for position in self._recorded_positions()
+        ]
+        with open(path, "w", newline="", encoding="utf-8") as trace_file:
+            if path.endswith(".csv"):
+                writer = csv.writer(trace_file)
+                writer.writerow(["frame_ms"] + names)
+                writer.writerows(rows)
+            else:
+                json.dump(
+                    {"columns": ["frame_ms"] + names, "frames": rows, "stats": self.stats()},
+                    trace_file,
+                )
+        print(f"INFO: Wrote profile of {len(rows)} frames to '{path}'")
+
+    def toggle_hud(self) -> None:
+        """Shows or hides the overlay."""
+        self.hud_visible = not self.hud_visible
+
+    def draw_hud(
+        self,
+        surface: pygame.Surface,
+        position: Tuple[int, int] = (8, 8),
+        font_size: int = 14,
+        refresh_interval: int = 15,
+    ) -> Optional[pygame.Rect]:
+        """Draws an overlay with the frame rate, frame times and most expensive sections.
+
+        Args:
+            surface (pygame.Surface): main game surface.
+            position (Tuple[int, int], optional): Top left corner of the overlay. Defaults to (8, 8).
+            font_size (int, optional): Size of the text. Defaults to 14.
+            refresh_interval (int, optional): Frames between two updates of the shown numbers.
+                Defaults to 15.
+
+        Returns:
+            Optional[pygame.Rect]: Area covered by the overlay, None if it is not visible.
+        """
+        if not (self.enabled and self.hud_visible):
+            return None
+
+        if self._hud_stats is None or self.n_frames % refresh_interval == 0:
+            self._hud_stats = self.stats()
+        stats = self._hud_stats
+        lines = [
+            f"FPS {stats['fps']:.0f}  p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms"
+        ]
+        lines += [f"{name}: {mean:.3f} ms" for name, mean in stats["top_sections"]]
+
+        # The text changes every frame, so it is rendered directly instead of being cached
+        font = FONT_CACHE.get_font(font_size)
+        text_surfaces = [font.render(line, True, "white") for line in lines]
+        width = max(text_surface.get_width() for text_surface in text_surfaces) + 8
+        height = sum(text_surface.get_height() for text_surface in text_surfaces) + 8
+
+        hud_rect = pygame.Rect(position, (width, height))
+        surface.fill((0, 0, 0), hud_rect)
+        y_pos = position[1] + 4
+        for text_surface in text_surfaces:
+            surface.blit(text_surface, (position[0] + 4, y_pos))
+            y_pos += text_surface.get_height()
+
+        return hud_rect
@@ -0,0 +1,131 @@
+import pygame
+from typing import Any, Callable, List, Optional
+from utilities import Color
+
+
+class RenderElement:
+    """A retained element of a screen which is only redrawn when its state changes"""
+
+    def __init__(
+        self, draw_function: Callable[[pygame.Surface, Any], pygame.Rect], state: Any = None
+    ) -> None:
+        """Create an element that is drawn by a given function.
+
+        Args:
+            draw_function (Callable[[pygame.Surface, Any], pygame.Rect]): Function drawing the
+                element's state onto a surface and returning the bounding rectangle of what it drew.
+            state (Any, optional): Initial state of the element, must be comparable with '=='.
+                Defaults to None.
+        """
+        self.draw_function = draw_function
+        self.state = state
+        self.rect: Optional[pygame.Rect] = None
+        self.dirty = True
+
+    def set_state(self, state: Any) -> None:
+        """Update the state of the element, the element is only marked as dirty if the state changed.
+
+        Args:
+            state (Any): New state, use immutable values (e.g. tuples instead of lists).
+        """
+        if state != self.state:
+            self.state = state
+            self.dirty = True
+
+    def draw(self, surface: pygame.Surface) -> pygame.Rect:
+        """Draws the element and remembers its bounding rectangle.
+
+        Args:
+            surface (pygame.Surface): The surface the element is drawn onto.
+
+        Returns:
+            pygame.Rect: Bounding rectangle of the drawn element.
+        """
+        self.rect = self.draw_function(surface, self.state)
+        self.dirty = False
+        return self.rect
+
+
+class RenderLayer:
+    """Collection of render elements drawn on top of a solid background color.
+    Only the areas of elements whose state changed are redrawn and reported as dirty.
+    """
+
+    def __init__(self, background_color: Color) -> None:
+        """Create an empty render layer.
+
+        Args:
+            background_color (Color): Color used to clear the screen and erase elements.
+        """
+        self.background_color = background_color
+        self.elements: List[RenderElement] = []
+        self._full_redraw = True
+        self._damaged_rects: List[pygame.Rect] = []
+
+    def add(self, element: RenderElement) -> RenderElement:
+        """Adds an element to the layer, elements are drawn in the order they are added.
+
+        Args:
+            element (RenderElement): self-explanatory.
+
+        Returns:
+            RenderElement: The added element.
+        """
+        self.elements.append(element)
+        self._full_redraw = True
+        return element
+
+    def invalidate(self) -> None:
+        """Force the whole surface to be redrawn on the next render, e.g. after another
+        screen has drawn over it.
+        """
+        self._full_redraw = True
+
+    def invalidate_rect(self, rect: pygame.Rect) -> None:
+        """Force an area of the surface to be redrawn on the next render, e.g. after an
+        overlay has been drawn over it.
+
+        Args:
+            rect (pygame.Rect): The area to redraw.
+        """
+        self._damaged_rects.append(pygame.Rect(rect))
+
+    def render(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Redraws every dirty element.
+
+        Args:
+            surface (pygame.Surface): main game surface.
+
+        Returns:
+            List[pygame.Rect]: The areas of the surface that changed, to be passed on to
+            pygame.display.update. Empty if nothing changed.
+        """
+        damaged_rects, self._damaged_rects = self._damaged_rects, []
+        if self._full_redraw:
+            self._full_redraw = False
+            surface.fill(self.background_color)
+            for element in self.elements:
+                element.draw(surface)
+            return [surface.get_rect()]
+
+        dirty_elements = [element for element in self.elements if element.dirty]
+        if not dirty_elements and not damaged_rects:
+            return []
+
+        for rect in damaged_rects:
+            surface.fill(self.background_color, rect)
+        erased_rects = damaged_rects
+        for element in dirty_elements:
+            if element.rect is not None:
+                surface.fill(self.background_color, element.rect)
+                erased_rects.append(element.rect)
+
+        dirty_rects = list(erased_rects)
+        for element in self.elements:
+            # Clean elements overlapping an erased area have to be drawn again as well
+            if element.dirty or (
+                element.rect is not None and element.rect.collidelist(erased_rects) != -1
+            ):
+                dirty_rects.append(element.draw(surface))
+
+        return dirty_rects
@@ -0,0 +1,211 @@
+"""Replays a game session recorded with 'morse_code.py --record' frame by frame, headless or in a
+window, in real time or as fast as possible, and reports how fast the frames were rendered.
+Recorded sessions thereby double as performance regression workloads.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+from pygame.locals import K_ESCAPE, K_F11, KEYUP, QUIT, VIDEORESIZE
+from animation import AnimationScheduler
+from constants import MAXIMUM_WORD_LENGTH
+from event_log import EventLogHeader, read_event_log
+from game_loop import GameLoop
+from morse_code import GameInput, initialize_pygame, set_window_size, use_game_screen
+from profiler import FrameProfiler
+from word_handler import WordHandler
+
+
+class Replayer:
+    """Time and event source feeding the recorded frames into the game screen"""
+
+    def __init__(self, frames: List[Tuple[int, List[pygame.event.Event]]]) -> None:
+        """Create a replayer.
+
+        Args:
+            frames (List[Tuple[int, List[pygame.event.Event]]]): Time in milliseconds and events
+                of every frame, see read_event_log.
+        """
+        self.frames = frames
+        self.frame = 0
+
+    def ticks(self) -> int:
+        """Returns the recorded time of the current frame."""
+        return self.frames[self.frame][0]
+
+    def events(self) -> List[pygame.event.Event]:
+        """Returns the recorded events of the current frame and moves on to the next frame. The
+        events ending the recorded session are left out so the replay does not exit, and so are
+        fullscreen toggles. The window is resized to the recorded size changes instead.
+        """
+        events = self.frames[self.frame][1]
+        self.frame += 1
+        for event in events:
+            if event.type == VIDEORESIZE and pygame.display.get_surface().get_size() != event.size:
+                set_window_size(event.size)
+        return [
+            event
+            for event in events
+            if event.type != QUIT and not (event.type == KEYUP and event.key in (K_ESCAPE, K_F11))
+        ]
+
+
+class ReplayClock:
+    """Stand-in for pygame.time.Clock recording the rendering time of each frame and, unless the
+    replay runs as fast as possible, waiting until the recorded time of the next frame.
+    """
+
+    def __init__(self, replayer: Replayer, speed: float = 0.0) -> None:
+        """Create a clock.
+
+        Args:
+            replayer (Replayer): The replayed session.
+            speed (float, optional): Playback speed relative to the recording, 0 for as fast as
+                possible. Defaults to 0.0.
+        """
+        self.replayer = replayer
+        self.speed = speed
+        self.frame_times: List[float] = []
+        self._start_time = time.perf_counter()
+        self._last_tick = self._start_time
+
+    def tick(self, framerate: int = 0) -> int:
+        now = time.perf_counter()
+        self.frame_times.append(now - self._last_tick)
+        frames = self.replayer.frames
+        next_frame = self.replayer.frame
+        if self.speed > 0 and next_frame < len(frames):
+            recorded_time = (frames[next_frame][0] - frames[0][0]) / 1000 / self.speed
+            time.sleep(max(self._start_time + recorded_time - now, 0.0))
+        self._last_tick = time.perf_counter()
+        return int(self.frame_times[-1] * 1000)
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _check_word_list(header: EventLogHeader, word_handler: WordHandler) -> None:
+    """Makes sure the replay draws from the word list of the recording.
+
+    Raises:
+        ValueError: If the word lists differ.
+    """
+    words = word_handler.words
+    if len(words) != header.n_words or words.checksum() != header.word_checksum:
+        raise ValueError(
+            f"ERROR: The session was recorded with a different word list ({header.n_words} "
+            f"words) than the one loaded ({len(words)} words), use the same --word-file"
+        )
+
+
+def run_replay(
+    path: str,
+    speed: float = 0.0,
+    offline: bool = False,
+    word_file: Optional[str] = None,
+    profile_output: Optional[str] = None,
+) -> Dict[str, float]:
+    """Replays a recorded session.
+
+    Args:
+        path (str): Location of the event log.
+        speed (float, optional): Playback speed relative to the recording, 0 for as fast as
+            possible. Defaults to 0.0.
+        offline (bool, optional): Only use the bundled word list. Defaults to False.
+        word_file (Optional[str], optional): Local word file the session was recorded with.
+            Defaults to None.
+        profile_output (Optional[str], optional): Write a frame profile to this .json or .csv
+            file. Defaults to None (no profiling).
+
+    Returns:
+        Dict[str, float]: Frames per second, frame time and feedback latency percentiles in
+            milliseconds.
+    """
+    header, frames = read_event_log(path)
+    if not frames:
+        raise ValueError(f"ERROR: '{path}' does not contain any frames")
+    word_handler = WordHandler(
+        max_size=MAXIMUM_WORD_LENGTH, offline=offline, word_file=word_file, seed=header.seed
+    )
+    _check_word_list(header, word_handler)
+
+    display_surface, _ = initialize_pygame(*header.window_size, "Morse Code (replay)")
+    replayer = Replayer(frames)
+    replay_clock = ReplayClock(replayer, speed)
+    profiler = FrameProfiler(enabled=profile_output is not None, capacity=len(frames))
+    animation_scheduler = AnimationScheduler()
+
+    start_time = time.perf_counter()
+    use_game_screen(
+        display_surface,
+        replay_clock,
+        word_handler=word_handler,
+        game_input=GameInput(replayer.events, replayer.ticks),
+        game_loop=GameLoop(logic_rate=0, render_rate=0, fps_clock=replay_clock),
+        max_frames=len(frames),
+        show_gameover_screen=False,
+        profiler=profiler,
+        show_cheat_screen=False,
+        animation_scheduler=animation_scheduler,
+    )
+    total_time = time.perf_counter() - start_time
+    word_handler.close()
+    if profile_output is not None:
+        profiler.dump(profile_output)
+
+    frame_times = sorted(frame_time * 1000 for frame_time in replay_clock.frame_times)
+    report = {
+        "frames": len(frame_times),
+        "recorded_seconds": (frames[-1][0] - frames[0][0]) / 1000,
+        "replay_seconds": total_time,
+        "frames_per_second": len(frame_times) / total_time,
+        "frame_time_mean_ms": statistics.fmean(frame_times),
+        "frame_time_p50_ms": _percentile(frame_times, 50),
+        "frame_time_p95_ms": _percentile(frame_times, 95),
+        "frame_time_p99_ms": _percentile(frame_times, 99),
+        "frame_time_max_ms": frame_times[-1],
+    }
+    report.update(animation_scheduler.latency_report())
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("log", help="event log written by 'morse_code.py --record'")
+    parser.add_argument(
+        "--speed", type=float, default=0.0, help="playback speed, 0 for as fast as possible"
+    )
+    parser.add_argument("--headless", action="store_true", help="replay without a window")
+    parser.add_argument("--offline", action="store_true", help="use the bundled word list")
+    parser.add_argument("--word-file", help="local word file the session was recorded with")
+    parser.add_argument("--profile-output", help="write a frame profile to a .json/.csv file")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    try:
+        report = run_replay(args.log, args.speed, args.offline, args.word_file, args.profile_output)
+    except ValueError as replay_err:
+        print(replay_err)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, value in report.items():
+            print(f"{name:>26}: {value:.2f}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
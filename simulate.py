@@ -0,0 +1,234 @@
+"""Monte Carlo simulation of the game with synthetic players, used to tune the number of lives,
+the scoring and the word length.
+
+Simulated players recognize every letter with a configurable probability. Games are played
+with the rules of the game screen (see game_engine) in batches spread over a process pool.
+Like in the game, words are drawn by the word handler, which serves words with the letters a
+player gets wrong more often, and every batch is played by one player whose weak letters carry
+over from game to game. Every batch is seeded from the base seed and its own batch number, so
+results do not depend on the number of workers or the order batches finish in. The score and
+survival histograms of each batch are merged into the totals as soon as the batch is done.
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from constants import MAXIMUM_WORD_LENGTH
+from game_engine import MAX_LIVES, GameEngine
+from word_handler import WordHandler
+
+# State of a worker process, created once by _initialize_worker
+_word_handler: Optional[WordHandler] = None
+
+
+def _initialize_worker(max_length: int, word_file: Optional[str]) -> None:
+    """Loads the word corpus once per worker process."""
+    global _word_handler
+    _word_handler = WordHandler(max_size=max_length, offline=True, word_file=word_file)
+
+
+def simulate_batch(
+    batch: int,
+    n_games: int,
+    seed: int,
+    accuracy: Dict[str, float],
+    lives: int,
+    max_guesses: int,
+) -> Tuple[Counter, Counter]:
+    """Plays a batch of games, runs in a worker process.
+
+    Args:
+        batch (int): Number of the batch, part of its seed.
+        n_games (int): self-explanatory.
+        seed (int): Base seed of the simulation.
+        accuracy (Dict[str, float]): Probability of recognizing each (upper case) letter.
+        lives (int): Lives at the start of a game.
+        max_guesses (int): Games are stopped after this many guesses.
+
+    Returns:
+        Tuple[Counter, Counter]: Number of games per final score and per number of letters
+        played before the game was over.
+    """
+    rng = random.Random(seed * 1_000_003 + batch)
+    _word_handler.reset(rng.getrandbits(64))
+    engine = GameEngine(_word_handler.fetch_new_word, lives, on_guess=_word_handler.record_guess)
+
+    scores: Counter = Counter()
+    survival: Counter = Counter()
+    for _ in range(n_games):
+        engine.reset()
+        state = engine.state
+        apply_guess = engine.apply_guess
+        letters_played = 0
+        for _ in range(max_guesses):
+            letter = state.word[state.letter_index]
+            if rng.random() < accuracy[letter]:
+                apply_guess(letter)
+                letters_played += 1
+            else:
+                apply_guess("?")
+                if state.game_over:
+                    letters_played += 1
+                    break
+        scores[state.score] += 1
+        survival[letters_played] += 1
+    return scores, survival
+
+
+def _percentile(histogram: Counter, percentile: float) -> int:
+    """Returns a percentile of the values counted in a histogram."""
+    threshold = percentile / 100 * sum(histogram.values())
+    count = 0
+    for value in sorted(histogram):
+        count += histogram[value]
+        if count >= threshold:
+            return value
+    return 0
+
+
+def run_simulation(
+    n_games: int = 1_000_000,
+    accuracy: Optional[Dict[str, float]] = None,
+    default_accuracy: float = 0.9,
+    lives: int = MAX_LIVES,
+    max_length: int = MAXIMUM_WORD_LENGTH,
+    word_file: Optional[str] = None,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    batch_size: int = 10_000,
+    max_guesses: int = 100_000,
+) -> Dict[str, object]:
+    """Simulates many games in parallel.
+
+    Args:
+        n_games (int, optional): self-explanatory. Defaults to 1_000_000.
+        accuracy (Optional[Dict[str, float]], optional): Probability of recognizing a letter, for
+            letters differing from the default accuracy. Defaults to None.
+        default_accuracy (float, optional): Probability of recognizing any other letter.
+            Defaults to 0.9.
+        lives (int, optional): Lives at the start of a game. Defaults to MAX_LIVES.
+        max_length (int, optional): Maximum word length. Defaults to MAXIMUM_WORD_LENGTH.
+        word_file (Optional[str], optional): Word file to draw words from. Defaults to None (the
+            bundled word list).
+        seed (int, optional): Base seed, the same seed gives the same results. Defaults to 0.
+        workers (Optional[int], optional): Number of worker processes. Defaults to None (one per
+            CPU core).
+        batch_size (int, optional): Games per task handed to a worker. Defaults to 10_000.
+        max_guesses (int, optional): Games are stopped after this many guesses. Defaults to
+            100_000.
+
+    Returns:
+        Dict[str, object]: Summary statistics, throughput and the score & survival histograms.
+    """
+    letter_accuracy = dict.fromkeys(string.ascii_uppercase, default_accuracy)
+    letter_accuracy.update({letter.upper(): value for letter, value in (accuracy or {}).items()})
+    workers = workers or os.cpu_count() or 1
+    batches = [
+        (batch, min(batch_size, n_games - start))
+        for batch, start in enumerate(range(0, n_games, batch_size))
+    ]
+
+    scores: Counter = Counter()
+    survival: Counter = Counter()
+    games_done = 0
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_initialize_worker, initargs=(max_length, word_file)
+    ) as executor:
+        futures = [
+            executor.submit(simulate_batch, batch, games, seed, letter_accuracy, lives, max_guesses)
+            for batch, games in batches
+        ]
+        for future in as_completed(futures):
+            batch_scores, batch_survival = future.result()
+            scores.update(batch_scores)
+            survival.update(batch_survival)
+            games_done += sum(batch_scores.values())
+            elapsed_time = time.perf_counter() - start_time
+            print(
+                f"INFO: {games_done}/{n_games} games, {games_done / elapsed_time:.0f} games/s",
+                flush=True,
+            )
+    elapsed_time = time.perf_counter() - start_time
+
+    # Fraction of games still running after a number of letters
+    survival_curve = {}
+    remaining = n_games
+    for letters_played in range(max(survival, default=0) + 1):
+        survival_curve[letters_played] = remaining / n_games
+        remaining -= survival[letters_played]
+
+    return {
+        "games": n_games,
+        "seconds": elapsed_time,
+        "games_per_second": n_games / elapsed_time,
+        "games_per_second_per_core": n_games / elapsed_time / workers,
+        "mean_score": sum(score * count for score, count in scores.items()) / n_games,
+        "median_score": _percentile(scores, 50),
+        "p90_score": _percentile(scores, 90),
+        "p99_score": _percentile(scores, 99),
+        "survival": {
+            letters: survival_curve[letters]
+            for letters in (10, 25, 50, 100, 250)
+            if letters in survival_curve
+        },
+        "score_histogram": dict(sorted(scores.items())),
+        "survival_histogram": dict(sorted(survival.items())),
+    }
+
+
+def _parse_accuracy(text: str) -> Dict[str, float]:
+    """Parses per letter accuracies such as 'Q=0.5,Z=0.6'."""
+    accuracy = {}
+    for item in filter(None, text.split(",")):
+        letter, value = item.split("=")
+        accuracy[letter.strip().upper()] = float(value)
+    return accuracy
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--accuracy", type=float, default=0.9, help="default letter accuracy")
+    parser.add_argument(
+        "--letter-accuracy", type=_parse_accuracy, default={}, help="e.g. 'Q=0.5,Z=0.6'"
+    )
+    parser.add_argument("--lives", type=int, default=MAX_LIVES)
+    parser.add_argument("--max-length", type=int, default=MAXIMUM_WORD_LENGTH)
+    parser.add_argument("--word-file", help="word file (one word per line, may be .gz)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU cores)")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="games per task")
+    parser.add_argument("--output", help="write the full results to a JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_simulation(
+        args.games,
+        args.letter_accuracy,
+        args.accuracy,
+        args.lives,
+        args.max_length,
+        args.word_file,
+        args.seed,
+        args.workers,
+        args.batch_size,
+    )
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+    for name, value in results.items():
+        if not name.endswith("histogram"):
+            print(
+                f"{name:>26}: {value:.2f}" if isinstance(value, float) else f"{name:>26}: {value}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""Straight key input: the player sends morse code by holding the space bar or a mouse button.
+
+Presses and releases are timestamped the moment they are taken from the event queue instead of
+once per frame, classified into dots and dashes by AdaptiveMorseTiming and decoded letter by
+letter. A letter is decoded as soon as the key has been up for a letter gap, which is checked in
+real time while waiting for events, not at the next frame.
+"""
+
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+from pygame.locals import (
+    K_SPACE,
+    KEYDOWN,
+    KEYUP,
+    MOUSEBUTTONDOWN,
+    MOUSEBUTTONUP,
+    NOEVENT,
+)
+from constants import FPS
+from morse_timing import AdaptiveMorseTiming
+
+
+class StraightKey:
+    """Turns key presses into letters"""
+
+    def __init__(self, initial_wpm: float = 15, adaptation: float = 0.3) -> None:
+        """Create a straight key.
+
+        Args:
+            initial_wpm (float, optional): Expected sending speed in words per minute, the speed
+                is adapted to the player while keying. Defaults to 15.
+            adaptation (float, optional): Weight of each new mark in the speed estimate, between
+                0 and 1. Defaults to 0.3.
+        """
+        self.timing = AdaptiveMorseTiming(initial_wpm, adaptation)
+        self.is_down = False
+        self._pressed_at = 0.0
+        self._released_at = 0.0
+        # Seconds between the end of a letter gap and the letter being decoded
+        self.decode_latencies: List[float] = []
+
+    def press(self, timestamp: float) -> None:
+        """Starts a mark.
+
+        Args:
+            timestamp (float): Time of the press, from time.perf_counter.
+        """
+        if not self.is_down:
+            self.is_down = True
+            self._pressed_at = timestamp
+
+    def release(self, timestamp: float) -> Optional[str]:
+        """Ends a mark and classifies it.
+
+        Args:
+            timestamp (float): Time of the release, from time.perf_counter.
+
+        Returns:
+            Optional[str]: A dot or a dash, None if the key was not pressed.
+        """
+        if not self.is_down:
+            return None
+        self.is_down = False
+        self._released_at = timestamp
+        return self.timing.mark(timestamp - self._pressed_at)
+
+    @property
+    def letter_deadline(self) -> Optional[float]:
+        """Time at which the current letter is complete unless the key is pressed again, None if
+        no letter is being keyed.
+        """
+        if self.is_down or not self.timing.symbols:
+            return None
+        return self._released_at + 2 * self.timing.unit_length
+
+    def poll(self, now: float) -> Optional[str]:
+        """Decodes the current letter once the key has been up for a letter gap.
+
+        Args:
+            now (float): Current time, from time.perf_counter.
+
+        Returns:
+            Optional[str]: The decoded letter, UNKNOWN_CHARACTER for invalid codes and None if no
+            letter is complete.
+        """
+        deadline = self.letter_deadline
+        if deadline is None or now < deadline:
+            return None
+        letter = self.timing.finish_letter()
+        self.decode_latencies.append(time.perf_counter() - deadline)
+        return letter
+
+    def latency_report(self) -> Dict[str, float]:
+        """Returns percentiles of the decode latencies in milliseconds."""
+        latencies = sorted(self.decode_latencies)
+        if not latencies:
+            return {"letters": 0}
+
+        def _percentile(percentile: float) -> float:
+            index = min(len(latencies) - 1, int(percentile / 100 * len(latencies)))
+            return latencies[index] * 1000
+
+        return {
+            "letters": len(latencies),
+            "decode_latency_p50_ms": _percentile(50),
+            "decode_latency_p99_ms": _percentile(99),
+            "decode_latency_max_ms": latencies[-1] * 1000,
+        }
+
+
+class KeyingEventSource:
+    """Event source of the game screen feeding the straight key. Straight key presses are
+    consumed, decoded letters are handed to the game as key releases of that letter. The game
+    loop waits through 'wait_until', which handles every event the moment it arrives.
+    """
+
+    def __init__(
+        self,
+        straight_key: StraightKey,
+        keys: Tuple[int, ...] = (K_SPACE,),
+        mouse_buttons: Tuple[int, ...] = (3,),
+    ) -> None:
+        """Create an event source.
+
+        Args:
+            straight_key (StraightKey): self-explanatory.
+            keys (Tuple[int, ...], optional): Keys acting as straight key. Defaults to (K_SPACE,).
+            mouse_buttons (Tuple[int, ...], optional): Mouse buttons acting as straight key, the
+                left button is kept for clicking buttons. Defaults to (3,) (right button).
+        """
+        self.straight_key = straight_key
+        self.keys = keys
+        self.mouse_buttons = mouse_buttons
+        self._pending_events: List[pygame.event.Event] = []
+
+    def _handle_event(self, event: pygame.event.Event) -> None:
+        timestamp = time.perf_counter()
+        if event.type in (KEYDOWN, KEYUP) and event.key in self.keys:
+            is_press = event.type == KEYDOWN
+        elif event.type in (MOUSEBUTTONDOWN, MOUSEBUTTONUP) and event.button in self.mouse_buttons:
+            is_press = event.type == MOUSEBUTTONDOWN
+        else:
+            self._pending_events.append(event)
+            return
+        if is_press:
+            self.straight_key.press(timestamp)
+        else:
+            self.straight_key.release(timestamp)
+
+    def _poll_letter(self) -> None:
+        # A letter is complete the moment its letter gap is over, the game measures the latency
+        # of its feedback from then on
+        completed_at = self.straight_key.letter_deadline
+        letter = self.straight_key.poll(time.perf_counter())
+        if letter is not None and letter.isalpha():
+            self._pending_events.append(
+                pygame.event.Event(
+                    KEYUP,
+                    key=ord(letter.lower()),
+                    unicode=letter.lower(),
+                    mod=0,
+                    timestamp=completed_at,
+                )
+            )
+
+    def wait_until(self, deadline: float) -> None:
+        """Handles events as they arrive until a deadline, a letter is decoded as soon as its
+        letter gap is over.
+
+        Args:
+            deadline (float): self-explanatory, in seconds of time.perf_counter.
+        """
+        while True:
+            self._poll_letter()
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            wake_up_at = deadline
+            letter_deadline = self.straight_key.letter_deadline
+            if letter_deadline is not None:
+                wake_up_at = min(wake_up_at, letter_deadline)
+            event = pygame.event.wait(max(1, math.ceil((wake_up_at - now) * 1000)))
+            if event.type != NOEVENT:
+                self._handle_event(event)
+
+    def __call__(self) -> List[pygame.event.Event]:
+        for event in pygame.event.get():
+            self._handle_event(event)
+        self._poll_letter()
+        events = self._pending_events
+        self._pending_events = []
+        return events
+
+
+def self_test(text: str = "SOS MORSE CODE", wpm: float = 15) -> Dict[str, float]:
+    """Keys a text with perfect timing from another thread while frames are being pulled from a
+    keying event source at the frame rate, and measures how late letters are decoded.
+
+    Args:
+        text (str, optional): Letters and spaces. Defaults to "SOS MORSE CODE".
+        wpm (float, optional): Sending speed. Defaults to 15.
+
+    Returns:
+        Dict[str, float]: Whether the text was decoded correctly and the decode latencies.
+    """
+    import threading
+    from constants import MORSE_CODE
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    straight_key = StraightKey(initial_wpm=wpm)
+    event_source = KeyingEventSource(straight_key)
+    frame_length = 1 / FPS
+    unit = 1.2 / wpm
+
+    def _key_text() -> None:
+        for letter in text:
+            if letter == " ":
+                time.sleep(4 * unit)
+                continue
+            for symbol in MORSE_CODE[letter]:
+                pygame.event.post(pygame.event.Event(KEYDOWN, key=K_SPACE, unicode=" ", mod=0))
+                time.sleep(unit if symbol == "." else 3 * unit)
+                pygame.event.post(pygame.event.Event(KEYUP, key=K_SPACE, unicode=" ", mod=0))
+                time.sleep(unit)
+            time.sleep(2 * unit)
+
+    sender = threading.Thread(target=_key_text)
+    sender.start()
+    decoded = ""
+    while sender.is_alive() or straight_key.letter_deadline is not None:
+        event_source.wait_until(time.perf_counter() + frame_length)
+        events = [event for event in event_source() if event.type == KEYUP]
+        decoded += "".join(event.unicode for event in events).upper()
+    sender.join()
+    pygame.display.quit()
+
+    report: Dict[str, float] = {"correct": float(decoded == text.replace(" ", ""))}
+    report.update(straight_key.latency_report())
+    return report
+
+
+if __name__ == "__main__":
+    for name, value in self_test().items():
+        print(f"{name:>22}: {value:.2f}")
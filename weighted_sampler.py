@@ -0,0 +1,132 @@
+import random
+from array import array
+from typing import Iterable
+
+
+class FenwickSampler:
+    """Draws indices with probability proportional to their weights.
+
+    The weights are kept in a Fenwick (binary indexed) tree, so changing a weight and drawing an
+    index both take O(log n) time, no matter how many weights there are.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Create a sampler where all weights are zero.
+
+        Args:
+            size (int): Number of indices.
+        """
+        self.size = size
+        self._weights = array("d", bytes(8 * size))
+        self._tree = array("d", bytes(8 * (size + 1)))  # 1-based, node i covers i & -i weights
+        self._top_bit = 1 << max(size.bit_length() - 1, 0)
+
+    @classmethod
+    def from_weights(cls, weights: Iterable[float]) -> "FenwickSampler":
+        """Create a sampler from initial weights in O(n).
+
+        Args:
+            weights (Iterable[float]): Non-negative weight of each index.
+
+        Returns:
+            FenwickSampler: self-explanatory.
+        """
+        weights = array("d", weights)
+        sampler = cls(len(weights))
+        sampler._weights = weights
+        tree = sampler._tree
+        for i, weight in enumerate(weights, start=1):
+            tree[i] += weight
+            parent = i + (i & -i)
+            if parent <= sampler.size:
+                tree[parent] += tree[i]
+        return sampler
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> float:
+        return self._weights[index]
+
+    def add(self, index: int, delta: float) -> None:
+        """Changes the weight of an index by a given amount.
+
+        Args:
+            index (int): self-explanatory.
+            delta (float): Amount added to the weight, the weight must not become negative.
+        """
+        self._weights[index] += delta
+        i = index + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def set(self, index: int, weight: float) -> None:
+        """Sets the weight of an index.
+
+        Args:
+            index (int): self-explanatory.
+            weight (float): New non-negative weight.
+        """
+        self.add(index, weight - self._weights[index])
+
+    def prefix_sum(self, end: int) -> float:
+        """Returns the sum of the weights of the indices below 'end'.
+
+        Args:
+            end (int): self-explanatory.
+
+        Returns:
+            float: self-explanatory.
+        """
+        total = 0.0
+        while end > 0:
+            total += self._tree[end]
+            end -= end & -end
+        return total
+
+    @property
+    def total(self) -> float:
+        """Sum of all weights."""
+        return self.prefix_sum(self.size)
+
+    def find(self, value: float) -> int:
+        """Returns the index whose weight interval contains a value, i.e. the smallest index
+        for which the sum of the weights up to and including it exceeds the value.
+
+        Args:
+            value (float): A value in [0, total).
+
+        Returns:
+            int: self-explanatory.
+        """
+        position = 0
+        step = self._top_bit
+        while step:
+            next_position = position + step
+            if next_position <= self.size and self._tree[next_position] <= value:
+                position = next_position
+                value -= self._tree[next_position]
+            step >>= 1
+        # Rounding errors may point past the last index with a positive weight
+        index = min(position, self.size - 1)
+        while index > 0 and self._weights[index] == 0:
+            index -= 1
+        return index
+
+    def sample(self, rng: random.Random = random) -> int:
+        """Draws an index with probability proportional to its weight.
+
+        Args:
+            rng (random.Random, optional): Source of randomness. Defaults to the random module.
+
+        Raises:
+            ValueError: If all weights are zero.
+
+        Returns:
+            int: The drawn index.
+        """
+        total = self.total
+        if total <= 0:
+            raise ValueError("ERROR: Cannot sample from a sampler whose weights are all zero")
+        return self.find(rng.random() * total)
@@ -0,0 +1,108 @@
+import pygame
+from pygame.locals import MOUSEBUTTONUP
+from typing import Callable, Dict, List, Optional, Tuple
+from button import Button
+
+
+class WidgetManager:
+    """Collection of buttons dispatching mouse events with a spatial hit index.
+
+    The screen is divided into a grid of square cells and every cell lists the buttons
+    overlapping it, so finding the button under the mouse is a single lookup no matter how many
+    buttons there are.
+    """
+
+    def __init__(self, cell_size: int = 64) -> None:
+        """Create an empty widget manager.
+
+        Args:
+            cell_size (int, optional): Width & height of a grid cell in pixels. Defaults to 64.
+        """
+        self.cell_size = cell_size
+        self.widgets: List[Button] = []
+        self._callbacks: Dict[Button, Optional[Callable[[], None]]] = {}
+        self._hit_index: Dict[Tuple[int, int], List[Button]] = {}
+
+    def _cells(self, rect: pygame.Rect) -> List[Tuple[int, int]]:
+        """Returns the grid cells overlapped by a rectangle."""
+        return [
+            (column, row)
+            for column in range(rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1)
+            for row in range(rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1)
+        ]
+
+    def add(self, widget: Button, on_click: Optional[Callable[[], None]] = None) -> Button:
+        """Adds a button, buttons added later are drawn on top of earlier ones.
+
+        Args:
+            widget (Button): self-explanatory.
+            on_click (Optional[Callable[[], None]], optional): Called when the button is clicked.
+                Defaults to None.
+
+        Returns:
+            Button: The added button.
+        """
+        self.widgets.append(widget)
+        self._callbacks[widget] = on_click
+        for cell in self._cells(widget.rect):
+            self._hit_index.setdefault(cell, []).append(widget)
+        return widget
+
+    def remove(self, widget: Button) -> None:
+        """Removes a button.
+
+        Args:
+            widget (Button): self-explanatory.
+        """
+        self.widgets.remove(widget)
+        del self._callbacks[widget]
+        self.rebuild_index()
+
+    def rebuild_index(self) -> None:
+        """Recreates the hit index, required after a button has been moved or resized."""
+        self._hit_index = {}
+        for widget in self.widgets:
+            for cell in self._cells(widget.rect):
+                self._hit_index.setdefault(cell, []).append(widget)
+
+    def widget_at(self, position: Tuple[int, int]) -> Optional[Button]:
+        """Returns the topmost button at a position.
+
+        Args:
+            position (Tuple[int, int]): self-explanatory.
+
+        Returns:
+            Optional[Button]: The button, None if there is no button at the position.
+        """
+        cell = (position[0] // self.cell_size, position[1] // self.cell_size)
+        for widget in reversed(self._hit_index.get(cell, ())):
+            if widget.rect.collidepoint(position):
+                return widget
+        return None
+
+    def dispatch(self, event: pygame.event.Event) -> Optional[Button]:
+        """Hands a click to the button under the mouse and calls its callback.
+
+        Args:
+            event (pygame.event.Event): Any pygame event.
+
+        Returns:
+            Optional[Button]: The clicked button, None if the event is not a click on a button.
+        """
+        if event.type != MOUSEBUTTONUP:
+            return None
+        widget = self.widget_at(event.pos)
+        if widget is not None and self._callbacks[widget] is not None:
+            self._callbacks[widget]()
+        return widget
+
+    def draw(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Draws all buttons.
+
+        Args:
+            surface (pygame.Surface): main game surface.
+
+        Returns:
+            List[pygame.Rect]: Bounding rectangles of the drawn buttons.
+        """
+        return [widget.draw_button(surface) for widget in self.widgets]
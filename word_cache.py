@@ -0,0 +1,107 @@
+import hashlib
+import os
+import struct
+import time
+import zlib
+from typing import List, Optional
+
+DEFAULT_CACHE_DIRECTORY = os.environ.get(
+    "MORSE_CODE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "morse_code")
+)
+
+
+class WordListCache:
+    """On-disk cache of a word list.
+
+    The file consists of a fixed size header (magic, version, creation time and a SHA-256 checksum
+    of the payload) followed by the zlib compressed, newline separated words.
+    """
+
+    _MAGIC: bytes = b"MCWL"
+    _VERSION: int = 1
+    _HEADER = struct.Struct("<4sHd32s")
+
+    def __init__(
+        self,
+        path: str = os.path.join(DEFAULT_CACHE_DIRECTORY, "wordlist.bin"),
+        max_age: float = 7 * 24 * 60 * 60,
+    ) -> None:
+        """Create a cache stored at a given path.
+
+        Args:
+            path (str, optional): Location of the cache file. Defaults to wordlist.bin in the
+                DEFAULT_CACHE_DIRECTORY.
+            max_age (float, optional): Number of seconds the cached word list stays valid.
+                Defaults to one week.
+        """
+        self.path = path
+        self.max_age = max_age
+
+    def load(self) -> Optional[List[str]]:
+        """Load the cached word list.
+
+        Returns:
+            Optional[List[str]]: The cached words, None if the cache is missing, too old or corrupt.
+        """
+        try:
+            with open(self.path, "rb") as cache_file:
+                data = cache_file.read()
+        except OSError:
+            return None
+
+        if len(data) < self._HEADER.size:
+            print(f"INFO: Ignoring truncated word list cache '{self.path}'")
+            return None
+        magic, version, created, checksum = self._HEADER.unpack_from(data)
+        if magic != self._MAGIC or version != self._VERSION:
+            print(f"INFO: Ignoring word list cache '{self.path}' with unknown format")
+            return None
+        if time.time() - created > self.max_age:
+            print(f"INFO: Word list cache '{self.path}' has expired")
+            return None
+
+        payload = memoryview(data)[self._HEADER.size :]
+        if hashlib.sha256(payload).digest() != checksum:
+            print(f"INFO: Ignoring word list cache '{self.path}' with invalid checksum")
+            return None
+
+        return zlib.decompress(payload).decode("utf-8").split("\n")
+
+    def save(self, words: List[str]) -> None:
+        """Store a word list in the cache, the previous cache file is replaced atomically.
+
+        Args:
+            words (List[str]): self-explanatory
+        """
+        payload = zlib.compress("\n".join(words).encode("utf-8"))
+        header = self._HEADER.pack(
+            self._MAGIC, self._VERSION, time.time(), hashlib.sha256(payload).digest()
+        )
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(temporary_path, "wb") as cache_file:
+                cache_file.write(header)
+                cache_file.write(payload)
+            os.replace(temporary_path, self.path)
+        except OSError as os_err:
+            print(f"ERROR: Could not write word list cache '{self.path}': {os_err}")
+
+    def clear(self) -> None:
+        """Remove the cache file if it exists."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+    # Report the start up cost of a word handler without (cold) and with (warm) a cached word list
+    from word_handler import WordHandler
+
+    cache = WordListCache()
+    cache.clear()
+    for start in ("Cold", "Warm"):
+        start_time = time.perf_counter()
+        WordHandler(cache=cache)
+        print(f"{start} start: {(time.perf_counter() - start_time) * 1000:.1f} ms")
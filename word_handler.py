@@ -1,19 +1,53 @@
-import requests
-from requests.exceptions import HTTPError
-from typing import Collection
+import numpy as np
+import os
 import random
+import requests
+from requests.exceptions import RequestException
+import string
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+import time
+from weighted_sampler import FenwickSampler
+from word_cache import WordListCache
+from word_store import WordStore
 
 
 class WordHandler:
     _WORD_SITE: str = "https://www.mit.edu/~ecprice/wordlist.10000"
     _STATUS_CODE_OK: int = 200
+    _REQUEST_TIMEOUT: float = 5.0
+    _BUNDLED_WORD_LIST: str = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "data", "bundled_words.txt"
+    )
     _MIN_WORD_SIZE: int = 3
+    _LOW_WATER_MARK: int = 32
+    _WEAK_LETTER_WEIGHT: float = 4.0  # Added to a word's weight per error of a contained letter
+    _WEAKNESS_DECAY: float = 0.7  # Weakness of a letter is multiplied by this on a correct guess
+    _RECENT_WORDS: int = 100  # Number of recently drawn words that are not drawn again
+    _MAX_REDRAWS: int = 10  # Draws of a recent word before it is accepted anyway
 
-    def __init__(self, max_size: int = 4):
+    def __init__(
+        self,
+        max_size: int = 4,
+        cache: Optional[WordListCache] = None,
+        offline: bool = False,
+        word_file: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
         """Word handler for words smaller than a given maximum size.
 
         Args:
             max_size (int, optional): The maximum lenght of a word. Defaults to 4.
+            cache (Optional[WordListCache], optional): On-disk cache of the downloaded word list.
+                Defaults to None, in which case the default cache location is used.
+            offline (bool, optional): Only use the bundled word list, neither the cache nor the
+                network are accessed. Defaults to False.
+            word_file (Optional[str], optional): Local (optionally gzip compressed) word file
+                with one word per line, used instead of the downloaded word list. The file is
+                memory-mapped and shared with other processes using it. Defaults to None.
+            seed (Optional[int], optional): Seed of the word selection, the same seed and guesses
+                give the same words. Defaults to None (unpredictable).
 
         Raises:
             ValueError: If the provided maximum size is lower than the minimum size length.
@@ -23,34 +57,208 @@ class WordHandler:
                 f"ERROR: The provided max size '{max_size}' is not greater than or equal to the minimum size {self._MIN_WORD_SIZE}"
             )
         self.max_size = max_size
-        word_list = self._request_new_word_list()
-        self._words = self._randomize_words(word_list)
+        self._cache = cache if cache is not None else WordListCache()
+        self.offline = offline
+        self.word_file = word_file
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._word_store = self._request_new_word_list()
+
+        # Unweighted draws walk through a shuffled buffer of word ids, so no word repeats before
+        # all words were drawn. A second buffer is shuffled by a background thread once the
+        # current one runs low, so that fetching a word never blocks the game loop
+        self._word_ids = np.empty(0, dtype=np.int64)
+        self._position = 0
+        self._next_word_ids: Optional[np.ndarray] = None
+        self._refill_pending = False
+        self._refill_seed = 0
+        self._generation = 0  # Increased when the buffers are discarded, see '_reset_buffers'
+        self._refill_generation = 0
+        self._refill_lock = threading.Lock()
+        self._refill_done = threading.Condition(self._refill_lock)
+        self._refill_requested = threading.Event()
+        self._refill_thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._reset_buffers()
+
+        # Word selection is weighted in two levels: a letter bucket is drawn from a Fenwick tree,
+        # then a word containing that letter. The last bucket holds the base weight of every
+        # word, each letter bucket the extra weight of all words containing a weak letter. A
+        # word's probability is thereby proportional to 1 + the weakness of its letters, and a
+        # guess only updates a single bucket regardless of the size of the word list.
+        self.letter_weakness: Dict[str, float] = dict.fromkeys(string.ascii_lowercase, 0.0)
+        self._letter_sampler = FenwickSampler(len(string.ascii_lowercase) + 1)
+        self._letter_sampler.set(len(string.ascii_lowercase), len(self._word_store))
+
+        # Weak-letter and constrained draws pick words with replacement, a word drawn again soon
+        # after is drawn once more
+        self._recent_words: Deque[str] = deque(maxlen=self._RECENT_WORDS)
+        self._recent_word_set: Set[str] = set()
+
+    def _request_new_word_list(self) -> WordStore:
+        """Creates a word store with words smaller than the given maximum size.
+        A given word file is memory-mapped. Otherwise the word list is read from the on-disk
+        cache if possible, or else it is downloaded (and cached). The bundled word list is used if
+        both the cache and the network are unavailable.
+
+        Returns:
+            WordStore: The words smaller than the maximum size.
+        """
+        start_time = time.perf_counter()
+        if self.word_file is not None:
+            word_store = WordStore.from_mapped_file(self.word_file, max_length=self.max_size)
+            elapsed_time = (time.perf_counter() - start_time) * 1000
+            print(
+                f"INFO: Mapped {len(word_store)} words from '{self.word_file}' in "
+                f"{elapsed_time:.1f} ms, using {word_store.memory_usage()['total'] / 1024:.1f} KiB"
+            )
+            return word_store
 
-    def _request_new_word_list(self) -> Collection[str]:
-        """Creates a word list with words smaller than the given maximum size.
+        content = None if self.offline else self._cache.load()
+        source = "cache"
+        if content is None and not self.offline:
+            content = self._download_word_list()
+            source = "network"
+            if content is not None:
+                self._cache.save(content)
+        if content is None:
+            content = self._load_bundled_word_list()
+            source = "bundled word list"
+        word_store = WordStore(word for word in content if len(word) <= self.max_size)
+        elapsed_time = (time.perf_counter() - start_time) * 1000
+        memory_usage = word_store.memory_usage()["total"] / 1024
+        print(
+            f"INFO: Loaded {len(word_store)} words from {source} in {elapsed_time:.1f} ms, "
+            f"using {memory_usage:.1f} KiB"
+        )
+
+        return word_store
+
+    def _download_word_list(self) -> Optional[List[str]]:
+        """Downloads the word list from the word site.
 
         Returns:
-            Collection[str]: A collection of words smaller than the maximum size.
+            Optional[List[str]]: The downloaded words, None if the download failed.
         """
         try:
-            response = requests.get(self._WORD_SITE)
-        except HTTPError as http_err:
-            print(f"ERROR: HTTPError occured: {http_err}")
-        response.enconding = "utf-8"
-        content = response.text.splitlines()
+            response = requests.get(self._WORD_SITE, timeout=self._REQUEST_TIMEOUT)
+            response.raise_for_status()
+        except RequestException as request_err:
+            print(f"ERROR: Could not download word list: {request_err}")
+            return None
+        response.encoding = "utf-8"
 
-        return list(word for word in content if len(word) <= self.max_size)
+        return [word for word in response.text.splitlines() if word]
 
-    def _randomize_words(self, words: Collection[str]) -> Collection[str]:
-        """Returns the same collection of words but shuffled.
+    def _load_bundled_word_list(self) -> List[str]:
+        """Reads the word list shipped together with the game.
 
-        Args:
-            words (Collection[str]): self-explanatory
+        Returns:
+            List[str]: The bundled words.
+        """
+        with open(self._BUNDLED_WORD_LIST, encoding="utf-8") as word_file:
+            return [word for word in word_file.read().splitlines() if word]
+
+    def _shuffled_word_ids(self, seed: int) -> np.ndarray:
+        """Returns the ids of all words in a random order."""
+        return np.random.default_rng(seed).permutation(len(self._word_store))
+
+    def _reset_buffers(self) -> None:
+        """Shuffles a new current buffer and discards the next one, also if it is still being
+        prepared.
+        """
+        with self._refill_lock:
+            self._generation += 1
+            self._next_word_ids = None
+            self._refill_pending = False
+        self._word_ids = self._shuffled_word_ids(self._rng.getrandbits(64))
+        self._position = 0
+
+    def _refill_words(self) -> None:
+        """Producer loop of the background thread, shuffles the next buffer each time a refill
+        is requested.
+        """
+        while True:
+            self._refill_requested.wait()
+            self._refill_requested.clear()
+            with self._refill_lock:
+                if self._closed:
+                    return
+                generation, seed = self._refill_generation, self._refill_seed
+            word_ids = self._shuffled_word_ids(seed)
+            with self._refill_done:
+                if generation == self._generation:
+                    self._next_word_ids = word_ids
+                    self._refill_pending = False
+                    self._refill_done.notify_all()
+
+    def _request_refill(self) -> None:
+        """Asks the background thread to shuffle the next buffer unless it is already doing so.
+        The seed of the buffer is drawn here, so the same seed always gives the same words. Once
+        the handler is closed, the next buffer is shuffled right away.
+        """
+        with self._refill_lock:
+            if self._refill_pending or self._next_word_ids is not None:
+                return
+            if self._closed:
+                self._next_word_ids = self._shuffled_word_ids(self._rng.getrandbits(64))
+                return
+            self._refill_pending = True
+            self._refill_seed = self._rng.getrandbits(64)
+            self._refill_generation = self._generation
+            if self._refill_thread is None:
+                # Started on first use, most games never run out of words
+                self._refill_thread = threading.Thread(
+                    target=self._refill_words, name="WordHandlerRefill", daemon=True
+                )
+                self._refill_thread.start()
+        self._refill_requested.set()
+
+    def _next_buffered_word(self) -> Optional[str]:
+        """Takes the next word of the shuffled buffer. Once the buffer runs low the next one is
+        prepared in the background and swapped in when the current one is empty. Should the next
+        buffer not be ready yet, a random word is returned. With a seed, the next buffer is
+        waited for instead, so the words stay reproducible.
 
         Returns:
-            Collection[str]: A shuffled version of the 'words' parameter
+            Optional[str]: A word, None if the word store is empty.
+        """
+        if len(self._word_ids) - self._position <= self._LOW_WATER_MARK:
+            self._request_refill()
+        if self._position >= len(self._word_ids):
+            with self._refill_done:
+                if self.seed is not None:
+                    self._refill_done.wait_for(lambda: self._next_word_ids is not None)
+                next_word_ids, self._next_word_ids = self._next_word_ids, None
+            if next_word_ids is None:
+                print(f"INFO: Next word buffer is not ready yet, picking a random word")
+                return self._word_store.sample(self._rng)
+            self._word_ids, self._position = next_word_ids, 0
+            if not len(self._word_ids):
+                return None
+        word = self._word_store[int(self._word_ids[self._position])]
+        self._position += 1
+        return word
+
+    def close(self) -> None:
+        """Stops the background thread and waits for it to finish. Words can still be fetched,
+        the buffers are then shuffled on the calling thread.
         """
-        return random.sample(words, len(words))
+        with self._refill_lock:
+            self._closed = True
+            refill_thread, self._refill_thread = self._refill_thread, None
+            if self._refill_pending:
+                # The thread stops without delivering, the buffer is shuffled on the next request
+                self._refill_pending = False
+                self._generation += 1
+        self._refill_requested.set()
+        if refill_thread is not None:
+            refill_thread.join()
+
+    @property
+    def words(self) -> WordStore:
+        """All words the handler draws from."""
+        return self._word_store
 
     def get_current_word(self) -> str:
         """Retrieve the current word
@@ -60,19 +268,100 @@ class WordHandler:
         """
         return self._current_word
 
-    def fetch_new_word(self) -> str:
-        """Tries to retrieve a word from the word collection. If the collection is empty
-        a new collection is created and the first word from that collection is returned.
+    def reset(self, seed: Optional[int] = None) -> None:
+        """Starts over with a new player: the weakness of all letters, the recently drawn words
+        and the shuffled buffers are forgotten and the word selection is seeded again.
+
+        Args:
+            seed (Optional[int], optional): See '__init__'. Defaults to None (unpredictable).
+        """
+        self.seed = seed
+        self._rng = random.Random(seed)
+        for index, letter in enumerate(string.ascii_lowercase):
+            self.letter_weakness[letter] = 0.0
+            self._letter_sampler.set(index, 0.0)
+        self._recent_words.clear()
+        self._recent_word_set.clear()
+        self._reset_buffers()
+
+    def record_guess(self, letter: str, correct: bool) -> None:
+        """Updates the weakness of a letter after the player guessed it. Words containing weak
+        letters are drawn more often by 'fetch_new_word'.
+
+        Args:
+            letter (str): The letter the player had to guess (not the letter entered).
+            correct (bool): Whether the guess was correct.
+        """
+        letter = letter.lower()
+        if letter not in self.letter_weakness:
+            return
+        weakness = self.letter_weakness[letter]
+        weakness = weakness * self._WEAKNESS_DECAY if correct else weakness + 1.0
+        self.letter_weakness[letter] = weakness
+        n_words = len(self._word_store.by_letter[letter])
+        self._letter_sampler.set(
+            string.ascii_lowercase.index(letter), self._WEAK_LETTER_WEIGHT * weakness * n_words
+        )
+
+    def _draw_weighted_word(self) -> Optional[str]:
+        """Draws a word with probability proportional to 1 + the weakness of its letters."""
+        bucket = self._letter_sampler.sample(self._rng)
+        if bucket == len(string.ascii_lowercase):
+            return self._next_buffered_word()
+        return self._word_store.sample(self._rng, letters=string.ascii_lowercase[bucket])
+
+    def fetch_new_word(
+        self,
+        min_length: Optional[int] = None,
+        letters: Optional[str] = None,
+        min_symbols: Optional[int] = None,
+        max_symbols: Optional[int] = None,
+    ) -> str:
+        """Draws a random word from the word store, optionally under constraints. Words matching
+        the same constraints are drawn in constant time after the first draw. Without constraints,
+        words containing letters the player struggles with are preferred (see 'record_guess').
+        Words drawn recently are avoided unless the constraints leave hardly any other words.
+
+        Args:
+            min_length (Optional[int], optional): Minimum number of letters. Defaults to None.
+            letters (Optional[str], optional): The word has to contain at least one of these
+                letters. Defaults to None (any letters).
+            min_symbols (Optional[int], optional): Minimum number of dots & dashes of the word.
+                Defaults to None.
+            max_symbols (Optional[int], optional): Maximum number of dots & dashes of the word.
+                Defaults to None.
 
         Returns:
-            str: A new word
+            str: A new word, any word if no word matches the constraints.
         """
-        try:
-            self._current_word = self._words.pop()
-            return self._current_word
-        except IndexError:
-            print(f"INFO: Word list is empty, creating a new word list")
-            word_list = self._request_new_word_list(self.max_size)
-            self._words = self._randomize_words(word_list)
-            self._current_word = self._words.pop()
-            return self._current_word
+        unconstrained = (
+            min_length is None and letters is None and min_symbols is None and max_symbols is None
+        )
+        for _ in range(self._MAX_REDRAWS):
+            if unconstrained:
+                word = self._draw_weighted_word()
+            else:
+                word = self._word_store.sample(
+                    self._rng,
+                    min_length=min_length,
+                    letters=letters,
+                    min_symbols=min_symbols,
+                    max_symbols=max_symbols,
+                )
+            if word is None or word not in self._recent_word_set:
+                break
+        if word is None:
+            print(f"INFO: No word matches the constraints, picking any word")
+            word = self._word_store.sample(self._rng)
+        self._remember_word(word)
+        self._current_word = word
+        return self._current_word
+
+    def _remember_word(self, word: str) -> None:
+        """Adds a word to the recently drawn words, the oldest one is forgotten."""
+        if word in self._recent_word_set:
+            return
+        if len(self._recent_words) == self._recent_words.maxlen:
+            self._recent_word_set.discard(self._recent_words[0])
+        self._recent_words.append(word)
+        self._recent_word_set.add(word)
@@ -0,0 +1,198 @@
+"""Streaming access to large local word files with one word per line.
+
+Word files are memory-mapped read-only and their lines are filtered lazily, so even dictionaries
+with millions of words are never read into memory as a whole. Gzip compressed files (*.gz) are
+decompressed once into the cache directory. Packed corpora, the layout WordStore works on, are
+cached as well and memory-mapped by every process using them, so several game processes share
+the pages of a single corpus through the operating system's page cache.
+"""
+
+import gzip
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from typing import Iterator, Optional, Tuple, Union
+from word_cache import DEFAULT_CACHE_DIRECTORY
+
+import numpy as np
+
+Buffer = Union[mmap.mmap, bytes]
+
+_PACKED_MAGIC = b"MCWS"
+_PACKED_VERSION = 1
+_PACKED_HEADER = struct.Struct("<4sHxxI")  # magic, version, number of words
+
+
+def _cached_path(path: str, suffix: str, cache_directory: str, *parameters: object) -> str:
+    """Returns the location of a file derived from a word file. The name changes whenever the
+    word file or the parameters change, so stale files are never used.
+    """
+    status = os.stat(path)
+    key = f"{os.path.abspath(path)}|{status.st_mtime_ns}|{status.st_size}|{parameters}"
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    name = os.path.basename(path).split(".")[0]
+    return os.path.join(cache_directory, f"{name}.{digest}{suffix}")
+
+
+def _write_atomically(path: str, write_function) -> None:
+    """Writes a file through a temporary file which replaces the target once it is complete."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as temporary_file:
+            write_function(temporary_file)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def decompressed_path(path: str, cache_directory: str = DEFAULT_CACHE_DIRECTORY) -> str:
+    """Returns the location of the uncompressed content of a word file. Gzip compressed files
+    are decompressed into the cache directory the first time.
+
+    Args:
+        path (str): Location of a plain or gzip compressed (*.gz) word file.
+        cache_directory (str, optional): Where decompressed files are kept. Defaults to
+            DEFAULT_CACHE_DIRECTORY.
+
+    Returns:
+        str: The path itself for plain files, the decompressed file otherwise.
+    """
+    if not path.endswith(".gz"):
+        return path
+    target = _cached_path(path, ".txt", cache_directory)
+    if not os.path.exists(target):
+        print(f"INFO: Decompressing '{path}' into '{target}'")
+
+        def _decompress(target_file) -> None:
+            with gzip.open(path, "rb") as compressed_file:
+                shutil.copyfileobj(compressed_file, target_file, 1 << 20)
+
+        _write_atomically(target, _decompress)
+    return target
+
+
+def map_file(path: str) -> Buffer:
+    """Memory-maps a file read-only.
+
+    Args:
+        path (str): self-explanatory.
+
+    Returns:
+        Buffer: The mapped file, empty bytes for an empty file (which cannot be mapped).
+    """
+    with open(path, "rb") as mapped_file:
+        if os.fstat(mapped_file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_lines(buffer: Buffer) -> Iterator[bytes]:
+    """Yields the lines of a buffer one at a time, without line endings.
+
+    Args:
+        buffer (Buffer): self-explanatory.
+
+    Yields:
+        Iterator[bytes]: self-explanatory.
+    """
+    start = 0
+    size = len(buffer)
+    while start < size:
+        end = buffer.find(b"\n", start)
+        if end < 0:
+            end = size
+        yield buffer[start:end].rstrip(b"\r")
+        start = end + 1
+
+
+def iter_words(
+    path: str,
+    max_length: Optional[int] = None,
+    min_length: int = 1,
+    cache_directory: str = DEFAULT_CACHE_DIRECTORY,
+) -> Iterator[str]:
+    """Lazily yields the words of a word file that can be played, i.e. that consist of the
+    letters a-z only, in lower case.
+
+    Args:
+        path (str): Location of a plain or gzip compressed (*.gz) word file.
+        max_length (Optional[int], optional): Skip longer words. Defaults to None (no limit).
+        min_length (int, optional): Skip shorter words. Defaults to 1.
+        cache_directory (str, optional): Where decompressed files are kept. Defaults to
+            DEFAULT_CACHE_DIRECTORY.
+
+    Yields:
+        Iterator[str]: self-explanatory.
+    """
+    mapped_file = map_file(decompressed_path(path, cache_directory))
+    for line in iter_lines(mapped_file):
+        word = line.strip()
+        if min_length <= len(word) and (max_length is None or len(word) <= max_length):
+            if word.isalpha():  # Only true for the ASCII letters
+                yield word.decode("ascii").lower()
+
+
+def _write_packed_corpus(
+    path: str, packed_file, max_length: Optional[int], cache_directory: str
+) -> None:
+    """Streams the words of a word file into a packed corpus: a header, the offsets of all words
+    relative to the start of the file and the words themselves, back to back.
+    """
+    offsets = array("I")
+    with tempfile.TemporaryFile() as words_file:
+        position = 0
+        for word in iter_words(path, max_length, cache_directory=cache_directory):
+            offsets.append(position)
+            words_file.write(word.encode("ascii"))
+            position += len(word)
+        offsets.append(position)
+
+        base = _PACKED_HEADER.size + offsets.itemsize * len(offsets)
+        packed_file.write(_PACKED_HEADER.pack(_PACKED_MAGIC, _PACKED_VERSION, len(offsets) - 1))
+        packed_file.write(array("I", (offset + base for offset in offsets)).tobytes())
+        words_file.seek(0)
+        shutil.copyfileobj(words_file, packed_file, 1 << 20)
+
+
+def map_packed_corpus(
+    path: str, max_length: Optional[int] = None, cache_directory: str = DEFAULT_CACHE_DIRECTORY
+) -> Tuple[Buffer, np.ndarray]:
+    """Memory-maps the packed corpus of a word file, the corpus is created on first use.
+
+    Args:
+        path (str): Location of a plain or gzip compressed (*.gz) word file.
+        max_length (Optional[int], optional): Skip longer words. Defaults to None (no limit).
+        cache_directory (str, optional): Where packed corpora are kept. Defaults to
+            DEFAULT_CACHE_DIRECTORY.
+
+    Raises:
+        ValueError: If the packed corpus is corrupt.
+
+    Returns:
+        Tuple[Buffer, np.ndarray]: The mapped corpus and the offsets of its words, word i spans
+        corpus[offsets[i]:offsets[i + 1]]. The offsets are a read-only view into the corpus.
+    """
+    packed_path = _cached_path(path, ".words", cache_directory, max_length, _PACKED_VERSION)
+    if not os.path.exists(packed_path):
+        _write_atomically(
+            packed_path,
+            lambda packed_file: _write_packed_corpus(
+                path, packed_file, max_length, cache_directory
+            ),
+        )
+
+    corpus = map_file(packed_path)
+    if len(corpus) < _PACKED_HEADER.size:
+        raise ValueError(f"ERROR: Truncated packed corpus '{packed_path}'")
+    magic, version, n_words = _PACKED_HEADER.unpack_from(corpus)
+    if magic != _PACKED_MAGIC or version != _PACKED_VERSION:
+        raise ValueError(f"ERROR: Packed corpus '{packed_path}' has an unknown format")
+    offsets = np.frombuffer(corpus, dtype=np.uint32, count=n_words + 1, offset=_PACKED_HEADER.size)
+    return corpus, offsets
@@ -0,0 +1,268 @@
+import numpy as np
+import random
+import string
+import zlib
+from collections import OrderedDict
+from constants import MORSE_CODE
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from word_cache import DEFAULT_CACHE_DIRECTORY
+from word_loader import Buffer, map_packed_corpus
+
+# Number of dots & dashes of each (lower case) letter, indexed by its byte value
+_SYMBOL_COUNTS = np.zeros(256, dtype=np.uint16)
+for _letter, _code in MORSE_CODE.items():
+    _SYMBOL_COUNTS[ord(_letter.lower())] = len(_code)
+
+
+class WordStore:
+    """Read-only word corpus packed into a single contiguous buffer.
+
+    The words are stored back to back in one bytes object or memory-mapped file, word i spans
+    buffer[offsets[i]:offsets[i + 1]]. Indexes by word length, by contained letter and by the
+    total number of morse code symbols hold arrays of word ids, and the ids matching a
+    combination of constraints are cached, so that drawing a random word under the same
+    constraints again takes constant time without copying or shuffling the corpus.
+    """
+
+    def __init__(self, words: Iterable[str], max_cached_queries: int = 64) -> None:
+        """Create a word store. Words are converted to lower case, words containing anything
+        else than the letters a-z have no morse code in the game and are skipped.
+
+        Args:
+            words (Iterable[str]): The corpus, consumed once.
+            max_cached_queries (int, optional): Number of constraint combinations whose matching
+                word ids are kept. Defaults to 64.
+        """
+        words = [
+            word
+            for word in map(str.lower, map(str.strip, words))
+            if word.isascii() and word.isalpha()
+        ]
+        offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+        np.cumsum(np.fromiter(map(len, words), np.uint32, len(words)), out=offsets[1:])
+        self._initialize("".join(words).encode("ascii"), offsets, max_cached_queries)
+
+    def _initialize(self, buffer: Buffer, offsets: np.ndarray, max_cached_queries: int) -> None:
+        """Sets up the store for a packed corpus, shared by all constructors."""
+        self._buffer = buffer
+        self._offsets = offsets
+        self.mapped = not isinstance(buffer, bytes)
+        self.max_cached_queries = max_cached_queries
+        self._query_cache: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._build_indexes()
+
+    @classmethod
+    def from_mapped_file(
+        cls,
+        path: str,
+        max_length: Optional[int] = None,
+        max_cached_queries: int = 64,
+        cache_directory: str = DEFAULT_CACHE_DIRECTORY,
+    ) -> "WordStore":
+        """Create a word store on top of the memory-mapped, packed corpus of a word file (see
+        word_loader). The words are not copied, processes using the same word file share them.
+
+        Args:
+            path (str): Location of a plain or gzip compressed (*.gz) word file, one word per line.
+            max_length (Optional[int], optional): Skip longer words. Defaults to None (no limit).
+            max_cached_queries (int, optional): Number of constraint combinations whose matching
+                word ids are kept. Defaults to 64.
+            cache_directory (str, optional): Where decompressed files and packed corpora are
+                kept. Defaults to DEFAULT_CACHE_DIRECTORY.
+
+        Returns:
+            WordStore: self-explanatory.
+        """
+        buffer, offsets = map_packed_corpus(path, max_length, cache_directory)
+        word_store = cls.__new__(cls)
+        word_store._initialize(buffer, offsets, max_cached_queries)
+        return word_store
+
+    def _build_indexes(self) -> None:
+        """Creates the length, letter and morse symbol count indexes. Every index maps a key
+        onto the sorted ids of the words with that key.
+        """
+        n_words = len(self)
+        # A mapped corpus starts with a header, the words themselves fill the rest of the buffer
+        start = int(self._offsets[0])
+        characters = np.frombuffer(self._buffer, dtype=np.uint8)[start:]
+        word_starts = self._offsets[:-1] - start
+        lengths = np.diff(self._offsets)
+        word_ids = np.arange(n_words, dtype=np.uint32)
+        if n_words:
+            symbol_counts = np.add.reduceat(_SYMBOL_COUNTS[characters], word_starts)
+            # Bit i is set if a word contains the i-th letter of the alphabet
+            letter_masks = np.bitwise_or.reduceat(
+                np.left_shift(1, characters - ord("a"), dtype=np.uint32), word_starts
+            )
+        else:
+            symbol_counts = np.zeros(0, dtype=np.uint16)
+            letter_masks = np.zeros(0, dtype=np.uint32)
+
+        self.by_length: Dict[int, np.ndarray] = {
+            int(length): word_ids[lengths == length] for length in np.unique(lengths)
+        }
+        self.by_symbol_count: Dict[int, np.ndarray] = {
+            int(count): word_ids[symbol_counts == count] for count in np.unique(symbol_counts)
+        }
+        self.by_letter: Dict[str, np.ndarray] = {
+            letter: word_ids[(letter_masks & (1 << i)) != 0]
+            for i, letter in enumerate(string.ascii_lowercase)
+        }
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, word_id: int) -> str:
+        return self._buffer[self._offsets[word_id] : self._offsets[word_id + 1]].decode("ascii")
+
+    def __iter__(self) -> Iterator[str]:
+        for word_id in range(len(self)):
+            yield self[word_id]
+
+    def candidates(
+        self,
+        min_length: Optional[int] = None,
+        max_length: Optional[int] = None,
+        letters: Optional[str] = None,
+        min_symbols: Optional[int] = None,
+        max_symbols: Optional[int] = None,
+    ) -> np.ndarray:
+        """Returns the ids of all words matching the given constraints, in corpus order.
+        The result of each combination of constraints is cached.
+
+        Args:
+            min_length (Optional[int], optional): Minimum number of letters. Defaults to None.
+            max_length (Optional[int], optional): Maximum number of letters. Defaults to None.
+            letters (Optional[str], optional): The words have to contain at least one of these
+                letters. Defaults to None (any letters).
+            min_symbols (Optional[int], optional): Minimum number of dots & dashes of the whole
+                word. Defaults to None.
+            max_symbols (Optional[int], optional): Maximum number of dots & dashes of the whole
+                word. Defaults to None.
+
+        Returns:
+            np.ndarray: Word ids, treat as read-only.
+        """
+        if letters is not None:
+            letters = "".join(sorted(set(letters.lower()) & set(string.ascii_lowercase)))
+        key = (min_length, max_length, letters, min_symbols, max_symbols)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self._query_cache.move_to_end(key)
+            return cached
+
+        selections = []
+        for index, low, high in (
+            (self.by_length, min_length, max_length),
+            (self.by_symbol_count, min_symbols, max_symbols),
+        ):
+            if low is not None or high is not None:
+                selections.append(
+                    [
+                        word_ids
+                        for value, word_ids in index.items()
+                        if (low is None or value >= low) and (high is None or value <= high)
+                    ]
+                )
+        if letters is not None:
+            selections.append([self.by_letter[letter] for letter in letters])
+
+        # Each selection is a union of index entries, the constraints intersect the selections
+        matching: Optional[np.ndarray] = None
+        for selection in selections:
+            mask = np.zeros(len(self), dtype=bool)
+            for word_ids in selection:
+                mask[word_ids] = True
+            matching = mask if matching is None else matching & mask
+
+        if matching is None:
+            result = np.arange(len(self), dtype=np.uint32)
+        else:
+            result = np.flatnonzero(matching).astype(np.uint32)
+
+        self._query_cache[key] = result
+        if len(self._query_cache) > self.max_cached_queries:
+            self._query_cache.popitem(last=False)
+        return result
+
+    def sample(self, rng: random.Random = random, **constraints) -> Optional[str]:
+        """Draws a random word matching the given constraints, see 'candidates'.
+
+        Args:
+            rng (random.Random, optional): Source of randomness. Defaults to the random module.
+
+        Returns:
+            Optional[str]: A word, None if no word matches the constraints.
+        """
+        if not any(value is not None for value in constraints.values()):
+            return self[rng.randrange(len(self))] if len(self) else None
+        word_ids = self.candidates(**constraints)
+        if len(word_ids) == 0:
+            return None
+        return self[int(word_ids[rng.randrange(len(word_ids))])]
+
+    def checksum(self) -> int:
+        """Returns a CRC-32 of the words in their order, equal for stores holding the same corpus
+        regardless of how it was loaded.
+
+        Returns:
+            int: self-explanatory.
+        """
+        start = int(self._offsets[0])
+        checksum = zlib.crc32(memoryview(self._buffer)[start:])
+        return zlib.crc32(np.diff(self._offsets).astype("<u4").tobytes(), checksum)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Returns the number of bytes used by the corpus, its indexes and the cached queries.
+        The words & offsets of a mapped corpus are reported separately.
+
+        Returns:
+            Dict[str, int]: Bytes per part and in total.
+        """
+
+        def _array_bytes(arrays: Iterable[np.ndarray]) -> int:
+            return sum(word_ids.nbytes for word_ids in arrays)
+
+        usage = {
+            "buffer": 0 if self.mapped else len(self._buffer),
+            "offsets": 0 if self.mapped else self._offsets.nbytes,
+            "indexes": _array_bytes(self.by_length.values())
+            + _array_bytes(self.by_letter.values())
+            + _array_bytes(self.by_symbol_count.values()),
+            "query_cache": _array_bytes(self._query_cache.values()),
+        }
+        usage["total"] = sum(usage.values())
+        # Mapped corpora are shared with other processes and not part of the total
+        usage["mapped"] = len(self._buffer) if self.mapped else 0
+        return usage
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    # Reports the memory footprint of a word file (one word per line) compared to a Python list
+    path = sys.argv[1] if len(sys.argv) > 1 else "data/bundled_words.txt"
+    with open(path, encoding="utf-8") as word_file:
+        word_list = [word for word in word_file.read().splitlines() if word]
+
+    start_time = time.perf_counter()
+    store = WordStore(word_list)
+    build_time = time.perf_counter() - start_time
+    list_bytes = sys.getsizeof(word_list) + sum(sys.getsizeof(word) for word in word_list)
+    print(f"Words: {len(store)} (built in {build_time * 1000:.1f} ms)")
+
+    start_time = time.perf_counter()
+    store.sample(min_length=4, max_length=5, letters="qz")
+    first_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for _ in range(100000):
+        store.sample(min_length=4, max_length=5, letters="qz")
+    print(
+        f"Constrained draw: first {first_time * 1e6:.1f} us, "
+        f"then {(time.perf_counter() - start_time) * 10:.2f} us"
+    )
+    for part, size in store.memory_usage().items():
+        print(f"{part:>12}: {size / 1024:.1f} KiB")
+    print(f"{'list[str]':>12}: {list_bytes / 1024:.1f} KiB")